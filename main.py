@@ -1,11 +1,37 @@
+import os
+import sys
+
 import pygame
+from src.config import load_config, set_config
 from src.game import Game
 
 
+def ask_auto_mode() -> bool:
+    return (
+        input(
+            "Choose Auto mode? (y/n)\n(y means randomize map/n means read from input file): "
+        ).lower()
+        == "y"
+    )
+
+
 def main():
+    config = load_config(
+        sys.argv[1:], ask_auto_mode=ask_auto_mode if sys.stdin.isatty() else None
+    )
+    set_config(config)
+    if config.headless:
+        # Không mở cửa sổ: dùng driver giả của SDL
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
     pygame.display.init()
     pygame.font.init()
-    game = Game()
+    game = Game(config)
+    if config.headless:
+        path = game.solve()
+        print(f"{config.engine}: {len(path)} points")
+        print(path)
+        return
     game.loop()
 
 
@@ -1,79 +1,102 @@
 import math
 from queue import PriorityQueue
+from typing import Callable
 
-from src.grid import Cell, CellGrid
+from src.grid import CellGrid
+from src.search_state import SearchState
 from src.types import HeuristicType
 from src.ui import Logger
+from src.utils import FrontierView
+
+CANCEL_CHECK_INTERVAL = 256  # Số lượt mở rộng giữa hai lần gọi `should_stop`
 
 
 def a_star(
-    grid: CellGrid, step: int, logger: Logger, heuristic_type: HeuristicType
-) -> int:
+    grid: CellGrid,
+    step: int,
+    logger: Logger,
+    heuristic_type: HeuristicType,
+    state: SearchState | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> int | None:
     """
     Hàm thực hiện thuật toán A*.
     Hàm sẽ thực hiện việc tìm kiếm và trả về số bước tối đa bằng cách sử dụng trọng số ẩn của mỗi ô,
     trọng số ẩn (hidden) sẽ tương tự như trọng số thật (count) nhưng không hiển thị trên lưới.
     Mục đích là để tìm số bước tối đa nhưng vẫn hiển thị theo số bước hiện tại
 
+    Thông tin tìm kiếm được ghi vào `state` thay vì vào các ô của lưới, nên lưới
+    chỉ được đọc và có thể là một `GridSnapshot` dùng chung với các lần tìm khác.
+
     Parameters:
-        grid (CellGrid): Lưới chứa các ô và thông tin vị trí bắt đầu và kết thúc.
+        grid (CellGrid | GridSnapshot): Lưới chứa các ô và thông tin vị trí bắt đầu và kết thúc.
         step (int): Số bước hiện tại trong thuật toán A*, dùng để hỗ trợ việc thay đổi bước trên UI, slider.
+        state (SearchState | None): Nơi ghi thông tin tìm kiếm, dùng để vẽ và truy vết đường đi.
+        should_stop (Callable[[], bool] | None): Được gọi sau mỗi `CANCEL_CHECK_INTERVAL`
+            lượt mở rộng; trả về True để hủy lần tìm kiếm (ví dụ khi bản đồ vừa bị sửa).
 
     Returns:
-        int: Tổng số bước tối đa để thực hiện quá trình tìm kiếm.
+        int | None: Tổng số bước tối đa để thực hiện quá trình tìm kiếm, None nếu bị hủy.
     """
 
-    grid.clear_count()  # Xóa thông tin cũ
-    start, end = grid.get_start(), grid.get_end()  # Vị trí bắt đầu và vị trí kết thúc
-    start.hidden = 0  # Trọng ẩn của mỗi ô, tương dương với count nhưng ẩn
-    start.update_cell(
-        0, None, heuristic(end.pos, start.pos, heuristic_type)
+    state = SearchState() if state is None else state
+    state.clear()  # Xóa thông tin cũ
+    start, end = grid.start, grid.end  # Vị trí bắt đầu và vị trí kết thúc
+    state.hidden[start] = 0  # Trọng ẩn của mỗi ô, tương dương với count nhưng ẩn
+    state.update_cell(
+        start, 0, None, heuristic(end, start, heuristic_type)
     )  # Update giá trị của ô bắt đầu
     max_steps = 0  # Biến đêm số bước tối đa
 
     initial_step = step
 
     frontier = PriorityQueue()  # Hàng đợi ưu tiên
-    frontier.put((0, start))  # Thêm vị trí bắt đầu vào hàng đợi
-    visited = set()  # Các ô đã duyệt
-    visited.add(start.pos)  # Thêm vị trí bắt đầu vào Set đã duyệt
+    frontier.put((0, 0, start))  # Thêm vị trí bắt đầu vào hàng đợi
+    hidden = state.hidden
     while not frontier.empty():  # Duyệt đến khi hàng đợi rỗng
-        _, current = frontier.get()
+        _, _, current = frontier.get()
         # Lấy ô đầu tiên từ hàng đợi, tức ô có độ ưu tiên thấp nhất,
         # độ ưu tiên được tính bằng hàm tổng của Số bước từ ô bắt đầu + hàm lượng giá từ ô hiện tại đến ô kết thúc
+        # (bằng nhau thì ưu tiên ô có số bước lớn hơn)
 
-        if current.pos == end.pos:  # Nếu ô hiện tại là ô kết thúc thì dừng
+        if current == end:  # Nếu ô hiện tại là ô kết thúc thì dừng
             break
-
-        for next in grid.get_neighbors(current.pos):
+        if (
+            should_stop is not None
+            and max_steps % CANCEL_CHECK_INTERVAL == 0
+            and should_stop()
+        ):
+            return None
+
+        for next in grid.get_neighbors(current):
             # Duyệt qua các ô lân cận của ô hiện tại
             # Lưu ý: thứ tự duyệt của ô lân cận không cố định mà sẽ thay đổi
             # tùy thuộc vào vị trí của ô hiện tại
             # Ô hiện tại có tổng hoành độ và tung độ là số Chẵn thì sẽ duyệt theo thứ tự: trên, trái, dưới, phải
             #                                              Lẻ                           : phải, dưới, trái, trên
             # Điều này giúp ưu tiên tìm theo đường chéo thay vì theo hàng ngang hoặc hàng dọc
-            new_cost = current.hidden + 1
-            if next.pos not in visited or new_cost < next.hidden:
-                visited.add(next.pos)
-                heuristic_value = heuristic(end.pos, next.pos, heuristic_type)
+            next = next.pos
+            new_cost = hidden[current] + 1
+            if new_cost < hidden.get(next, math.inf):
+                heuristic_value = heuristic(end, next, heuristic_type)
                 priority = new_cost + heuristic_value
                 # Nếu ô lân cận chưa được duyệt hoặc có trọng số mới nhỏ hơn trọng số cũ
                 # thì cập nhật trọng số mới và thêm vào hàng đợi ưu tiên với độ ưu tiên dựa vào
                 # số bước từ ô bắt đầu + hàm lượng giá từ ô hiện tại đến ô kết thúc
-                next.hidden = new_cost
-                frontier.put((priority, next))
+                hidden[next] = new_cost
+                frontier.put((priority, -new_cost, next))
                 if step > 0:
-                    next.update_cell(new_cost, current, heuristic_value)
+                    state.update_cell(next, new_cost, current, heuristic_value)
                     # Cập nhật thông tin của ô lân cận bao gồm số bước, trọng số, tọa độ ô hiện tại (để truy vết)
                     # để hiển thị trên lưới nếu số bước (step) còn lớn hơn 0
         if step == 1:
-            current.is_current = True  # Đánh dấu ô hiện tại là ô đang được xét
-            list(frontier.queue)[0][
-                1
-            ].is_next = True  # Đánh dấu ô đầu tiên trong queue là ô được xét tiếp theo
+            state.current = current  # Đánh dấu ô hiện tại là ô đang được xét
+            if frontier.queue:
+                state.next = frontier.queue[0][2]
+                # Đánh dấu ô đầu tiên trong queue là ô được xét tiếp theo
             logger.update(
-                list(frontier.queue), current, initial_step, heuristic_type
-            )  # Cập nhật thông tin cho logger
+                FrontierView(frontier.queue), state, initial_step, heuristic_type
+            )  # Cập nhật thông tin cho logger, không sao chép cả hàng đợi
 
         max_steps += 1
         step -= 1
@@ -81,12 +104,15 @@ def a_star(
     return max_steps
 
 
-def backtrack_to_start(end: Cell) -> list[tuple[int, int]]:
+def backtrack_to_start(
+    state: SearchState, end: tuple[int, int]
+) -> list[tuple[int, int]]:
     """
     Truy vết lại đường đi từ ô đích đến ô bắt đầu dựa trên thông tin ô trước đó trong `path_from`.
 
     Parameters:
-        end (Cell): Ô kết thúc.
+        state (SearchState): Thông tin của lần tìm kiếm.
+        end (tuple[int, int]): Vị trí ô kết thúc.
 
     Returns:
         list[tuple[int, int]]: Danh sách các tọa độ từ ô bắt đầu đến ô kết thúc.
@@ -96,8 +122,8 @@ def backtrack_to_start(end: Cell) -> list[tuple[int, int]]:
     path = []
 
     while current is not None:
-        path.append(current.pos)
-        current = current.path_from
+        path.append(current)
+        current = state.path_from.get(current)
 
     path.reverse()  # Đảo ngược danh sách để có thứ tự từ ô bắt đầu đến ô kết thúc
     return path
@@ -0,0 +1,195 @@
+import heapq
+import math
+
+from src.a_star import euclidean_distance
+from src.bitmap import WallBitmap
+from src.grid import CellGrid
+from src.types import CellType
+
+
+class LineOfSight:
+    """
+    Kiểm tra tầm nhìn thẳng giữa hai ô bằng thuật toán Bresenham, có bộ nhớ đệm.
+
+    Khi đường thẳng đi chéo qua góc giữa hai ô, cả hai ô kề góc đều phải trống
+    để đường đi không lách qua khe giữa hai vật cản chạm góc.
+
+    Attributes:
+        grid (CellGrid): Lưới chứa các ô.
+        bitmap (WallBitmap | None): Bản đồ vật cản dạng bit (`CellGrid.bitmap`);
+            nếu có, các ô được đọc từ bitmap và các đoạn thẳng theo trục được
+            kiểm tra bằng phép quét theo từ 64 bit.
+        cache (dict): Kết quả đã tính theo cặp ô (không phân biệt chiều).
+    """
+
+    def __init__(
+        self, grid: CellGrid, bitmap: WallBitmap | None = None, watch: bool = True
+    ):
+        """
+        Parameters:
+            grid (CellGrid): Lưới chứa các ô.
+            bitmap (WallBitmap | None): Bản đồ vật cản dạng bit của lưới.
+            watch (bool): Tự xóa bộ nhớ đệm mỗi khi bản đồ bị sửa, qua
+                `grid.change_listeners` (nếu lưới có). Đặt False cho các bộ kiểm
+                tra chỉ dùng trong một lần tìm để không tích lũy listener.
+        """
+        self.grid = grid
+        self.bitmap = bitmap
+        self.width, self.height = grid.get_size()
+        self.cache: dict[tuple[tuple[int, int], tuple[int, int]], bool] = {}
+        if watch and hasattr(grid, "change_listeners"):
+            grid.change_listeners.append(self.on_change)
+
+    def is_free(self, pos: tuple[int, int]) -> bool:
+        if not (0 <= pos[0] < self.width and 0 <= pos[1] < self.height):
+            return False
+        if self.bitmap is not None:
+            return not self.bitmap.is_wall(pos)
+        return self.grid.at(pos).type == CellType.Empty
+
+    def __call__(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        key = (a, b) if a <= b else (b, a)
+        visible = self.cache.get(key)
+        if visible is None:
+            if self.bitmap is not None and (a[0] == b[0] or a[1] == b[1]):
+                visible = self.bitmap.is_clear(*key)
+            else:
+                visible = self._bresenham(*key)
+            self.cache[key] = visible
+        return visible
+
+    def _bresenham(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        x, y = a
+        dx, dy = abs(b[0] - x), abs(b[1] - y)
+        sx = 1 if b[0] > x else -1
+        sy = 1 if b[1] > y else -1
+        error = dx - dy
+        while True:
+            if not self.is_free((x, y)):
+                return False
+            if (x, y) == b:
+                return True
+            double = 2 * error
+            step_x, step_y = double > -dy, double < dx
+            if step_x and step_y:
+                # Đi chéo: hai ô kề góc cũng phải trống
+                if not self.is_free((x + sx, y)) or not self.is_free((x, y + sy)):
+                    return False
+            if step_x:
+                error -= dy
+                x += sx
+            if step_y:
+                error += dx
+                y += sy
+
+    def clear(self):
+        """Xóa bộ nhớ đệm, cần gọi sau khi bản đồ thay đổi nếu không dùng `watch`."""
+        self.cache.clear()
+
+    def on_change(self, changes) -> None:
+        self.clear()
+
+
+def theta_star(
+    grid: CellGrid, line_of_sight: LineOfSight | None = None, lazy: bool = True
+) -> list[tuple[int, int]]:
+    """
+    Hàm thực hiện thuật toán Theta* (mặc định là Lazy Theta*) trả về đường đi
+    theo góc bất kỳ: mỗi ô được phép lấy thẳng ô cha của ô trước nó làm cha nếu
+    nhìn thấy nhau, nên đường đi chỉ gồm các điểm đổi hướng.
+
+    Lazy Theta* giả định luôn nhìn thấy ô cha khi sinh ô mới và chỉ kiểm tra
+    tầm nhìn khi ô đó được lấy ra khỏi hàng đợi, giúp giảm số lần kiểm tra.
+
+    Parameters:
+        grid (CellGrid): Lưới chứa các ô và thông tin vị trí bắt đầu và kết thúc.
+        line_of_sight (LineOfSight | None): Bộ kiểm tra tầm nhìn, có thể dùng lại giữa các lần tìm.
+        lazy (bool): Dùng Lazy Theta* thay vì Theta* cơ bản.
+
+    Returns:
+        list[tuple[int, int]]: Các điểm đổi hướng từ ô bắt đầu đến ô kết thúc,
+        rỗng nếu không có đường đi hoặc ô bắt đầu / kết thúc là vật cản.
+    """
+    los = line_of_sight or LineOfSight(grid, getattr(grid, "bitmap", None), watch=False)
+    start, goal = grid.start, grid.end
+    if not (los.is_free(start) and los.is_free(goal)):
+        return []
+    cost = {start: 0.0}
+    parent = {start: start}
+    closed = set()
+    frontier = [(euclidean_distance(start, goal), start)]
+
+    while frontier:
+        _, pos = heapq.heappop(frontier)
+        if pos in closed:
+            continue
+
+        if lazy and not los(parent[pos], pos):
+            # Giả định tầm nhìn sai: chọn ô cha tốt nhất trong các lân cận đã đóng
+            best = math.inf
+            for cell in grid.get_neighbors(pos):
+                if cell.pos in closed:
+                    candidate = cost[cell.pos] + euclidean_distance(cell.pos, pos)
+                    if candidate < best:
+                        best, parent[pos] = candidate, cell.pos
+            cost[pos] = best
+
+        closed.add(pos)
+        if pos == goal:
+            return _waypoints(parent, goal)
+
+        for cell in grid.get_neighbors(pos):
+            next = cell.pos
+            if next in closed:
+                continue
+            origin = parent[pos]
+            if lazy or los(origin, next):
+                # Đường 2: nối thẳng từ ô cha của ô hiện tại
+                new_cost = cost[origin] + euclidean_distance(origin, next)
+            else:
+                # Đường 1: đi qua ô hiện tại như A*
+                origin = pos
+                new_cost = cost[pos] + 1
+            if new_cost < cost.get(next, math.inf):
+                cost[next] = new_cost
+                parent[next] = origin
+                heapq.heappush(
+                    frontier, (new_cost + euclidean_distance(next, goal), next)
+                )
+
+    return []
+
+
+def _waypoints(
+    parent: dict[tuple[int, int], tuple[int, int]], goal: tuple[int, int]
+) -> list[tuple[int, int]]:
+    path = [goal]
+    while parent[path[-1]] != path[-1]:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def string_pull(
+    path: list[tuple[int, int]], line_of_sight: LineOfSight
+) -> list[tuple[int, int]]:
+    """
+    Rút gọn một đường đi theo từng ô (ví dụ từ `backtrack_to_start`) thành các
+    điểm đổi hướng: từ mỗi điểm neo, đi tiếp tới ô xa nhất còn nhìn thấy được.
+
+    Parameters:
+        path (list[tuple[int, int]]): Đường đi gồm các ô liên tiếp.
+        line_of_sight (LineOfSight): Bộ kiểm tra tầm nhìn.
+
+    Returns:
+        list[tuple[int, int]]: Các điểm đổi hướng, giữ nguyên điểm đầu và điểm cuối.
+    """
+    if len(path) <= 2:
+        return list(path)
+
+    waypoints = [path[0]]
+    for i in range(1, len(path) - 1):
+        if not line_of_sight(waypoints[-1], path[i + 1]):
+            waypoints.append(path[i])
+    waypoints.append(path[-1])
+    return waypoints
@@ -0,0 +1,174 @@
+"""
+Kho lưu trữ trên đĩa cho các dữ liệu tiền xử lý bản đồ
+(khoảng cách mốc, nhãn thành phần, bảng đường đi, ...).
+
+Mỗi bản đồ có một thư mục riêng đặt tên theo mã băm nội dung của bản đồ.
+Mỗi dữ liệu (artifact) gồm một hay nhiều mảng `.npy` (mở bằng memory-map,
+không đọc hết vào RAM) và một file `.json` ghi mã băm bản đồ đã tạo ra nó.
+Dữ liệu được ghi ra file tạm rồi đổi tên, nên nhiều tiến trình có thể cùng
+tạo / đọc mà không thấy file ghi dở.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable
+
+import numpy as np
+
+DEFAULT_ROOT = os.path.join(".cache", "artifacts")  # Thư mục mặc định của kho
+
+Arrays = dict[str, np.ndarray]
+
+
+def map_hash(walls: np.ndarray) -> str:
+    """Mã băm nội dung bản đồ (kích thước và vị trí vật cản)."""
+    digest = hashlib.sha256()
+    digest.update(np.array(walls.shape, dtype=np.int64).tobytes())
+    digest.update(np.packbits(walls.astype(bool)).tobytes())
+    return digest.hexdigest()
+
+
+class ArtifactMismatchError(Exception):
+    """Dữ liệu trên đĩa được tạo từ một bản đồ khác."""
+
+
+class ArtifactStore:
+    """
+    Kho dữ liệu tiền xử lý của một bản đồ.
+
+    Attributes:
+        root (str): Thư mục gốc của kho.
+        map_hash (str): Mã băm của bản đồ hiện tại.
+        directory (str): Thư mục chứa dữ liệu của bản đồ hiện tại.
+    """
+
+    def __init__(self, walls: np.ndarray, root: str = DEFAULT_ROOT):
+        self.root = root
+        self.walls = walls
+        self.map_hash = map_hash(walls)
+        self.directory = os.path.join(root, self.map_hash)
+        self._loaded: dict[str, Arrays] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def set_map(self, walls: np.ndarray) -> bool:
+        """
+        Đổi bản đồ của kho (ví dụ sau khi người dùng sửa bản đồ).
+
+        Returns:
+            bool: True nếu nội dung bản đồ thay đổi và dữ liệu đã nạp bị bỏ.
+        """
+        new_hash = map_hash(walls)
+        self.walls = walls
+        if new_hash == self.map_hash:
+            return False
+        with self._guard:
+            self.map_hash = new_hash
+            self.directory = os.path.join(self.root, new_hash)
+            self._loaded.clear()
+        return True
+
+    def _lock(self, name: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _meta_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _array_path(self, name: str, key: str) -> str:
+        return os.path.join(self.directory, f"{name}.{key}.npy")
+
+    def has(self, name: str) -> bool:
+        """Kiểm tra dữ liệu `name` đã có trên đĩa cho bản đồ hiện tại chưa."""
+        return os.path.exists(self._meta_path(name))
+
+    def get(self, name: str, build: Callable[[np.ndarray], Arrays]) -> Arrays:
+        """
+        Lấy dữ liệu `name`, nạp từ đĩa (memory-map) nếu có, nếu không thì gọi
+        `build(walls)` để tạo rồi ghi ra đĩa. Chỉ nạp khi được gọi lần đầu.
+
+        Mã băm của `walls` được tính lại một lần ở mỗi lần gọi (qua `set_map`), nên
+        bản đồ bị sửa tại chỗ không trả về dữ liệu đã nạp của bản đồ cũ, và dữ
+        liệu mới được tạo, ghi và kiểm tra theo đúng bản đồ đã dùng để tạo nó.
+
+        Parameters:
+            name (str): Tên dữ liệu, ví dụ "cpd" hoặc "components".
+            build (Callable[[np.ndarray], dict[str, np.ndarray]]): Hàm tạo dữ liệu từ bản đồ.
+
+        Returns:
+            dict[str, np.ndarray]: Các mảng của dữ liệu (chỉ đọc).
+        """
+        walls = self.walls
+        self.set_map(walls)
+        arrays = self._loaded.get(name)
+        if arrays is not None:
+            return arrays
+
+        with self._lock(name):
+            arrays = self._loaded.get(name)
+            if arrays is None:
+                try:
+                    arrays = self._load(name, self.map_hash)
+                except FileNotFoundError:
+                    self.save(name, build(walls))
+                    arrays = self._load(name, self.map_hash)
+                self._loaded[name] = arrays
+        return arrays
+
+    def load(self, name: str) -> Arrays:
+        """
+        Nạp dữ liệu `name` từ đĩa dưới dạng memory-map.
+
+        Mã băm ghi trong file `.json` được so với mã băm tính lại từ `walls` hiện
+        tại, không phải `map_hash` đã lưu, nên cũng phát hiện được bản đồ bị sửa
+        tại chỗ mà không gọi `set_map`, hoặc thư mục dữ liệu bị chép nhầm.
+
+        Raises:
+            FileNotFoundError: Nếu dữ liệu chưa có.
+            ArtifactMismatchError: Nếu dữ liệu được tạo từ bản đồ khác.
+        """
+        return self._load(name, map_hash(self.walls))
+
+    def _load(self, name: str, current: str) -> Arrays:
+        with open(self._meta_path(name), "r") as file:
+            meta = json.load(file)
+        if meta["map_hash"] != current:
+            raise ArtifactMismatchError(
+                f"Artifact '{name}' was built for map {meta['map_hash']}, "
+                f"not {current}."
+            )
+        return {
+            key: np.load(self._array_path(name, key), mmap_mode="r")
+            for key in meta["keys"]
+        }
+
+    def save(self, name: str, arrays: Arrays) -> None:
+        """
+        Ghi dữ liệu `name` ra đĩa; file `.json` được ghi sau cùng để đánh dấu hoàn tất.
+        Dữ liệu được gắn với `map_hash` hiện tại, nên nếu bản đồ bị sửa tại chỗ thì
+        cần gọi `set_map` trước (`get` tự làm việc này).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for key, array in arrays.items():
+            self._write_atomic(
+                self._array_path(name, key),
+                lambda file, array=array: np.save(file, np.asarray(array)),
+            )
+        meta = {"map_hash": self.map_hash, "keys": sorted(arrays)}
+        self._write_atomic(
+            self._meta_path(name),
+            lambda file: file.write(json.dumps(meta).encode()),
+        )
+
+    def _write_atomic(self, path: str, write: Callable) -> None:
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                write(file)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,698 @@
+"""
+Các phép đo hiệu năng chạy không cần cửa sổ Pygame.
+
+Chạy: `python -m src.benchmark`
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from src import generators
+from src.a_star import a_star, backtrack_to_start
+from src.any_angle import LineOfSight
+from src.csr_graph import CSRGraph, find_path
+from src.distance_matrix import DistanceMatrix
+from src.search_state import SearchState
+from src.grid import Cell, CellGrid, grid_walls
+from src.ida_star import ida_star
+from src.map_generation import gen_grid_from_walls
+from src.multi_agent import find_conflicts, plan_paths
+from src.multi_goal import nearest_targets
+from src.parallel_a_star import hda_star
+from src.path_database import PathDatabase
+from src.portfolio import (
+    DEFAULT_PORTFOLIO,
+    PortfolioLog,
+    is_optimal,
+    portfolio_solve,
+    solve_with,
+)
+from src.preprocessing import (
+    DeadEndPruning,
+    PrunedGrid,
+    RectangularSymmetryReduction,
+)
+from src.service import PathClient, PathService
+from src.snapshot import VersionedGrid
+from src.sparse_grid import SparseGrid
+from src.types import CellMark, CellType, HeuristicType, Optimality
+
+BENCH_AREA = (0, 0, 700, 700)  # Vùng vẽ giả định, chỉ dùng để tạo GridMetrics
+
+
+def make_open_grid(size: int) -> list[list[Cell]]:
+    """Tạo lưới vuông `size` x `size` toàn ô trống."""
+    return [
+        [Cell(type=CellType.Empty, pos=(x, y)) for y in range(size)]
+        for x in range(size)
+    ]
+
+
+def measure_cell_memory(size: int = 200) -> float:
+    """
+    Đo số byte trung bình mà mỗi ô của một CellGrid `size` x `size` chiếm (các
+    `Cell` dùng để tạo lưới được tạo trước khi đo và không được lưới giữ lại).
+
+    Returns:
+        float: Số byte trên mỗi ô.
+    """
+    cells = make_open_grid(size)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    grid = CellGrid(BENCH_AREA, cells, (0, 0), (size - 1, size - 1))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del grid
+    return (after - before) / (size * size)
+
+
+def measure_search_allocations(
+    size: int = 200, heuristic_type: HeuristicType = HeuristicType.EUCLIDEAN
+) -> tuple[int, int]:
+    """
+    Đo bộ nhớ cấp phát thêm (đỉnh) trong một lần tìm kiếm có hiển thị
+    (mọi ô lân cận đều được ghi vào `SearchState`).
+
+    Returns:
+        tuple[int, int]: (số bước tìm kiếm, số byte cấp phát thêm tại đỉnh).
+    """
+    grid = CellGrid(BENCH_AREA, make_open_grid(size), (0, 0), (size - 1, size - 1))
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    # step rất lớn: mọi bước đều cập nhật ô nhưng không bao giờ chạm step == 1
+    max_steps = a_star(grid, 10**9, None, heuristic_type)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return max_steps, peak
+
+
+def measure_generators(size: int = 4096) -> dict[str, float]:
+    """
+    Đo thời gian sinh bản đồ `size` x `size` của từng bộ sinh trong `src.generators`.
+
+    Returns:
+        dict[str, float]: Thời gian (giây) theo tên bộ sinh.
+    """
+    timings = {}
+    for name, generate in generators.GENERATORS.items():
+        begin = time.perf_counter()
+        walls = generate(size, size, seed=0)
+        generators.random_empty_cells(walls, 2, seed=0)
+        timings[name] = time.perf_counter() - begin
+    return timings
+
+
+def make_generated_grid(
+    size: int, generator: str = "random", seed: int = 0, **kwargs
+) -> CellGrid:
+    """Tạo CellGrid từ một bộ sinh trong `src.generators`."""
+    walls = generators.GENERATORS[generator](size, size, seed=seed, **kwargs)
+    start, end = generators.random_empty_cells(walls, 2, seed=seed)
+    return CellGrid(BENCH_AREA, gen_grid_from_walls(walls), start, end)
+
+
+def measure_multi_agent(
+    size: int = 64, agent_counts: tuple[int, ...] = (8, 32, 128)
+) -> list[tuple[int, float, int, int]]:
+    """
+    Đo thông lượng lập kế hoạch nhiều tác tử trên bản đồ ngẫu nhiên 15% vật cản.
+
+    Returns:
+        list[tuple[int, float, int, int]]: (số tác tử, tác tử / giây,
+        số tác tử tới đích, số va chạm).
+    """
+    walls = generators.random_fill(size, size, density=0.15, seed=0)
+    grid = CellGrid(BENCH_AREA, gen_grid_from_walls(walls), (0, 0), (0, 0))
+    results = []
+    for count in agent_counts:
+        cells = generators.random_empty_cells(walls, 2 * count, seed=count)
+        agents = list(zip(cells[:count], cells[count:]))
+        begin = time.perf_counter()
+        paths = plan_paths(grid, agents)
+        elapsed = time.perf_counter() - begin
+        arrived = sum(path[-1] == goal for path, (_, goal) in zip(paths, agents))
+        results.append((count, count / elapsed, arrived, len(find_conflicts(paths))))
+    return results
+
+
+def measure_parallel(
+    size: int = 512, worker_counts: tuple[int, ...] = (1, 2, 4, 8)
+) -> list[tuple[str, float, int]]:
+    """
+    So sánh A* tuần tự với HDA* trên 1..N tiến trình cho cùng một truy vấn dài.
+
+    Returns:
+        list[tuple[str, float, int]]: (cấu hình, thời gian (giây), độ dài đường đi).
+    """
+    grid = make_generated_grid(size, "random", density=0.25)
+    begin = time.perf_counter()
+    state = SearchState()
+    a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+    results = [
+        (
+            "a_star",
+            time.perf_counter() - begin,
+            len(backtrack_to_start(state, grid.end)),
+        )
+    ]
+    walls = grid_walls(grid)
+    for workers in worker_counts:
+        begin = time.perf_counter()
+        path = hda_star(walls, grid.start, grid.end, workers)
+        results.append((f"hda_star x{workers}", time.perf_counter() - begin, len(path)))
+    return results
+
+
+def _traced(function, *args, **kwargs):
+    """Chạy `function`, trả về (kết quả, thời gian (giây), bộ nhớ cấp phát thêm tại đỉnh)."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    begin = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - begin
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def measure_bounded_memory(
+    size: int = 128, seeds: tuple[int, ...] = (0, 4, 5), node_budget: int = 20_000
+) -> list[tuple[int, str, float, int, int]]:
+    """
+    So sánh bộ nhớ đỉnh của `a_star` và `ida_star` trên cùng các truy vấn.
+
+    Returns:
+        list[tuple[int, str, float, int, int]]: (seed, thuật toán, thời gian (giây),
+        bộ nhớ đỉnh (byte), độ dài đường đi).
+    """
+    results = []
+    for seed in seeds:
+        walls = generators.random_fill(size, size, density=0.25, seed=seed)
+        walls[0, 0] = walls[-1, -1] = False  # Truy vấn dài: từ góc này sang góc kia
+        grid = CellGrid(
+            BENCH_AREA, gen_grid_from_walls(walls), (0, 0), (size - 1, size - 1)
+        )
+        state = SearchState()
+        _, elapsed, peak = _traced(
+            a_star, grid, 10**9, None, HeuristicType.MANHATTAN, state
+        )
+        length = len(backtrack_to_start(state, grid.end))
+        results.append((seed, "a_star", elapsed, peak, length))
+        if length == 1:
+            continue  # Không có đường đi: IDA* phải duyệt qua mọi ngưỡng, bỏ qua
+        path, elapsed, peak = _traced(ida_star, grid, node_budget=node_budget)
+        results.append((seed, "ida_star", elapsed, peak, len(path)))
+    return results
+
+
+def measure_path_database(size: int = 48, queries: int = 200) -> dict[str, float]:
+    """
+    Đo thời gian xây dựng, kích thước file và độ trễ truy vấn của PathDatabase
+    so với `a_star` trên cùng các truy vấn (bản đồ hang động).
+
+    Returns:
+        dict[str, float]: Các số đo theo tên.
+    """
+    walls = generators.cave(size, size, seed=0)
+    grid = CellGrid(BENCH_AREA, gen_grid_from_walls(walls), (0, 0), (0, 0))
+    pairs = generators.random_empty_cells(walls, 2 * queries, seed=1)
+    pairs = list(zip(pairs[:queries], pairs[queries:]))
+
+    begin = time.perf_counter()
+    database = PathDatabase.build(walls)
+    build = time.perf_counter() - begin
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "cpd.npz")
+        database.save(file_path)
+        disk_size = os.path.getsize(file_path)
+        database = PathDatabase.load(file_path)
+
+    begin = time.perf_counter()
+    for source, target in pairs:
+        database.path(source, target)
+    cpd_query = (time.perf_counter() - begin) / queries
+
+    state = SearchState()
+    begin = time.perf_counter()
+    for source, target in pairs:
+        grid.set_start(source)
+        grid.set_end(target)
+        a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+        backtrack_to_start(state, grid.end)
+    a_star_query = (time.perf_counter() - begin) / queries
+
+    return {
+        "build_s": build,
+        "disk_kib": disk_size / 1024,
+        "runs": len(database.run_starts),
+        "cpd_query_ms": cpd_query * 1000,
+        "a_star_query_ms": a_star_query * 1000,
+    }
+
+
+def measure_nearest_targets(
+    size: int = 128, target_count: int = 500, k: int = 1
+) -> dict[str, float]:
+    """
+    So sánh `nearest_targets` (một lần tìm) với việc chạy `a_star` cho từng đích
+    rồi chọn đích gần nhất.
+
+    Returns:
+        dict[str, float]: Thời gian (giây) của mỗi cách và chi phí tìm được.
+    """
+    walls = generators.cave(size, size, seed=0)
+    cells = generators.random_empty_cells(walls, target_count + 1, seed=1)
+    source, targets = cells[0], cells[1:]
+    grid = CellGrid(BENCH_AREA, gen_grid_from_walls(walls), source, targets[0])
+
+    begin = time.perf_counter()
+    found = nearest_targets(grid, targets, k)
+    single = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    best = float("inf")
+    state = SearchState()
+    for target in targets:
+        grid.set_end(target)
+        a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+        path = backtrack_to_start(state, grid.end)
+        if path[0] == source:
+            best = min(best, len(path) - 1)
+    repeated = time.perf_counter() - begin
+
+    return {
+        "single_search_s": single,
+        "repeated_a_star_s": repeated,
+        "single_cost": found[0][1] if found else float("inf"),
+        "repeated_cost": best,
+    }
+
+
+def measure_preprocessing(
+    size: int = 128, queries: int = 50
+) -> list[tuple[str, str, float, int]]:
+    """
+    So sánh `a_star` trên lưới gốc, `a_star` trên lưới đã cắt túi và tìm kiếm
+    trên đồ thị rút gọn bằng hình chữ nhật, với cùng các truy vấn ngẫu nhiên.
+
+    Returns:
+        list[tuple[str, str, float, int]]: (bản đồ, cách tìm, thời gian (giây), tổng chi phí).
+    """
+    results = []
+    for name in ("maze", "cave", "rooms"):
+        walls = generators.GENERATORS[name](size, size, seed=0)
+        cells = generators.random_empty_cells(walls, 2 * queries, seed=1)
+        grid = CellGrid(BENCH_AREA, gen_grid_from_walls(walls), cells[0], cells[1])
+        pruning = DeadEndPruning(grid)
+        reduction = RectangularSymmetryReduction(grid)
+        pruning.build()
+
+        def solve_a_star(target_grid):
+            total = 0
+            state = SearchState()
+            for start, end in zip(cells[::2], cells[1::2]):
+                grid.set_start(start)
+                grid.set_end(end)
+                a_star(target_grid, 10**9, None, HeuristicType.MANHATTAN, state)
+                path = backtrack_to_start(state, grid.end)
+                total += len(path) - 1 if path[0] == start else 0
+            return total
+
+        def solve_reduction():
+            total = 0
+            for start, end in zip(cells[::2], cells[1::2]):
+                total += max(0, reduction.search(start, end)[0])
+            return total
+
+        for method, solve in (
+            ("a_star", lambda: solve_a_star(grid)),
+            ("pruned a_star", lambda: solve_a_star(PrunedGrid(grid, pruning))),
+            ("rectangles", solve_reduction),
+        ):
+            begin = time.perf_counter()
+            total = solve()
+            results.append((name, method, time.perf_counter() - begin, total))
+    return results
+
+
+def measure_service(
+    size: int = 64, queries: int = 200, workers: int | None = None
+) -> list[tuple[int, float, int, dict[str, float]]]:
+    """
+    Gửi đồng thời `queries` truy vấn tìm đường tới `PathService` qua Unix socket,
+    với lô tối đa 1 (không gom) và 64 truy vấn.
+
+    Returns:
+        list[tuple[int, float, int, dict[str, float]]]: (lô tối đa, số truy vấn mỗi
+        giây, số lô đã chạy, phân vị độ trễ (ms)).
+    """
+    walls = generators.cave(size, size, seed=0)
+    cells = generators.random_empty_cells(walls, 2 * queries, seed=1)
+
+    async def run(max_batch):
+        socket_path = os.path.join(tempfile.mkdtemp(), "service.sock")
+        service = PathService(workers=workers, max_batch=max_batch)
+        await service.start(socket_path)
+        client = await PathClient.connect(socket_path)
+        await client.request(
+            {"op": "load_map", "map": "bench", "walls": walls.tolist()}
+        )
+        begin = time.perf_counter()
+        await asyncio.gather(
+            *[
+                client.request(
+                    {"op": "path", "map": "bench", "start": start, "goal": goal}
+                )
+                for start, goal in zip(cells[::2], cells[1::2])
+            ]
+        )
+        seconds = time.perf_counter() - begin
+        stats = await client.request({"op": "stats"})
+        await client.close()
+        await service.close()
+        return (max_batch, queries / seconds, stats["batches"], stats["latency_ms"])
+
+    return [asyncio.run(run(max_batch)) for max_batch in (1, 64)]
+
+
+def measure_snapshots(size: int = 1024, edits: int = 1000) -> dict[str, float]:
+    """
+    Đo chi phí tạo phiên bản mới của `VersionedGrid` khi sửa từng ô, so với
+    việc sao chép cả mảng vật cản, và tốc độ `a_star` trên snapshot so với CellGrid.
+
+    Returns:
+        dict[str, float]: Thời gian (mili giây) của mỗi thao tác.
+    """
+    walls = generators.cave(size, size, seed=0)
+    cells = generators.random_empty_cells(walls, edits, seed=1)
+    versioned = VersionedGrid(walls)
+
+    begin = time.perf_counter()
+    for pos in cells:
+        versioned.apply(toggle=[pos])
+    chunked = (time.perf_counter() - begin) / edits
+
+    begin = time.perf_counter()
+    for pos in cells:
+        walls = walls.copy()
+        walls[pos] = not walls[pos]
+    full_copy = (time.perf_counter() - begin) / edits
+
+    small = generators.cave(128, 128, seed=0)
+    start, end = generators.random_empty_cells(small, 2, seed=2)
+    grid = CellGrid(BENCH_AREA, gen_grid_from_walls(small), start, end)
+    snapshot = VersionedGrid(small, start, end).snapshot()
+    timings = {}
+    for name, target in (("cell_grid", grid), ("snapshot", snapshot)):
+        begin = time.perf_counter()
+        a_star(target, 10**9, None, HeuristicType.MANHATTAN)
+        timings[f"a_star_{name}_ms"] = (time.perf_counter() - begin) * 1000
+
+    return {
+        "chunked_edit_ms": chunked * 1000,
+        "full_copy_edit_ms": full_copy * 1000,
+        **timings,
+    }
+
+
+def measure_bulk_edit(size: int = 300, block: int = 100) -> dict[str, float]:
+    """
+    Đo việc xây một khối vật cản `block` x `block` trên lưới có `VersionedGrid`
+    và `DeadEndPruning` theo dõi: từng ô một (`CellGrid.toggle`)
+    so với một lần sửa theo khối (`CellGrid.fill_rect`).
+
+    Returns:
+        dict[str, float]: Thời gian (mili giây) và số phiên bản tạo ra của mỗi cách.
+    """
+    results = {}
+    for name in ("toggle", "fill_rect"):
+        grid = make_generated_grid(size, "random")
+        versioned = VersionedGrid.from_grid(grid)
+        DeadEndPruning(grid)
+        low, high = (size - block) // 2, (size + block) // 2 - 1
+        begin = time.perf_counter()
+        if name == "toggle":
+            for x in range(low, high + 1):
+                for y in range(low, high + 1):
+                    pos = (x, y)
+                    cell = grid.at(pos)
+                    if cell.type == CellType.Empty and cell.mark == CellMark.No:
+                        grid.toggle(pos)
+        else:
+            grid.fill_rect(low, low, high, high, True)
+        results[f"{name}_ms"] = (time.perf_counter() - begin) * 1000
+        results[f"{name}_versions"] = versioned.current.version
+    return results
+
+
+def measure_sparse_grid(
+    size: int = 100_000, obstacles: int = 100, spread: int = 1000
+) -> dict[str, float]:
+    """
+    Tạo thế giới `size` x `size` thưa (các vật cản hình chữ nhật quanh tâm) bằng
+    `SparseGrid` rồi tìm đường bằng `a_star` qua vùng có vật cản.
+
+    Returns:
+        dict[str, float]: Thời gian tìm (giây), độ dài đường đi, số khối mảng,
+        bộ nhớ các khối (KiB) và bộ nhớ cấp phát thêm tại đỉnh (MiB).
+    """
+    rng = random.Random(0)
+    center = size // 2
+    start, end = (center - spread, center - spread // 3), (center + spread, center)
+    tracemalloc.start()
+    grid = SparseGrid(size, size, start, end)
+    for _ in range(obstacles):
+        x = center + rng.randint(-spread, spread)
+        y = center + rng.randint(-spread, spread)
+        grid.fill_rect(x, y, x + rng.randint(1, 80), y + rng.randint(1, 80), True)
+    grid.set_wall(start, False)
+    grid.set_wall(end, False)
+
+    state = SearchState()
+    begin = time.perf_counter()
+    a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+    elapsed = time.perf_counter() - begin
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "search_s": elapsed,
+        "path_length": len(backtrack_to_start(state, end)),
+        "array_chunks": sum(type(chunk) is not bool for chunk in grid.chunks.values()),
+        "chunk_kib": grid.resident_bytes() / 1024,
+        "peak_mib": peak / 2**20,
+    }
+
+
+def measure_bitmap(size: int = 1024, scans: int = 2000) -> dict[str, float]:
+    """
+    So sánh bitmap của `CellGrid` với cách lưu cũ là một `Cell` cho mỗi ô
+    (`gen_grid_from_walls`): bộ nhớ, đếm ô trống, quét hàng / cột tìm vật cản và
+    kiểm tra tầm nhìn theo trục.
+
+    Returns:
+        dict[str, float]: Các số đo (KiB hoặc mili giây).
+    """
+    walls = generators.random_fill(size, size, density=0.02, seed=0)
+    tracemalloc.start()
+    cells = gen_grid_from_walls(walls)
+    cells_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    grid = CellGrid(BENCH_AREA, walls, (0, 0), (1, 1))
+    bitmap = grid.bitmap
+    results = {
+        "cells_kib": cells_bytes / 1024,
+        "bitmap_kib": bitmap.nbytes / 1024,
+    }
+
+    begin = time.perf_counter()
+    free = sum(cell.type == CellType.Empty for column in cells for cell in column)
+    results["count_cells_ms"] = (time.perf_counter() - begin) * 1000
+    begin = time.perf_counter()
+    assert bitmap.count_free() == free
+    results["count_bitmap_ms"] = (time.perf_counter() - begin) * 1000
+
+    rng = random.Random(1)
+    starts = [(rng.randrange(size), rng.randrange(size)) for _ in range(scans)]
+    directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    begin = time.perf_counter()
+    for i, (x, y) in enumerate(starts):
+        dx, dy = directions[i % 4]
+        x, y = x + dx, y + dy
+        while 0 <= x < size and 0 <= y < size and cells[x][y].type == CellType.Empty:
+            x, y = x + dx, y + dy
+    results["scan_cells_ms"] = (time.perf_counter() - begin) * 1000
+    bitmap.columns()  # Tạo trước bản chuyển vị dùng cho quét cột
+    begin = time.perf_counter()
+    for i, pos in enumerate(starts):
+        bitmap.run_length(pos, directions[i % 4])
+    results["scan_bitmap_ms"] = (time.perf_counter() - begin) * 1000
+
+    segments = [((x, y), (size - 1 - x, y)) for x, y in starts]
+    for name, line_of_sight in (
+        ("los_bresenham_ms", LineOfSight(grid)),
+        ("los_bitmap_ms", LineOfSight(grid, bitmap)),
+    ):
+        begin = time.perf_counter()
+        for a, b in segments:
+            line_of_sight(a, b)
+        results[name] = (time.perf_counter() - begin) * 1000
+    return results
+
+
+def measure_csr(
+    size: int = 200, names: tuple[str, ...] = ("cave", "rooms", "random", "maze")
+) -> list[tuple[str, float, float, float, bool]]:
+    """
+    So sánh `a_star` trên CellGrid với A* trên đồ thị CSR đã biên dịch.
+
+    Returns:
+        list[tuple[str, float, float, float, bool]]: (bản đồ, thời gian biên dịch,
+        thời gian trên lưới, thời gian trên CSR, hai đường đi trùng nhau), đơn vị mili giây.
+    """
+    results = []
+    for name in names:
+        grid = make_generated_grid(size, name)
+        begin = time.perf_counter()
+        graph = CSRGraph.from_grid(grid)
+        compile_ms = (time.perf_counter() - begin) * 1000
+
+        state = SearchState()
+        begin = time.perf_counter()
+        a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+        grid_ms = (time.perf_counter() - begin) * 1000
+        path = backtrack_to_start(state, grid.end)
+        path = path if path[0] == grid.start else []
+
+        begin = time.perf_counter()
+        compiled_path = find_path(graph, grid.start, grid.end)
+        csr_ms = (time.perf_counter() - begin) * 1000
+        results.append((name, compile_ms, grid_ms, csr_ms, path == compiled_path))
+    return results
+
+
+def measure_distance_matrix(
+    size: int = 200, count: int = 100, sample: int = 100
+) -> dict[str, float]:
+    """
+    Thời gian tính ma trận khoảng cách giữa `count` POI so với ước lượng count²
+    lần `a_star` (đo trên `sample` cặp ngẫu nhiên rồi nhân lên).
+
+    Returns:
+        dict[str, float]: Các số đo (giây).
+    """
+    grid = make_generated_grid(size, "cave")
+    graph = CSRGraph.from_grid(grid)
+    rng = random.Random(0)
+    pois = rng.sample(sorted(graph.index), count)
+
+    results = {}
+    begin = time.perf_counter()
+    matrix = DistanceMatrix.build(graph, [graph.node_of(pos) for pos in pois])
+    results["matrix_s"] = time.perf_counter() - begin
+
+    state = SearchState()
+    pairs = [(rng.randrange(count), rng.randrange(count)) for _ in range(sample)]
+    begin = time.perf_counter()
+    for i, j in pairs:
+        grid.set_start(pois[i])
+        grid.set_end(pois[j])
+        a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+        path = backtrack_to_start(state, grid.end)
+        assert len(path) - 1 == matrix.costs[i, j] or path[0] != grid.start
+    elapsed = time.perf_counter() - begin
+    results["pairwise_a_star_s"] = elapsed / sample * count * count
+    return results
+
+
+def measure_portfolio(
+    size: int = 200, names: tuple[str, ...] = ("cave", "rooms", "random", "maze")
+) -> list[tuple[str, str, float, float, float, str]]:
+    """
+    So sánh portfolio với từng cấu hình chạy tuần tự trên một lõi.
+
+    Returns:
+        list[tuple[str, str, float, float, float, str]]: (bản đồ, mức tối ưu,
+        thời gian cấu hình nhanh nhất, chậm nhất, portfolio, cấu hình thắng), đơn vị giây.
+    """
+    log = PortfolioLog(None)
+    results = []
+    for name in names:
+        grid = make_generated_grid(size, name)
+        for optimality in Optimality:
+            times = []
+            for engine, heuristic_type in DEFAULT_PORTFOLIO:
+                if optimality == Optimality.OPTIMAL and not is_optimal(heuristic_type):
+                    continue
+                begin = time.perf_counter()
+                solve_with(grid, engine, heuristic_type)
+                times.append(time.perf_counter() - begin)
+            result = portfolio_solve(grid, optimality, log=log)
+            winner = f"{result.engine}/{result.heuristic_type.name}"
+            results.append(
+                (name, optimality.name, min(times), max(times), result.seconds, winner)
+            )
+    return results
+
+
+def main():
+    print(f"Cell memory: {measure_cell_memory():.3f} bytes/cell")
+    for heuristic_type in HeuristicType:
+        steps, peak = measure_search_allocations(heuristic_type=heuristic_type)
+        print(
+            f"Search {heuristic_type.name}: {steps} steps, "
+            f"peak extra {peak / 1024:.1f} KiB"
+        )
+    for name, seconds in measure_generators().items():
+        print(f"Generate {name} 4096x4096: {seconds:.3f} s")
+    for count, throughput, arrived, conflicts in measure_multi_agent():
+        print(
+            f"Multi-agent N={count}: {throughput:.1f} agents/s, "
+            f"{arrived}/{count} arrived, {conflicts} conflicts"
+        )
+    for name, seconds, length in measure_parallel():
+        print(f"Parallel {name}: {seconds:.3f} s, path length {length}")
+    for seed, name, seconds, peak, length in measure_bounded_memory():
+        print(
+            f"Memory seed={seed} {name}: {seconds:.3f} s, "
+            f"peak {peak / 1024:.1f} KiB, path length {length}"
+        )
+    for name, value in measure_path_database().items():
+        print(f"Path database {name}: {value:.3f}")
+    for name, value in measure_nearest_targets().items():
+        print(f"Nearest of 500 targets {name}: {value:.3f}")
+    for name, method, seconds, total in measure_preprocessing():
+        print(f"Preprocessing {name} {method}: {seconds:.3f} s, total cost {total}")
+    for name, compile_ms, grid_ms, csr_ms, same in measure_csr():
+        print(
+            f"CSR {name}: compile {compile_ms:.1f} ms, grid {grid_ms:.1f} ms, "
+            f"csr {csr_ms:.1f} ms, same path {same}"
+        )
+    for name, value in measure_distance_matrix().items():
+        print(f"Distance matrix 100 POIs {name}: {value:.3f}")
+    for name, optimality, fastest, slowest, seconds, winner in measure_portfolio():
+        print(
+            f"Portfolio {name} {optimality}: fastest {fastest:.3f} s, "
+            f"slowest {slowest:.3f} s, portfolio {seconds:.3f} s, won by {winner}"
+        )
+    for name, value in measure_bitmap().items():
+        print(f"Bitmap {name}: {value:.3f}")
+    for name, value in measure_bulk_edit().items():
+        print(f"Bulk edit 100x100 {name}: {value:.3f}")
+    for name, value in measure_sparse_grid().items():
+        print(f"Sparse 100000x100000 {name}: {value:.3f}")
+    for name, value in measure_snapshots().items():
+        print(f"Snapshot {name}: {value:.3f}")
+    for max_batch, throughput, batches, latency in measure_service():
+        percentiles = ", ".join(f"{p} {ms:.1f} ms" for p, ms in latency.items())
+        print(
+            f"Service max_batch={max_batch}: {throughput:.1f} queries/s, "
+            f"{batches} batches, {percentiles}"
+        )
+
+
+if __name__ == "__main__":
+    main()
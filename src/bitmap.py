@@ -0,0 +1,184 @@
+"""
+Bản đồ vật cản dạng bit: mỗi ô một bit, mỗi hàng (cùng tung độ y) được đệm
+đến bội số của từ máy 64 bit. Bit 1 là ô vật cản; các bit đệm cuối hàng cũng
+là 1 nên phép quét dừng ở biên bản đồ mà không cần kiểm tra riêng.
+
+Các phép toán làm việc trên cả từ 64 bit một lúc: quét hàng tìm vật cản gần
+nhất (dùng cho nhảy thẳng / kiểm tra tầm nhìn theo trục), đếm ô trống bằng
+popcount, đặt / xóa cả hình chữ nhật bằng mặt nạ bit.
+
+Đây là nơi lưu loại ô của `CellGrid` (`CellGrid.bitmap`): lưới không giữ đối
+tượng `Cell` cho từng ô, nên bản đồ 1024 x 1024 chỉ tốn 128 KiB cho vật cản.
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+ALL_ONES = (1 << WORD_BITS) - 1
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())  # NumPy < 2.0
+
+
+class WallBitmap:
+    """
+    Bản đồ vật cản 1 bit mỗi ô.
+
+    Attributes:
+        width (int), height (int): Kích thước bản đồ.
+        rows (np.ndarray): Mảng uint64 (height, số từ mỗi hàng); bit x % 64 của
+            từ x // 64 ở hàng y là ô (x, y).
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.rows = np.zeros((height, -(-width // WORD_BITS)), dtype=np.uint64)
+        self._columns: WallBitmap | None = None  # Bản chuyển vị, dùng để quét cột
+        self._set_padding()
+
+    def _set_padding(self) -> None:
+        padding = self.rows.shape[1] * WORD_BITS - self.width
+        if padding:
+            self.rows[:, -1] |= np.uint64(ALL_ONES ^ ((1 << (WORD_BITS - padding)) - 1))
+
+    @classmethod
+    def from_walls(cls, walls: np.ndarray) -> "WallBitmap":
+        """Tạo từ mảng bool (width, height), True là ô vật cản."""
+        width, height = walls.shape
+        bitmap = cls(width, height)
+        packed = np.packbits(np.asarray(walls, dtype=bool).T, axis=1, bitorder="little")
+        words = np.zeros((height, bitmap.rows.shape[1] * 8), dtype=np.uint8)
+        words[:, : packed.shape[1]] = packed
+        bitmap.rows = words.view("<u8").astype(np.uint64)
+        bitmap._set_padding()
+        return bitmap
+
+    def to_walls(self) -> np.ndarray:
+        """Chuyển về mảng bool (width, height)."""
+        bits = np.unpackbits(
+            self.rows.astype("<u8").view(np.uint8), axis=1, bitorder="little"
+        )
+        return bits[:, : self.width].T.astype(bool)
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+    def is_wall(self, pos: tuple[int, int]) -> bool:
+        x, y = pos
+        return bool(self.rows.item(y, x >> 6) >> (x & 63) & 1)
+
+    def set_wall(self, pos: tuple[int, int], is_wall: bool) -> None:
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Position {tuple(pos)} is outside the bitmap.")
+        bit = np.uint64(1 << (x & 63))
+        if is_wall:
+            self.rows[y, x >> 6] |= bit
+        else:
+            self.rows[y, x >> 6] &= ~bit
+        if self._columns is not None:
+            self._columns.set_wall((y, x), is_wall)
+
+    def set_walls(self, positions: np.ndarray, walls: np.ndarray) -> None:
+        """Đặt loại cho nhiều ô cùng lúc; positions là mảng (N, 2) tọa độ (x, y)."""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        walls = np.asarray(walls, dtype=bool)
+        x, y = positions[:, 0], positions[:, 1]
+        if ((x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)).any():
+            raise ValueError("Positions are outside the bitmap.")
+        bits = np.left_shift(np.uint64(1), (x & 63).astype(np.uint64))
+        np.bitwise_or.at(self.rows, (y[walls], x[walls] >> 6), bits[walls])
+        np.bitwise_and.at(self.rows, (y[~walls], x[~walls] >> 6), ~bits[~walls])
+        if self._columns is not None:
+            self._columns.set_walls(positions[:, ::-1], walls)
+
+    def toggle(self, pos: tuple[int, int]) -> None:
+        self.set_wall(pos, not self.is_wall(pos))
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, is_wall: bool) -> None:
+        """Đặt (hoặc xóa) vật cản cho mọi ô trong [x0, x1] x [y0, y1], theo từng từ."""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width - 1), min(y1, self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return
+        first, last = x0 >> 6, x1 >> 6
+        masks = np.full(last - first + 1, ALL_ONES, dtype=np.uint64)
+        masks[0] &= np.uint64(ALL_ONES ^ ((1 << (x0 & 63)) - 1))
+        masks[-1] &= np.uint64((1 << ((x1 & 63) + 1)) - 1)
+        block = self.rows[y0 : y1 + 1, first : last + 1]
+        if is_wall:
+            block |= masks
+        else:
+            block &= ~masks
+        if self._columns is not None:
+            self._columns.fill_rect(y0, x0, y1, x1, is_wall)
+
+    def count_walls(self) -> int:
+        padding = self.rows.shape[1] * WORD_BITS - self.width
+        return _popcount(self.rows) - padding * self.height
+
+    def count_free(self) -> int:
+        return self.width * self.height - self.count_walls()
+
+    def _row_next_wall(self, x: int, y: int, step: int) -> int:
+        """Hoành độ ô vật cản gần nhất sau `x` trên hàng `y` (theo chiều `step`)."""
+        row = self.rows[y]
+        if step > 0:
+            x += 1
+            if x >= self.width:
+                return self.width
+            index = x >> 6
+            word = int(row[index]) & (ALL_ONES ^ ((1 << (x & 63)) - 1))
+            if not word:
+                rest = np.flatnonzero(row[index + 1 :])
+                if not len(rest):
+                    return self.width
+                index += 1 + int(rest[0])
+                word = int(row[index])
+            return (index << 6) + (word & -word).bit_length() - 1
+        x -= 1
+        if x < 0:
+            return -1
+        index = x >> 6
+        word = int(row[index]) & ((1 << ((x & 63) + 1)) - 1)
+        if not word:
+            rest = np.flatnonzero(row[:index])
+            if not len(rest):
+                return -1
+            index = int(rest[-1])
+            word = int(row[index])
+        return (index << 6) + word.bit_length() - 1
+
+    def columns(self) -> "WallBitmap":
+        """Bản chuyển vị (hàng là cột của bản gốc), tạo khi cần và cập nhật cùng bản gốc."""
+        if self._columns is None:
+            self._columns = WallBitmap.from_walls(self.to_walls().T)
+        return self._columns
+
+    def run_length(self, pos: tuple[int, int], direction: tuple[int, int]) -> int:
+        """
+        Số ô trống liên tiếp tính từ sau `pos` theo hướng `direction` (một trong
+        4 hướng trục) trước khi gặp vật cản hoặc biên bản đồ.
+        """
+        x, y = pos
+        dx, dy = direction
+        if dy == 0:
+            return abs(self._row_next_wall(x, y, dx) - x) - 1
+        return abs(self.columns()._row_next_wall(y, x, dy) - y) - 1
+
+    def is_clear(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        """Kiểm tra mọi ô trên đoạn thẳng theo trục từ `a` đến `b` đều trống."""
+        if self.is_wall(a):
+            return False
+        if a[1] == b[1]:
+            distance, direction = b[0] - a[0], (1 if b[0] >= a[0] else -1, 0)
+        elif a[0] == b[0]:
+            distance, direction = b[1] - a[1], (0, 1 if b[1] >= a[1] else -1)
+        else:
+            raise ValueError("Only axis-aligned segments can be scanned.")
+        return self.run_length(a, direction) >= abs(distance)
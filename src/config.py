@@ -1,35 +1,31 @@
 # Tùy chỉnh các thông số cố định UI
 
-from src.types import HeuristicType
-from src.utils import read_input
+import argparse
+import json
+import os
+from typing import Callable
 
+from src.types import HeuristicType
 
 GAME_TITLE = "A* Pathfinding"  # Tên cửa sổ
-AUTO_MODE = (
-    input(
-        "Choose Auto mode? (y/n)\n(y means randomize map/n means read from input file): "
-    ).lower()
-    == "y"
-)  # Chế độ tự động
 SCREEN_WIDTH = 1000  # Chiều rộng cửa sổ
 SCREEN_HEIGHT = 800  # Chiều cao cửa sổ
 MARGIN = 5  # Lề
-INPUT_FILE_PATH = "wall.txt"  # Đường dẫn file input
+INPUT_FILE_PATH = "wall.txt"  # Đường dẫn file input mặc định
+AUTO_GRID_SIZE = 20  # Kích thước lưới mặc định ở chế độ tự động
+PROFILE_FILE_PATH = "frame_profile.json"  # File ghi các khung hình chậm nhất
 
 BOARD_SIZE = 700  # Kích thước bảng === chiều rộng cửa sổ
-GRID_SIZE, _, _, _ = (20, [], None, None) if AUTO_MODE else read_input(INPUT_FILE_PATH)
 
 CELL_COLOR_EMPTY = (60, 60, 60)  # Màu ô trống
 CELL_COLOR_WALL = (139, 69, 19)  # Màu của ô vật cản
 CELL_GAP = 1  # Khoảng cách giữa các ô
 CELL_CURRENT_COLOR = (0, 255, 255)
 CELL_NEXT_COLOR = (255, 0, 0)
-CELL_SIZE = (
-    BOARD_SIZE - 2 * MARGIN - ((GRID_SIZE - 1) * CELL_GAP)
-) / GRID_SIZE  # Kích thước hình vuông của mỗi ô
 PATH_LINE_WIDTH = 3  # Độ dày của đường đi
+PATH_COLOR = (120, 220, 0)  # Màu đường đi
+PATH_STALE_COLOR = (110, 110, 110)  # Màu đường đi cũ trong lúc chờ tìm lại
 
-FONT_SIZE = round(CELL_SIZE) // 2  # Cỡ chữ
 LOGGER_FONT_SIZE = 25  # Cỡ chữ logger
 FONT_COLOR = (255, 255, 255)  # Màu chữ
 
@@ -41,3 +37,235 @@ SLIDER_THUMB_COLOR = (255, 255, 255)  # Màu của nút trượt
 
 ARROW_COLOR = (255, 255, 255)  # Màu mũi tên
 ARROW_SIZE = 2  # Độ dày mũi tên
+
+RECOMPUTE_DELAY_MS = 80  # Thời gian chuột đứng yên khi kéo sửa bản đồ trước khi tìm lại
+
+# Các thuật toán tìm đường của Game ("csr": A* trên đồ thị CSR đã biên dịch)
+ENGINES = ("a_star", "ida_star", "theta_star", "csr")
+
+CONFIG_FILE_ENV = "ASTAR_CONFIG"  # Biến môi trường chứa đường dẫn file cấu hình
+ENV_PREFIX = "ASTAR_"  # Tiền tố biến môi trường, ví dụ ASTAR_SIZE=40
+
+
+def cell_size(grid_size: int) -> float:
+    """Kích thước hình vuông của mỗi ô khi bảng có `grid_size` ô mỗi chiều."""
+    return (BOARD_SIZE - 2 * MARGIN - ((grid_size - 1) * CELL_GAP)) / grid_size
+
+
+# Số ô lớn nhất mỗi chiều để mỗi ô còn rộng ít nhất 1 pixel (cell_size(n) >= 1)
+MAX_GRID_SIZE = (BOARD_SIZE - 2 * MARGIN + CELL_GAP) // (1 + CELL_GAP)
+
+
+def font_size(grid_size: int) -> int:
+    """Cỡ chữ trong ô khi bảng có `grid_size` ô mỗi chiều."""
+    return round(cell_size(grid_size)) // 2
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "y", "yes", "true", "on"):
+        return True
+    if text in ("0", "n", "no", "false", "off", ""):
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}.")
+
+
+def _parse_heuristic(value) -> HeuristicType:
+    if isinstance(value, HeuristicType):
+        return value
+    try:
+        return HeuristicType[str(value).strip().upper()]
+    except KeyError:
+        names = ", ".join(member.name.lower() for member in HeuristicType)
+        raise ValueError(f"Unknown heuristic {value!r}, expected one of: {names}.")
+
+
+def _parse_engine(value) -> str:
+    if value not in ENGINES:
+        raise ValueError(
+            f"Unknown engine {value!r}, expected one of: {', '.join(ENGINES)}."
+        )
+    return value
+
+
+def _parse_size(value) -> int:
+    size = int(value)
+    if size < 2:
+        raise ValueError("Grid size must be at least 2.")
+    if size > MAX_GRID_SIZE:
+        raise ValueError(f"Grid size must be at most {MAX_GRID_SIZE}.")
+    return size
+
+
+# Tên tùy chọn -> hàm chuyển đổi giá trị (từ chuỗi của CLI / biến môi trường / file)
+OPTIONS: dict[str, Callable] = {
+    "auto_mode": _parse_bool,
+    "map_path": str,
+    "grid_size": _parse_size,
+    "engine": _parse_engine,
+    "heuristic": _parse_heuristic,
+    "headless": _parse_bool,
+    "profile": _parse_bool,
+    "profile_path": str,
+    "record_path": str,
+}
+
+
+class Config:
+    """
+    Cấu hình chạy chương trình, thay cho các hằng số tính lúc import trước đây.
+
+    Attributes:
+        auto_mode (bool): Sinh bản đồ ngẫu nhiên thay vì đọc từ file.
+        map_path (str): Đường dẫn file bản đồ (xem `read_input`).
+        grid_size (int): Số ô mỗi chiều ở chế độ tự động.
+        engine (str): Thuật toán tìm đường, một trong `ENGINES`.
+        heuristic (HeuristicType): Hàm lượng giá mặc định.
+        headless (bool): Chạy không mở cửa sổ, chỉ in kết quả.
+        profile (bool): Đo thời gian từng khung hình và hiển thị trong logger.
+        profile_path (str): File ghi các khung hình chậm nhất (phím P hoặc khi thoát).
+        record_path (str | None): File ghi lại các sự kiện của phiên (xem `src.session`).
+    """
+
+    def __init__(
+        self,
+        auto_mode: bool = False,
+        map_path: str = INPUT_FILE_PATH,
+        grid_size: int = AUTO_GRID_SIZE,
+        engine: str = "a_star",
+        heuristic: HeuristicType = HeuristicType.MANHATTAN,
+        headless: bool = False,
+        profile: bool = False,
+        profile_path: str = PROFILE_FILE_PATH,
+        record_path: str | None = None,
+    ):
+        self.auto_mode = auto_mode
+        self.map_path = map_path
+        self.grid_size = grid_size
+        self.engine = engine
+        self.heuristic = heuristic
+        self.headless = headless
+        self.profile = profile
+        self.profile_path = profile_path
+        self.record_path = record_path
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in OPTIONS)
+        return f"Config({values})"
+
+
+def _from_file(file_path: str) -> dict:
+    with open(file_path, "r") as file:
+        values = json.load(file)
+    unknown = set(values) - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown config keys in {file_path}: {sorted(unknown)}.")
+    return values
+
+
+def _from_environ(environ) -> dict:
+    return {
+        name: environ[ENV_PREFIX + name.upper()]
+        for name in OPTIONS
+        if ENV_PREFIX + name.upper() in environ
+    }
+
+
+def _argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=GAME_TITLE)
+    parser.add_argument("--config", help="JSON config file")
+    parser.add_argument(
+        "--auto",
+        dest="auto_mode",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="randomize the map instead of reading the map file",
+    )
+    parser.add_argument("--map", dest="map_path", help="map file path")
+    parser.add_argument("--size", dest="grid_size", help="grid size in auto mode")
+    parser.add_argument("--engine", choices=ENGINES, help="search algorithm")
+    parser.add_argument(
+        "--heuristic",
+        choices=[member.name.lower() for member in HeuristicType],
+        help="heuristic function",
+    )
+    parser.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="run without a window and print the result",
+    )
+    parser.add_argument(
+        "--profile",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="show frame timings in the logger panel",
+    )
+    parser.add_argument(
+        "--profile-path", dest="profile_path", help="file for the slowest frames"
+    )
+    parser.add_argument(
+        "--record", dest="record_path", help="record input events to a session file"
+    )
+    return parser
+
+
+def load_config(
+    argv: list[str] | None = None,
+    environ=None,
+    ask_auto_mode: Callable[[], bool] | None = None,
+) -> Config:
+    """
+    Tạo cấu hình từ các nguồn, nguồn sau ghi đè nguồn trước:
+    giá trị mặc định, file JSON (`--config` hoặc biến ASTAR_CONFIG),
+    biến môi trường ASTAR_<TÊN> (ví dụ ASTAR_AUTO_MODE=y), tham số dòng lệnh.
+
+    Parameters:
+        argv (list[str] | None): Tham số dòng lệnh, None là không có tham số.
+        environ (Mapping | None): Biến môi trường, mặc định là `os.environ`.
+        ask_auto_mode (Callable[[], bool] | None): Hỏi người dùng khi không nguồn
+            nào chỉ định chế độ tự động; None thì mặc định đọc bản đồ từ file.
+
+    Returns:
+        Config: Cấu hình đã kiểm tra giá trị.
+
+    Raises:
+        ValueError: Nếu có giá trị không hợp lệ.
+    """
+    environ = os.environ if environ is None else environ
+    arguments = vars(_argument_parser().parse_args(argv or []))
+
+    values = {}
+    file_path = arguments.pop("config") or environ.get(CONFIG_FILE_ENV)
+    if file_path:
+        values.update(_from_file(file_path))
+    values.update(_from_environ(environ))
+    values.update(
+        {name: value for name, value in arguments.items() if value is not None}
+    )
+
+    if "auto_mode" not in values and ask_auto_mode is not None:
+        values["auto_mode"] = ask_auto_mode()
+    return Config(**{name: OPTIONS[name](value) for name, value in values.items()})
+
+
+_config: Config | None = None
+
+
+def get_config() -> Config:
+    """
+    Lấy cấu hình hiện tại. Nếu chưa được đặt bằng `set_config`, cấu hình được
+    tạo lần đầu từ file / biến môi trường (không đọc stdin, không đọc bản đồ).
+    """
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
+
+
+def set_config(config: Config) -> None:
+    """Đặt cấu hình dùng chung, ví dụ sau khi đọc tham số dòng lệnh trong `main`."""
+    global _config
+    _config = config
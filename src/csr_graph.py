@@ -0,0 +1,289 @@
+"""
+Đồ thị dạng CSR (Compressed Sparse Row) cho các thuật toán tìm đường.
+
+Mỗi đỉnh là một số nguyên 0..n-1. Các cạnh đi ra từ đỉnh `u` nằm ở
+`targets[offsets[u]:offsets[u + 1]]` với trọng số tương ứng trong `costs`.
+Mọi dữ liệu nằm trong các mảng NumPy có kiểu cố định, nên vòng lặp tìm kiếm
+chỉ làm việc với số nguyên thay vì tuple tọa độ, `Cell` và `add_point`.
+
+Đồ thị có thể được biên dịch từ một lưới (`from_grid`: CellGrid, GridSnapshot,
+SparseGrid, ...) hoặc từ danh sách cạnh có trọng số bất kỳ (`from_edges`,
+ví dụ navmesh), và cả hai dùng chung `a_star`.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+from src.grid import CellGrid, grid_walls
+from src.types import HeuristicType
+
+# Thứ tự duyệt lân cận giống `CellGrid.get_neighbors`: theo tính chẵn lẻ của x + y
+EVEN_OFFSETS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+ODD_OFFSETS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+
+
+class CSRGraph:
+    """
+    Đồ thị có hướng, có trọng số, lưu theo dạng CSR.
+
+    Attributes:
+        offsets (np.ndarray): int64, độ dài n + 1; cạnh của đỉnh u ở [offsets[u], offsets[u + 1]).
+        targets (np.ndarray): int32, đỉnh đích của mỗi cạnh.
+        costs (np.ndarray): float64, trọng số của mỗi cạnh.
+        coords (np.ndarray | None): float64 (n, 2), tọa độ của mỗi đỉnh, dùng cho hàm lượng giá.
+        index (dict | None): Chỉ số đỉnh theo tọa độ ô (chỉ có với đồ thị biên dịch từ lưới).
+    """
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        targets: np.ndarray,
+        costs: np.ndarray,
+        coords: np.ndarray | None = None,
+        index: dict[tuple[int, int], int] | None = None,
+    ):
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.targets = np.ascontiguousarray(targets, dtype=np.int32)
+        self.costs = np.ascontiguousarray(costs, dtype=np.float64)
+        if len(self.offsets) == 0 or self.offsets[-1] != len(self.targets):
+            raise ValueError("Offsets do not match the number of edges.")
+        if len(self.targets) != len(self.costs):
+            raise ValueError("Every edge needs exactly one cost.")
+        self.coords = None if coords is None else np.asarray(coords, dtype=np.float64)
+        self.index = index
+        # Truy cập từng phần tử qua memoryview trả về số Python, nhanh hơn nhiều
+        # so với chỉ số NumPy trong vòng lặp tìm kiếm và không sao chép dữ liệu
+        self._offsets = memoryview(self.offsets)
+        self._targets = memoryview(self.targets)
+        self._costs = memoryview(self.costs)
+        self._coordinate_lists = None
+        self._unit_costs = None
+
+    def __getstate__(self):
+        # memoryview không pickle được: chỉ gửi các mảng cho tiến trình khác
+        return (self.offsets, self.targets, self.costs, self.coords, self.index)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def unit_costs(self) -> bool:
+        """Mọi cạnh có trọng số 1 (ví dụ lưới 4 hướng), khi đó BFS là đủ."""
+        if self._unit_costs is None:
+            self._unit_costs = bool((self.costs == 1).all())
+        return self._unit_costs
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.targets.nbytes + self.costs.nbytes
+
+    def neighbors(self, node: int) -> list[tuple[int, float]]:
+        """Các cặp (đỉnh kề, trọng số) của `node`."""
+        begin, end = self._offsets[node], self._offsets[node + 1]
+        return list(zip(self._targets[begin:end], self._costs[begin:end]))
+
+    def coordinate_lists(self) -> tuple[list[float], list[float]]:
+        """Tọa độ dạng list (tạo một lần), để hàm lượng giá đọc nhanh trong vòng lặp."""
+        if self._coordinate_lists is None:
+            self._coordinate_lists = (
+                self.coords[:, 0].tolist(),
+                self.coords[:, 1].tolist(),
+            )
+        return self._coordinate_lists
+
+    def node_of(self, pos: tuple[int, int]) -> int:
+        """Chỉ số đỉnh của ô `pos` (chỉ với đồ thị biên dịch từ lưới)."""
+        if self.index is None:
+            raise ValueError("This graph was not compiled from a grid.")
+        node = self.index.get((pos[0], pos[1]))
+        if node is None:
+            raise ValueError(f"Position {tuple(pos)} is not a free cell.")
+        return node
+
+    def pos_of(self, node: int) -> tuple[int, int]:
+        """Tọa độ ô của đỉnh `node`."""
+        x, y = self.coords[node]
+        return (int(x), int(y))
+
+    @classmethod
+    def from_edges(
+        cls,
+        num_nodes: int,
+        edges: list[tuple[int, int, float]],
+        coords: np.ndarray | None = None,
+        directed: bool = False,
+    ) -> "CSRGraph":
+        """
+        Biên dịch đồ thị từ danh sách cạnh, ví dụ các đa giác của một navmesh.
+
+        Parameters:
+            num_nodes (int): Số đỉnh.
+            edges (list[tuple[int, int, float]]): Các bộ (u, v, trọng số).
+            coords (np.ndarray | None): Tọa độ (n, 2) của các đỉnh, cần cho hàm lượng giá.
+            directed (bool): False thì mỗi cạnh được thêm theo cả hai chiều.
+
+        Returns:
+            CSRGraph: Đồ thị đã biên dịch; các cạnh của mỗi đỉnh giữ thứ tự trong `edges`.
+        """
+        edges = np.asarray(edges, dtype=np.float64).reshape(-1, 3)
+        sources = edges[:, 0].astype(np.int64)
+        targets = edges[:, 1].astype(np.int64)
+        costs = edges[:, 2]
+        if not directed:
+            sources, targets = (
+                np.concatenate([sources, targets]),
+                np.concatenate([targets, sources]),
+            )
+            costs = np.concatenate([costs, costs])
+        if len(sources) and (
+            min(sources.min(), targets.min()) < 0
+            or max(sources.max(), targets.max()) >= num_nodes
+        ):
+            raise ValueError("Edge endpoint is outside the node range.")
+        if (costs < 0).any():
+            raise ValueError("Edge costs must be non-negative.")
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+        return cls(offsets, targets[order], costs[order], coords)
+
+    @classmethod
+    def from_walls(cls, walls: np.ndarray) -> "CSRGraph":
+        """
+        Biên dịch lưới 4 hướng từ mảng bool (width, height), True là ô vật cản.
+        Mỗi ô trống là một đỉnh; các cạnh có trọng số 1 và theo đúng thứ tự duyệt
+        của `CellGrid.get_neighbors`, nên kết quả tìm kiếm trùng với `a_star`.
+        """
+        walls = np.asarray(walls, dtype=bool)
+        width, height = walls.shape
+        xs, ys = np.nonzero(~walls)  # Thứ tự đỉnh: theo x rồi theo y
+        ids = np.full((width, height), -1, dtype=np.int64)
+        ids[xs, ys] = np.arange(len(xs))
+
+        odd = ((xs + ys) % 2).astype(bool)
+        slots = np.full((len(xs), 4), -1, dtype=np.int64)
+        for slot in range(4):
+            dx = np.where(odd, ODD_OFFSETS[slot][0], EVEN_OFFSETS[slot][0])
+            dy = np.where(odd, ODD_OFFSETS[slot][1], EVEN_OFFSETS[slot][1])
+            nx, ny = xs + dx, ys + dy
+            inside = (0 <= nx) & (nx < width) & (0 <= ny) & (ny < height)
+            slots[inside, slot] = ids[nx[inside], ny[inside]]
+
+        valid = slots >= 0
+        offsets = np.zeros(len(xs) + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=offsets[1:])
+        targets = slots[valid]  # Duyệt theo hàng nên giữ thứ tự lân cận của từng ô
+        coords = np.stack([xs, ys], axis=1)
+        index = dict(zip(zip(xs.tolist(), ys.tolist()), range(len(xs))))
+        return cls(offsets, targets, np.ones(len(targets)), coords, index)
+
+    @classmethod
+    def from_grid(cls, grid: CellGrid) -> "CSRGraph":
+        """Biên dịch một CellGrid, GridSnapshot hoặc lưới bất kỳ có `get_size` và `at`."""
+        return cls.from_walls(grid_walls(grid))
+
+
+def a_star(
+    graph: CSRGraph,
+    source: int,
+    goal: int,
+    heuristic_type: HeuristicType | None = HeuristicType.MANHATTAN,
+) -> tuple[float, list[int]]:
+    """
+    Thuật toán A* trên đồ thị CSR, chỉ dùng chỉ số đỉnh nguyên.
+
+    Hàng đợi ưu tiên chứa (f, -g, đỉnh), tức bằng f thì ưu tiên đỉnh có g lớn
+    hơn, giống `src.a_star.a_star`.
+
+    Parameters:
+        graph (CSRGraph): Đồ thị đã biên dịch.
+        source (int): Đỉnh bắt đầu.
+        goal (int): Đỉnh kết thúc.
+        heuristic_type (HeuristicType | None): Hàm lượng giá trên `graph.coords`;
+            None thì chạy như Dijkstra (dùng khi đồ thị không có tọa độ). Hàm lượng
+            giá chỉ chấp nhận được khi trọng số cạnh không nhỏ hơn khoảng cách tương ứng.
+
+    Returns:
+        tuple[float, list[int]]: (tổng trọng số, các đỉnh từ `source` đến `goal`),
+        hoặc (inf, []) nếu không tới được.
+    """
+    offsets, targets, costs = graph._offsets, graph._targets, graph._costs
+    estimate = _heuristic(graph, goal, heuristic_type)
+
+    # Mảng phẳng theo chỉ số đỉnh thay cho dict / set của tuple tọa độ
+    cost = [math.inf] * graph.num_nodes
+    parent = [-1] * graph.num_nodes
+    closed = bytearray(graph.num_nodes)
+    cost[source] = 0.0
+    frontier = [(estimate(source), -0.0, source)]
+    while frontier:
+        _, g, node = heapq.heappop(frontier)
+        if closed[node]:
+            continue
+        if node == goal:
+            path = [node]
+            while node != source:
+                node = parent[node]
+                path.append(node)
+            path.reverse()
+            return -g, path
+        closed[node] = 1
+        g = -g
+        for edge in range(offsets[node], offsets[node + 1]):
+            next = targets[edge]
+            new_cost = g + costs[edge]
+            if new_cost < cost[next]:
+                cost[next] = new_cost
+                parent[next] = node
+                heapq.heappush(frontier, (new_cost + estimate(next), -new_cost, next))
+    return math.inf, []
+
+
+def find_path(
+    graph: CSRGraph,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    heuristic_type: HeuristicType = HeuristicType.MANHATTAN,
+) -> list[tuple[int, int]]:
+    """
+    Đường đi theo tọa độ ô trên đồ thị biên dịch từ lưới, rỗng nếu không có
+    (kể cả khi ô bắt đầu hoặc ô kết thúc là vật cản, giống `src.a_star.a_star`).
+    """
+    if graph.index is None:
+        raise ValueError("This graph was not compiled from a grid.")
+    source = graph.index.get((start[0], start[1]))
+    goal = graph.index.get((end[0], end[1]))
+    if source is None or goal is None:
+        return []
+    _, path = a_star(graph, source, goal, heuristic_type)
+    return [graph.pos_of(node) for node in path]
+
+
+def _heuristic(graph: CSRGraph, goal: int, heuristic_type: HeuristicType | None):
+    if heuristic_type is None:
+        return lambda node: 0.0
+    if graph.coords is None:
+        raise ValueError("A heuristic needs node coordinates.")
+    xs, ys = graph.coordinate_lists()
+    gx, gy = xs[goal], ys[goal]
+    if heuristic_type == HeuristicType.MANHATTAN:
+        return lambda node: abs(xs[node] - gx) + abs(ys[node] - gy)
+    if heuristic_type == HeuristicType.EUCLIDEAN:
+        return lambda node: math.hypot(xs[node] - gx, ys[node] - gy)
+    if heuristic_type == HeuristicType.COMBINED:
+        return (
+            lambda node: abs(xs[node] - gx)
+            + abs(ys[node] - gy)
+            + math.hypot(xs[node] - gx, ys[node] - gy)
+        )
+    raise ValueError("Invalid heuristic type selected.")
@@ -0,0 +1,178 @@
+"""
+Ma trận khoảng cách giữa các điểm quan trọng (POI) trên cùng một bản đồ.
+
+Thay vì N² lần `a_star`, mỗi POI nguồn chỉ cần một lần quét Dijkstra (hoặc BFS
+khi mọi cạnh có trọng số 1) trên đồ thị CSR, dừng ngay khi mọi POI đích đã được
+xác định khoảng cách. Các lần quét được chia cho nhiều tiến trình và kết quả
+được ghi vào một ma trận NumPy (N, N).
+"""
+
+import heapq
+import math
+import multiprocessing as mp
+import os
+from collections import deque
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+from src.grid import CellGrid
+
+# Dùng chung cho các tiến trình quét (được gán trong `_init_worker`)
+_graph: CSRGraph | None = None
+_nodes: list[int] = []
+_with_paths = False
+
+
+def _init_worker(graph: CSRGraph, nodes: list[int], with_paths: bool):
+    global _graph, _nodes, _with_paths
+    _graph, _nodes, _with_paths = graph, nodes, with_paths
+
+
+def _sweep(row: int) -> tuple[int, np.ndarray, list[np.ndarray] | None]:
+    """
+    Quét từ POI thứ `row` cho đến khi mọi POI đích đã được xác định.
+
+    Returns:
+        tuple[int, np.ndarray, list[np.ndarray] | None]: (row, hàng khoảng cách,
+        các đường đi theo chỉ số đỉnh nếu cần).
+    """
+    graph = _graph
+    offsets, targets, costs = graph._offsets, graph._targets, graph._costs
+    source = _nodes[row]
+    pending = set(_nodes)  # Các đỉnh POI chưa được xác định khoảng cách
+
+    cost = [math.inf] * graph.num_nodes
+    parent = [-1] * graph.num_nodes
+    cost[source] = 0.0
+    if graph.unit_costs:
+        # BFS: thứ tự lấy ra khỏi hàng đợi chính là thứ tự khoảng cách
+        queue = deque([source])
+        while queue and pending:
+            node = queue.popleft()
+            pending.discard(node)
+            new_cost = cost[node] + 1.0
+            for edge in range(offsets[node], offsets[node + 1]):
+                next = targets[edge]
+                if cost[next] == math.inf:
+                    cost[next] = new_cost
+                    parent[next] = node
+                    queue.append(next)
+    else:
+        closed = bytearray(graph.num_nodes)
+        frontier = [(0.0, source)]
+        while frontier and pending:
+            g, node = heapq.heappop(frontier)
+            if closed[node]:
+                continue
+            closed[node] = 1
+            pending.discard(node)
+            for edge in range(offsets[node], offsets[node + 1]):
+                next = targets[edge]
+                new_cost = g + costs[edge]
+                if new_cost < cost[next]:
+                    cost[next] = new_cost
+                    parent[next] = node
+                    heapq.heappush(frontier, (new_cost, next))
+
+    # Các đỉnh còn trong `pending` chỉ có thể là đỉnh không tới được (cost = inf)
+    distances = np.array([cost[node] for node in _nodes], dtype=np.float64)
+    paths = None
+    if _with_paths:
+        paths = []
+        for node, distance in zip(_nodes, distances):
+            path = []
+            if distance != math.inf:
+                path.append(node)
+                while node != source:
+                    node = parent[node]
+                    path.append(node)
+                path.reverse()
+            paths.append(np.array(path, dtype=np.int32))
+    return row, distances, paths
+
+
+class DistanceMatrix:
+    """
+    Ma trận khoảng cách (và tùy chọn đường đi) giữa các POI.
+
+    Attributes:
+        nodes (list[int]): Chỉ số đỉnh của mỗi POI trong đồ thị.
+        costs (np.ndarray): float64 (N, N); costs[i, j] là khoảng cách từ POI i tới
+            POI j, inf nếu không tới được.
+        paths (list[list[np.ndarray]] | None): paths[i][j] là các đỉnh trên đường
+            đi từ POI i tới POI j (rỗng nếu không tới được).
+        graph (CSRGraph): Đồ thị dùng để tính.
+    """
+
+    def __init__(
+        self,
+        graph: CSRGraph,
+        nodes: list[int],
+        costs: np.ndarray,
+        paths: list[list[np.ndarray]] | None = None,
+    ):
+        self.graph = graph
+        self.nodes = nodes
+        self.costs = costs
+        self.paths = paths
+
+    @classmethod
+    def build(
+        cls,
+        graph: CSRGraph,
+        nodes: list[int],
+        workers: int | None = None,
+        with_paths: bool = False,
+    ) -> "DistanceMatrix":
+        """
+        Tính ma trận bằng một lần quét cho mỗi POI nguồn, chia cho nhiều tiến trình.
+
+        Parameters:
+            graph (CSRGraph): Đồ thị đã biên dịch (lưới hoặc navmesh).
+            nodes (list[int]): Chỉ số đỉnh của các POI.
+            workers (int | None): Số tiến trình, mặc định bằng số nhân CPU.
+            with_paths (bool): Lưu cả đường đi giữa mọi cặp POI.
+        """
+        nodes = [int(node) for node in nodes]
+        for node in nodes:
+            if not 0 <= node < graph.num_nodes:
+                raise ValueError(f"Node {node} is outside the graph.")
+        workers = max(1, min(workers or os.cpu_count() or 1, len(nodes)))
+        costs = np.empty((len(nodes), len(nodes)), dtype=np.float64)
+        paths = [None] * len(nodes) if with_paths else None
+
+        def store(results):
+            for row, distances, row_paths in results:
+                costs[row] = distances
+                if with_paths:
+                    paths[row] = row_paths
+
+        if workers == 1:
+            _init_worker(graph, nodes, with_paths)
+            store(map(_sweep, range(len(nodes))))
+        else:
+            chunk = max(1, len(nodes) // (workers * 8))
+            with mp.Pool(workers, _init_worker, (graph, nodes, with_paths)) as pool:
+                store(pool.imap_unordered(_sweep, range(len(nodes)), chunk))
+        return cls(graph, nodes, costs, paths)
+
+    @classmethod
+    def from_grid(
+        cls,
+        grid: CellGrid,
+        pois: list[tuple[int, int]],
+        workers: int | None = None,
+        with_paths: bool = False,
+    ) -> "DistanceMatrix":
+        """Biên dịch lưới thành đồ thị CSR rồi tính ma trận giữa các ô `pois`."""
+        graph = CSRGraph.from_grid(grid)
+        return cls.build(
+            graph, [graph.node_of(pos) for pos in pois], workers, with_paths
+        )
+
+    def path(self, i: int, j: int) -> list[tuple[int, int]]:
+        """Đường đi theo tọa độ ô từ POI i tới POI j (đồ thị biên dịch từ lưới)."""
+        if self.paths is None:
+            raise ValueError("Paths were not stored; build with with_paths=True.")
+        return [self.graph.pos_of(node) for node in self.paths[i][j]]
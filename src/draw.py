@@ -1,4 +1,3 @@
-from ast import Dict
 import math
 import pygame as pg
 
@@ -8,14 +7,32 @@ from src.config import (
     CELL_CURRENT_COLOR,
     CELL_NEXT_COLOR,
     FONT_COLOR,
-    FONT_SIZE,
+    PATH_COLOR,
     PATH_LINE_WIDTH,
+    font_size,
 )
 from src.types import CellMark, CellType, Mode
 from src.grid import CellGrid
-
-
-def draw_board(surface: pg.Surface, grid: CellGrid, area: pg.Rect, mode: Mode):
+from src.search_state import SearchState
+
+CELL_COLORS: dict[CellType, tuple[int, int, int]] = {
+    CellType.Empty: CELL_COLOR_EMPTY,
+    CellType.Wall: CELL_COLOR_WALL,
+}  # Màu sắc của các ô dựa vào loại ô: trống hoặc vật cản
+
+MARK_COLORS: dict[CellMark, tuple[int, int, int]] = {
+    CellMark.Start: (0, 255, 0),
+    CellMark.End: (255, 0, 0),
+}  # Màu sắc của các ô đặc biệt: ô bắt đầu và ô kết thúc
+
+
+def draw_board(
+    surface: pg.Surface,
+    grid: CellGrid,
+    area: pg.Rect,
+    mode: Mode,
+    state: SearchState | None = None,
+):
     """
     Hàm vẽ toàn bộ lưới lên bề mặt Pygame, với màu sắc của các ô,
     các dấu hiệu đặc biệt, chi phí, và mũi tên chỉ hướng.
@@ -25,73 +42,103 @@ def draw_board(surface: pg.Surface, grid: CellGrid, area: pg.Rect, mode: Mode):
         grid (CellGrid): Đối tượng lưới chứa các ô cần vẽ.
         area (pg.Rect): Khu vực trong bề mặt để vẽ lưới.
         mode (Mode): Chế độ hiển thị (Cost hoặc Arrow) để hiển thị chi phí hoặc mũi tên.
+        state (SearchState | None): Thông tin tìm kiếm cần hiển thị, None nếu chỉ vẽ bản đồ.
 
     Returns:
         None
     """
-    cell_font = pg.font.SysFont(pg.font.get_default_font(), FONT_SIZE)  # Font chữ
-
     pg.draw.rect(surface, (0, 0, 0), area)  # Màu nền
     metrics = grid.metrics  # Lấy thông số lưới
-
-    colors: Dict[CellType, tuple[int, int, int]] = {
-        CellType.Empty: CELL_COLOR_EMPTY,
-        CellType.Wall: CELL_COLOR_WALL,
-    }  # Màu sắc của các ô dựa vào loại ô: trống hoặc vật cản
-
-    marks: Dict[CellMark, tuple[int, int, int]] = {
-        CellMark.Start: (0, 255, 0),
-        CellMark.End: (255, 0, 0),
-    }  # Màu sắc của các ô đặc biệt: ô bắt đầu và ô kết thúc
+    state = SearchState() if state is None else state
+    font = cell_font(grid)  # Font chữ
 
     for y in range(0, metrics.pos_y):
         # Duyệt qua các hàng
         for x in range(0, metrics.pos_x):
             # Duyệt qua các cột
-            cell = grid.at([x, y])  # Lấy ô tại tọa độ [x, y]
+            draw_cell(surface, grid, (x, y), mode, state, font)
+
+
+def cell_font(grid: CellGrid) -> pg.font.Font:
+    """Font chữ dùng để vẽ chi phí lên các ô, theo kích thước lưới."""
+    metrics = grid.metrics
+    return pg.font.SysFont(
+        pg.font.get_default_font(), font_size(max(metrics.pos_x, metrics.pos_y))
+    )
+
+
+def draw_cell(
+    surface: pg.Surface,
+    grid: CellGrid,
+    pos: tuple[int, int],
+    mode: Mode,
+    state: SearchState,
+    font: pg.font.Font,
+):
+    """
+    Vẽ một ô (màu, chi phí hoặc mũi tên, dấu bắt đầu / kết thúc, ô đang xét / xét
+    tiếp theo). Chỉ vẽ trong hình chữ nhật của ô nên có thể vẽ lại riêng từng ô.
+
+    Parameters:
+        surface (pg.Surface): Bề mặt nơi ô sẽ được vẽ.
+        grid (CellGrid): Đối tượng lưới chứa ô.
+        pos (tuple[int, int]): Vị trí của ô.
+        mode (Mode): Chế độ hiển thị (Cost hoặc Arrow).
+        state (SearchState): Thông tin tìm kiếm cần hiển thị.
+        font (pg.font.Font): Font chữ từ `cell_font`.
+    """
+    metrics = grid.metrics
+    cell = grid.at(pos)  # Lấy ô tại tọa độ pos
 
-            cell_rect = metrics.cell_rect([x, y])  # Thông số ô
-            cell_center = metrics.cell_center([x, y])  # Tâm của ô
+    cell_rect = metrics.cell_rect(pos)  # Thông số ô
+    cell_center = metrics.cell_center(pos)  # Tâm của ô
 
-            pg.draw.rect(
-                surface, colors.get(cell.type, (0, 255, 0)), cell_rect
-            )  # Vẽ ô với màu tương ứng với loại ô: trống hoặc vật cản
+    pg.draw.rect(
+        surface, CELL_COLORS.get(cell.type, (0, 255, 0)), cell_rect
+    )  # Vẽ ô với màu tương ứng với loại ô: trống hoặc vật cản
 
-            if mode == Mode.Cost and cell.cost != math.inf:
-                # Nếu chế độ hiển thị là Cost và ô có chi phí khác vô cực
-                # thì vẽ chi phí lên tâm của ô
+    cost = state.cost_of(cell.pos)
+    if mode == Mode.Cost and cost != math.inf:
+        # Nếu chế độ hiển thị là Cost và ô có chi phí khác vô cực
+        # thì vẽ chi phí lên tâm của ô
 
-                count_text = cell_font.render(
-                    str(round(cell.cost + cell.heuristic, 2)), True, FONT_COLOR
-                )
+        count_text = font.render(
+            str(round(cost + state.heuristic_of(cell.pos), 2)), True, FONT_COLOR
+        )
 
-                cell_x, cell_y, cell_width, cell_height = cell_rect
-                text_width, text_height = count_text.get_rect().size
+        cell_x, cell_y, cell_width, cell_height = cell_rect
+        text_width, text_height = count_text.get_rect().size
 
-                text_x = cell_x + (cell_width - text_width) / 2
-                text_y = cell_y + (cell_height - text_height) / 2
+        text_x = cell_x + (cell_width - text_width) / 2
+        text_y = cell_y + (cell_height - text_height) / 2
 
-                surface.blit(count_text, (text_x, text_y))
+        surface.blit(count_text, (text_x, text_y))
 
-            if mode == Mode.Arrow and cell.path_from is not None:
-                # Nếu chế độ hiển thị là Arrow và ô đó không phải là ô bắt đầu
-                # thì vẽ mũi tên từ ô hiện tại đến ô trước đó
-                cell.arrow.draw_arrow(surface, cell_center)
+    arrow = state.arrow(cell.pos) if mode == Mode.Arrow else None
+    if arrow is not None:
+        # Nếu chế độ hiển thị là Arrow và ô đó không phải là ô bắt đầu
+        # thì vẽ mũi tên từ ô hiện tại đến ô trước đó
+        arrow.draw_arrow(surface, cell_center, metrics.cell_size)
 
-            mark = marks.get(cell.mark, None)
-            if mark is not None:
-                # Nếu ô đó là ô bắt đầu hoặc ô kết thúc
-                # thì tô màu cho ô đó với màu tương ứng
-                pg.draw.rect(surface, mark, cell_rect)
+    mark = MARK_COLORS.get(cell.mark, None)
+    if mark is not None:
+        # Nếu ô đó là ô bắt đầu hoặc ô kết thúc
+        # thì tô màu cho ô đó với màu tương ứng
+        pg.draw.rect(surface, mark, cell_rect)
 
-            if cell.is_current:
-                pg.draw.rect(surface, CELL_CURRENT_COLOR, cell_rect, PATH_LINE_WIDTH)
+    if cell.pos == state.current:
+        pg.draw.rect(surface, CELL_CURRENT_COLOR, cell_rect, PATH_LINE_WIDTH)
 
-            if cell.is_next:
-                pg.draw.rect(surface, CELL_NEXT_COLOR, cell_rect, PATH_LINE_WIDTH)
+    if cell.pos == state.next:
+        pg.draw.rect(surface, CELL_NEXT_COLOR, cell_rect, PATH_LINE_WIDTH)
 
 
-def draw_path(surface: pg.Surface, grid: CellGrid, path: list[tuple[int, int]]):
+def draw_path(
+    surface: pg.Surface,
+    grid: CellGrid,
+    path: list[tuple[int, int]],
+    color: tuple[int, int, int] = PATH_COLOR,
+):
     """
     Hàm vẽ đường đi từ ô bắt đầu đến ô kết thúc trên bề mặt Pygame.
 
@@ -99,6 +146,7 @@ def draw_path(surface: pg.Surface, grid: CellGrid, path: list[tuple[int, int]]):
         surface (pg.Surface): Bề mặt nơi đường đi sẽ được vẽ.
         grid (CellGrid): Đối tượng lưới chứa các ô.
         path (list[tuple[int, int]]): Danh sách các tọa độ của các ô trên đường đi từ ô bắt đầu đến ô kết thúc.
+        color (tuple[int, int, int]): Màu đường đi.
 
     Returns:
         None
@@ -108,4 +156,4 @@ def draw_path(surface: pg.Surface, grid: CellGrid, path: list[tuple[int, int]]):
         # Duyệt qua các ô và vẽ đường đi từ tâm ô này đến ô tiếp theo
         ctr_a = metrics.cell_center(path[i])
         ctr_b = metrics.cell_center(path[i + 1])
-        pg.draw.line(surface, (120, 220, 0), ctr_a, ctr_b, PATH_LINE_WIDTH)
+        pg.draw.line(surface, color, ctr_a, ctr_b, PATH_LINE_WIDTH)
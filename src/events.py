@@ -1,9 +1,8 @@
 import pygame as pg
 import sys
-import math
 
-from src.config import BOARD_SIZE, GRID_SIZE
-from src.types import CellMark, HeuristicType, Mode
+from src.config import BOARD_SIZE
+from src.types import CellType, HeuristicType, Mode
 
 
 def handle_keydown(self, event):
@@ -14,7 +13,7 @@ def handle_keydown(self, event):
         event (pg.event.Event): Sự kiện nhấn phím từ người dùng.
     """
     if event.key == pg.K_ESCAPE:
-        self.quit()  # Thoát chương trình
+        quit(self)  # Thoát chương trình
     elif event.key == pg.K_RIGHT:
         self.step += 1  # Tăng bước
         self.slider.set_value(self.step)  # Cập nhật thanh trượt
@@ -28,13 +27,31 @@ def handle_keydown(self, event):
         # Chuyển đổi chế độ hiển thị giữa Cost và Arrow
     elif event.key == pg.K_h:
         self.heuristic = HeuristicType((self.heuristic.value + 1) % len(HeuristicType))
+    elif event.key == pg.K_p:
+        self.dump_profile()  # Ghi các khung hình chậm nhất ra file
 
 
-def start_drag(self):
+def cell_at(mouse_pos: tuple[int, int], size: tuple[int, int]) -> tuple[int, int]:
+    """
+    Vị trí ô dưới chuột trên bảng `BOARD_SIZE` x `BOARD_SIZE` có `size` ô.
+
+    Tính bằng số nguyên `mouse * size // BOARD_SIZE` thay vì chia cho
+    `BOARD_SIZE // size`, vốn bằng 0 khi lưới có hơn `BOARD_SIZE` ô mỗi chiều.
+    """
+    return (
+        mouse_pos[0] * size[0] // BOARD_SIZE,
+        mouse_pos[1] * size[1] // BOARD_SIZE,
+    )
+
+
+def start_drag(self, mouse_pos: tuple[int, int]):
     """
     Bắt đầu thao tác kéo bằng cách bật/tắt loại ô ban đầu và thiết lập điều kiện kéo.
+
+    Tham số:
+        mouse_pos (tuple[int, int]): Vị trí chuột của sự kiện nhấn chuột.
     """
-    mouse_x, mouse_y = pg.mouse.get_pos()
+    mouse_x, mouse_y = mouse_pos
     self.mouse_held = True
     self.grid.toggled_cells.clear()  # Xóa các ô đã được kéo từ lần kéo trước
 
@@ -45,12 +62,10 @@ def start_drag(self):
         return
 
     # Tính toán vị trí ô dựa trên tọa độ chuột
-    pos_x, pos_y = (
-        mouse_x // (BOARD_SIZE // GRID_SIZE),
-        mouse_y // (BOARD_SIZE // GRID_SIZE),
-    )
+    width, height = self.grid.get_size()
+    pos_x, pos_y = cell_at((mouse_x, mouse_y), (width, height))
 
-    if (pos_x >= GRID_SIZE) or (pos_y >= GRID_SIZE):
+    if (pos_x >= width) or (pos_y >= height):
         return
 
     cell = self.grid.at((pos_x, pos_y))
@@ -63,9 +78,10 @@ def start_drag(self):
         else:
             # Nếu không phải ô bắt đầu hoặc ô kết thúc, thay đổi loại ô và thêm ô đó vào danh sách ô đã được kéo
             # Để khi kéo chuột lại ô đó thì sẽ không bị thay đổi
-            cell.toggle_type()
+            self.grid.toggle((pos_x, pos_y))
             self.grid.drag_cell_type = cell.type
             self.grid.toggled_cells.add((pos_x, pos_y))
+            self.edited_at = self.clock()
 
 
 def end_drag(self):
@@ -80,43 +96,59 @@ def end_drag(self):
     self.grid.toggled_cells.clear()
 
 
-def drag_toggle(self):
+def drag_toggle(self, mouse_positions: list[tuple[int, int]]):
     """
-    Thay đổi loại ô khi di chuyển chuột trong khi giữ nút kéo, hoặc di chuyển ô bắt đầu/kết thúc.
-    """
-    mouse_x, mouse_y = pg.mouse.get_pos()
+    Xử lý gộp các sự kiện di chuyển chuột trong một khung hình khi đang giữ nút kéo:
+    các ô bị chuột đi qua được đổi loại trong một lần sửa bản đồ (`CellGrid.set_cells`),
+    còn ô bắt đầu/kết thúc và thanh trượt chỉ cần vị trí cuối cùng.
 
+    Tham số:
+        mouse_positions (list[tuple[int, int]]): Vị trí chuột của các sự kiện, theo thứ tự.
+    """
     # Nếu đang kéo thanh trượt, xử lý kéo thanh trượt
     if self.slider.is_dragging:
-        self.slider.handle_drag(mouse_x, self.update_step)
+        self.slider.handle_drag(mouse_positions[-1][0], self.update_step)
         return
 
-    pos_x = mouse_x // (BOARD_SIZE // GRID_SIZE)
-    pos_y = mouse_y // (BOARD_SIZE // GRID_SIZE)
-
-    if (pos_x >= GRID_SIZE) or (pos_y >= GRID_SIZE):
+    width, height = self.grid.get_size()
+    cells = []
+    for mouse_x, mouse_y in mouse_positions:
+        pos = cell_at((mouse_x, mouse_y), (width, height))
+        if pos[0] < width and pos[1] < height:
+            cells.append(pos)
+    if not cells:
         return
 
-    cell = self.grid.at((pos_x, pos_y))
-
     # Nếu đang kéo ô bắt đầu hoặc ô kết thúc, di chuyển chúng đến vị trí mới
     if self.grid.dragging_start:
-        self.grid.get_start().cost = math.inf
-        self.grid.get_start().mark = CellMark.No  # Xóa ô bắt đầu trước đó
-        self.grid.set_start((pos_x, pos_y))  # Di chuyển ô bắt đầu đến vị trí mới
+        if cells[-1] != self.grid.start:
+            self.dirty_cells.update((self.grid.start, cells[-1]))
+            self.grid.set_start(cells[-1])  # Di chuyển ô bắt đầu đến vị trí mới
+            self.edited_at = self.clock()
     elif self.grid.dragging_end:
-        self.grid.get_end().mark = CellMark.No  # Xóa ô kết thúc trước đó
-        self.grid.set_end((pos_x, pos_y))  # Di chuyển ô kết thúc đến vị trí mới
-    elif (pos_x, pos_y) not in self.grid.toggled_cells and cell:
-        # Thay đổi loại ô nếu là ô thường và chưa bị kéo trước đó
-        if cell.type != self.grid.drag_cell_type:
-            cell.toggle_type()
-            self.grid.toggled_cells.add((pos_x, pos_y))
+        if cells[-1] != self.grid.end:
+            self.dirty_cells.update((self.grid.end, cells[-1]))
+            self.grid.set_end(cells[-1])  # Di chuyển ô kết thúc đến vị trí mới
+            self.edited_at = self.clock()
+    elif self.grid.drag_cell_type is not None:
+        # Đổi loại các ô thường chưa bị kéo trước đó sang loại của ô bắt đầu kéo
+        changed = [
+            pos
+            for pos in dict.fromkeys(cells)
+            if pos not in self.grid.toggled_cells
+            and self.grid.at(pos).type != self.grid.drag_cell_type
+        ]
+        if changed:
+            self.grid.set_cells(changed, self.grid.drag_cell_type == CellType.Wall)
+            self.grid.toggled_cells.update(changed)
+            self.edited_at = self.clock()
 
 
 def quit(self):
     """
     Thoát khỏi ứng dụng, dừng Pygame và đóng chương trình.
     """
+    self.dump_profile()
+    self.close_recording()  # Ghi nốt phần còn lại của phiên
     pg.quit()
     sys.exit()
@@ -1,33 +1,64 @@
+import math
+import random
+import time
+from contextlib import nullcontext
+
 import pygame as pg
 
 from src.a_star import a_star, backtrack_to_start
+from src.any_angle import theta_star
 from src.config import (
-    AUTO_MODE,
     BOARD_SIZE,
     GAME_TITLE,
-    GRID_SIZE,
-    INPUT_FILE_PATH,
+    PATH_COLOR,
+    PATH_STALE_COLOR,
+    RECOMPUTE_DELAY_MS,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
     SLIDER_HEIGHT,
     SLIDER_WIDTH,
+    Config,
+    get_config,
 )
-from src.draw import draw_board, draw_path
+from src.csr_graph import CSRGraph, find_path
+from src.draw import cell_font, draw_board, draw_cell, draw_path
 from src.events import drag_toggle, end_drag, handle_keydown, quit, start_drag
-from src.grid import CellGrid
-from src.types import HeuristicType, Mode
+from src.grid import CellGrid, grid_walls
+from src.ida_star import ida_star
+from src.search_state import SearchState
+from src.types import Mode
 from src.ui import Logger, Slider
 from src.utils import read_input
+from src.map_edit import ChangeSet
 from src.map_generation import gen_grid, get_random_empty_cell
+from src.profiler import FrameProfiler
+from src.session import SessionRecorder
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, config: Config | None = None):
         pg.init()
+        self.config = config or get_config()  # Cấu hình chạy (xem `src.config`)
         self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pg.display.set_caption(GAME_TITLE)
-        _, self.walls, self.start, self.end = read_input(INPUT_FILE_PATH)
+        self.size = self.config.grid_size
+        seed = None
+        if self.config.record_path:
+            # Cố định hạt giống để phát lại sinh đúng bản đồ và các lần reset
+            seed = random.randrange(2**32)
+            random.seed(seed)
+        self.walls = None  # None: sinh vật cản ngẫu nhiên (chế độ tự động)
+        self.start = self.end = None
+        if not self.config.auto_mode:
+            self.size, self.walls, self.start, self.end = read_input(
+                self.config.map_path
+            )
         self.grid: CellGrid = self.init_grid()
+        self.recorder = None  # Ghi các sự kiện của phiên (xem `src.session`)
+        if seed is not None:
+            self.recorder = SessionRecorder(
+                self.config.record_path, self.config, seed, grid_walls(self.grid)
+            )
         self.slider = Slider(
             (BOARD_SIZE - SLIDER_WIDTH) // 2,
             (BOARD_SIZE + SCREEN_HEIGHT - SLIDER_HEIGHT) // 2,
@@ -35,17 +66,92 @@ class Game:
             SLIDER_HEIGHT,
         )
         self.logger = Logger()  # Khởi tạo Logger
+        self.profiler = FrameProfiler() if self.config.profile else None
+        self.logger.profiler = self.profiler  # Hiển thị thống kê khung hình nếu bật
+        self.search = SearchState()  # Thông tin tìm kiếm để vẽ lên lưới
         self.path = None  # Đường đi từ vị trí đầu đến cuối
         self.mouse_held = False
-        self.heuristic = HeuristicType.MANHATTAN  # Loại hàm lượng giá mặc định
+        self.heuristic = self.config.heuristic  # Loại hàm lượng giá mặc định
+        self.clock = time.perf_counter  # Hàm lấy thời gian (giây)
+        self.edited_at = -math.inf  # Thời điểm kéo chuột sửa bản đồ gần nhất
+        self.search_key = None  # `search_inputs` của kết quả tìm kiếm hiện tại
+        self.path_stale = False  # Đường đi đang vẽ là của bản đồ trước khi sửa
 
         self.step = 0  # Bước đi trong quá trình tìm đường
         self.mode = Mode.Cost  # Chế độ hiển thị mặc định
 
     def loop(self):
         while True:
+            self.run_frame()
+
+    def run_frame(self):
+        """Một khung hình: xử lý sự kiện, tìm kiếm (nếu cần), vẽ và cập nhật màn hình."""
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+        with self.phase("events"):
             self.handle_events()
-            self.max_steps = a_star(self.grid, self.step, self.logger, self.heuristic)
+        with self.phase("search"):
+            self.update_search()
+        self.draw(self.screen)
+        with self.phase("display"):
+            pg.display.update()
+        self.end_frame()
+
+    def search_inputs(self) -> tuple:
+        """Những gì kết quả tìm kiếm phụ thuộc vào; không đổi thì không cần tìm lại."""
+        return (
+            id(self.grid),
+            self.grid.version,
+            self.grid.start,
+            self.grid.end,
+            self.heuristic,
+            self.config.engine,
+            self.step,
+        )
+
+    def editing(self) -> bool:
+        """Đang kéo chuột sửa bản đồ (hoặc di chuyển ô bắt đầu/kết thúc)."""
+        return self.mouse_held and not self.slider.is_dragging
+
+    def edit_pending(self) -> bool:
+        """Một lần sửa mới đang chờ trong hàng đợi sự kiện: kết quả tìm hiện tại sẽ cũ."""
+        return self.editing() and pg.event.peek(pg.MOUSEMOTION)
+
+    def update_search(self):
+        """
+        Tìm lại đường đi khi bản đồ, vị trí, hàm lượng giá hoặc bước thay đổi.
+
+        Trong lúc kéo sửa bản đồ, việc tìm lại được hoãn đến khi chuột đứng yên
+        `RECOMPUTE_DELAY_MS`; trong lúc chờ, kết quả cũ vẫn được vẽ với đường đi
+        màu `PATH_STALE_COLOR`. Lần tìm A* đang chạy bị hủy nếu có sự kiện sửa
+        mới trong hàng đợi.
+        """
+        inputs = self.search_inputs()
+        if inputs == self.search_key:
+            return
+        self.path_stale = True
+        if (
+            self.editing()
+            and (self.clock() - self.edited_at) * 1000 < RECOMPUTE_DELAY_MS
+        ):
+            return
+
+        if self.config.engine != "a_star":
+            # Các thuật toán khác không hỗ trợ xem từng bước: chỉ vẽ đường đi
+            self.path = self.solve()
+        else:
+            search = SearchState()
+            max_steps = a_star(
+                self.grid,
+                self.step,
+                self.logger,
+                self.heuristic,
+                search,
+                self.edit_pending,
+            )
+            if max_steps is None:
+                return  # Bị hủy, giữ kết quả cũ
+            self.search, self.max_steps = search, max_steps
             # Tìm số bước đi đến đích
             self.step = min(
                 self.step, self.max_steps
@@ -54,29 +160,82 @@ class Game:
             self.slider.set_intervals(self.max_steps)
             self.slider.set_value(self.step)
             # Cập nhật thanh trượt dựa vào số bước đi hiện tại và số bước đi đến đích
-            self.draw(self.screen)
             self.path = (
-                backtrack_to_start(self.grid.get_end())
+                backtrack_to_start(self.search, self.grid.end)
                 if (self.max_steps == self.step)
                 else None
             )
-            pg.display.update()
+        self.search_key = self.search_inputs()
+        self.path_stale = False
+
+    def phase(self, name: str):
+        """Đo thời gian của giai đoạn `name` nếu bật profiler, ngược lại không làm gì."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name)
+
+    def end_frame(self):
+        if self.profiler is not None:
+            self.profiler.end_frame()
+
+    def dump_profile(self):
+        """Ghi các khung hình chậm nhất ra `config.profile_path` nếu bật profiler."""
+        if self.profiler is not None:
+            self.profiler.dump_worst(self.config.profile_path)
+
+    def close_recording(self):
+        """Đóng file ghi phiên nếu đang ghi."""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def solve(self) -> list[tuple[int, int]]:
+        """
+        Tìm đường đi từ ô bắt đầu đến ô kết thúc bằng thuật toán trong cấu hình.
+
+        Returns:
+            list[tuple[int, int]]: Các tọa độ trên đường đi, rỗng nếu không có đường đi.
+        """
+        if self.config.engine == "ida_star":
+            return ida_star(self.grid, self.heuristic)
+        if self.config.engine == "theta_star":
+            return theta_star(self.grid)
+        if self.config.engine == "csr":
+            if self.graph is None:  # Biên dịch lại sau khi sửa bản đồ
+                self.graph = CSRGraph.from_grid(self.grid)
+            return find_path(self.graph, self.grid.start, self.grid.end, self.heuristic)
+        self.max_steps = a_star(
+            self.grid, 10**9, self.logger, self.heuristic, self.search
+        )
+        path = backtrack_to_start(self.search, self.grid.end)
+        return path if path[0] == self.grid.start else []
 
     def handle_events(self):
         """
         Xử lý các sự kiện đầu vào từ người dùng như nhấn phím, nhấp chuột và kéo chuột.
         """
-        for event in pg.event.get():
+        events = pg.event.get()
+        if self.recorder is not None:
+            self.recorder.record_frame(self.clock(), events)
+        motions = []  # Các MOUSEMOTION liên tiếp khi giữ chuột, được xử lý gộp
+        for event in events:
+            if event.type == pg.MOUSEMOTION:
+                if self.mouse_held:
+                    motions.append(event.pos)
+                continue
+            if motions:
+                drag_toggle(self, motions)
+                motions = []
             if event.type == pg.QUIT:
                 quit(self)
             elif event.type == pg.KEYDOWN:
                 handle_keydown(self, event)
             elif event.type == pg.MOUSEBUTTONDOWN:
-                start_drag(self)
+                start_drag(self, event.pos)
             elif event.type == pg.MOUSEBUTTONUP:
                 end_drag(self)
-            elif event.type == pg.MOUSEMOTION and self.mouse_held:
-                drag_toggle(self)
+        if motions:
+            drag_toggle(self, motions)
 
     def draw(self, surface: pg.Surface):
         """
@@ -84,15 +243,40 @@ class Game:
         """
         if self.grid is None:
             return
-        draw_board(surface, self.grid, surface.get_rect(), self.mode)
-        if self.slider is not None:
-            self.slider.draw(surface)
-        # Vẽ đường đi nếu có
-        if self.path is not None:
-            draw_path(surface, self.grid, self.path)
+        with self.phase("board"):
+            self.draw_cached_board(surface)
+            if self.slider is not None:
+                self.slider.draw(surface)
+            # Vẽ đường đi nếu có
+            if self.path is not None:
+                color = PATH_STALE_COLOR if self.path_stale else PATH_COLOR
+                draw_path(surface, self.grid, self.path, color)
 
         # Vẽ thông tin logger
-        self.logger.draw_log(surface)
+        with self.phase("logger"):
+            self.logger.draw_log(surface)
+
+    def draw_cached_board(self, surface: pg.Surface):
+        """
+        Vẽ bảng từ bản vẽ đã lưu. Khi kết quả tìm kiếm và chế độ hiển thị không
+        đổi (ví dụ trong lúc kéo sửa bản đồ), chỉ các ô trong `dirty_cells` được
+        vẽ lại thay vì toàn bộ lưới.
+        """
+        key = (id(self.grid), self.search, self.mode, surface.get_size())
+        if key != self.board_key:
+            self.board = pg.Surface(surface.get_size())
+            draw_board(
+                self.board, self.grid, self.board.get_rect(), self.mode, self.search
+            )
+            self.board_font = cell_font(self.grid)
+            self.board_key = key
+        else:
+            for pos in self.dirty_cells:
+                draw_cell(
+                    self.board, self.grid, pos, self.mode, self.search, self.board_font
+                )
+        self.dirty_cells.clear()
+        surface.blit(self.board, (0, 0))
 
     def init_grid(self):
         """
@@ -105,15 +289,29 @@ class Game:
         Returns:
             CellGrid: Đối tượng lưới chứa các ô và các cài đặt.
         """
-        grid = gen_grid(GRID_SIZE, GRID_SIZE, self.walls)
+        grid = gen_grid(self.size, self.size, self.walls)
         # Sinh bản đồ một cách ngẫu nhiên
-        if AUTO_MODE:
+        if self.config.auto_mode:
             self.start = get_random_empty_cell(grid)
-        if AUTO_MODE:
+        if self.config.auto_mode:
             self.end = get_random_empty_cell(grid)
         # Sinh ô bắt đầu và ô kết thúc
 
-        return CellGrid(self.screen.get_rect(), grid, self.start, self.end)
+        grid = CellGrid(self.screen.get_rect(), grid, self.start, self.end)
+        self.graph: CSRGraph | None = None  # Đồ thị CSR của lưới (engine "csr")
+        grid.change_listeners.append(self.invalidate_graph)
+        self.board_key = None  # Bản vẽ bảng đã lưu không còn dùng được
+        self.dirty_cells: set[tuple[int, int]] = set()  # Các ô cần vẽ lại
+        grid.change_listeners.append(self.mark_dirty)
+        return grid
+
+    def mark_dirty(self, changes: ChangeSet) -> None:
+        """Đánh dấu các ô vừa đổi loại để vẽ lại ở khung hình sau."""
+        self.dirty_cells.update(changes)
+
+    def invalidate_graph(self, changes: ChangeSet) -> None:
+        """Bỏ đồ thị CSR đã biên dịch khi bản đồ bị sửa (một lần cho mỗi lần sửa)."""
+        self.graph = None
 
     def update_step(self, x):
         self.step = x
@@ -122,7 +320,7 @@ class Game:
         """
         Tạo một lưới mới với các cài đặt ngẫu nhiên.
         """
-        self.grid: CellGrid = self.init_grid(GRID_SIZE, GRID_SIZE)
+        self.grid: CellGrid = self.init_grid()
         self.slider = Slider(
             (BOARD_SIZE - SLIDER_WIDTH) // 2,
             (BOARD_SIZE + SCREEN_HEIGHT - SLIDER_HEIGHT) // 2,
@@ -131,6 +329,8 @@ class Game:
         )
 
         self.path = None  # Đường đi từ vị trí đầu đến cuối
+        self.path_stale = False
+        self.search_key = None
         self.mouse_held = False
         self.step = 0  # Bước đi trong quá trình tìm đường
         self.mode = Mode.Cost  # Chế độ hiển thị mặc định
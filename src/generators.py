@@ -0,0 +1,221 @@
+"""
+Các bộ sinh bản đồ dùng mảng NumPy, đủ nhanh cho bản đồ benchmark cỡ lớn (4096²).
+
+Mọi bộ sinh trả về mảng `bool` kích thước (width, height), đánh chỉ số
+theo `[x, y]` giống `CellGrid.grid`, với `True` là ô vật cản.
+Truyền cùng `seed` sẽ sinh ra cùng một bản đồ.
+"""
+
+import numpy as np
+
+
+def _rng(seed: int | None) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def random_fill(
+    width: int, height: int, density: float = 0.3, seed: int | None = None
+) -> np.ndarray:
+    """
+    Sinh bản đồ với mỗi ô là vật cản độc lập với xác suất `density`.
+
+    Args:
+        width (int): Số lượng ô chiều ngang
+        height (int): Số lượng ô chiều dọc
+        density (float): Tỉ lệ ô vật cản
+        seed (int | None): Hạt giống ngẫu nhiên
+
+    Returns:
+        np.ndarray: Mảng vật cản (width, height)
+    """
+    return _rng(seed).random((width, height), dtype=np.float32) < density
+
+
+def maze(width: int, height: int, seed: int | None = None) -> np.ndarray:
+    """
+    Sinh mê cung hoàn hảo (mọi ô trống đều nối với nhau, không có chu trình)
+    bằng thuật toán binary tree: mỗi ô phòng ở tọa độ chẵn đục thông sang
+    phải hoặc xuống dưới một cách ngẫu nhiên. Toàn bộ thực hiện bằng phép toán mảng.
+
+    Args:
+        width (int): Số lượng ô chiều ngang
+        height (int): Số lượng ô chiều dọc
+        seed (int | None): Hạt giống ngẫu nhiên
+
+    Returns:
+        np.ndarray: Mảng vật cản (width, height)
+    """
+    walls = np.ones((width, height), dtype=bool)
+    walls[0::2, 0::2] = False  # Các ô phòng
+
+    rooms_x, rooms_y = walls[0::2, 0::2].shape
+    has_right = (np.arange(rooms_x) < rooms_x - 1)[:, None]
+    has_down = (np.arange(rooms_y) < rooms_y - 1)[None, :]
+
+    # Phòng không có phòng bên phải thì bắt buộc đục xuống và ngược lại,
+    # nhờ đó mọi phòng đều nối về phòng ở góc dưới phải
+    coin = _rng(seed).random((rooms_x, rooms_y)) < 0.5
+    go_right = has_right & (coin | ~has_down)
+    go_down = has_down & ~go_right
+
+    right_x, right_y = np.nonzero(go_right)
+    walls[right_x * 2 + 1, right_y * 2] = False
+    down_x, down_y = np.nonzero(go_down)
+    walls[down_x * 2, down_y * 2 + 1] = False
+    return walls
+
+
+def _count_wall_neighbors(walls: np.ndarray) -> np.ndarray:
+    """Đếm số ô vật cản trong 8 ô xung quanh, ngoài biên tính là vật cản."""
+    padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+    width, height = walls.shape
+    count = np.zeros((width, height), dtype=np.uint8)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            if dx == 1 and dy == 1:
+                continue
+            count += padded[dx : dx + width, dy : dy + height]
+    return count
+
+
+def cave(
+    width: int,
+    height: int,
+    density: float = 0.45,
+    iterations: int = 4,
+    seed: int | None = None,
+) -> np.ndarray:
+    """
+    Sinh bản đồ dạng hang động bằng automat tế bào: khởi tạo ngẫu nhiên rồi
+    lặp quy tắc "ô là vật cản nếu trong 3x3 ô quanh nó (kể cả chính nó)
+    có từ 5 ô vật cản".
+
+    Args:
+        width (int): Số lượng ô chiều ngang
+        height (int): Số lượng ô chiều dọc
+        density (float): Tỉ lệ vật cản ban đầu
+        iterations (int): Số lần lặp quy tắc
+        seed (int | None): Hạt giống ngẫu nhiên
+
+    Returns:
+        np.ndarray: Mảng vật cản (width, height)
+    """
+    walls = random_fill(width, height, density, seed)
+    for _ in range(iterations):
+        walls = _count_wall_neighbors(walls) + walls >= 5
+    return walls
+
+
+def rooms(
+    width: int,
+    height: int,
+    room_count: int | None = None,
+    min_size: int = 3,
+    max_size: int = 12,
+    seed: int | None = None,
+) -> np.ndarray:
+    """
+    Sinh bản đồ gồm các phòng hình chữ nhật ngẫu nhiên nối với nhau
+    bằng hành lang hình chữ L (phòng thứ i nối với phòng thứ i - 1).
+
+    Args:
+        width (int): Số lượng ô chiều ngang
+        height (int): Số lượng ô chiều dọc
+        room_count (int | None): Số phòng, mặc định tỉ lệ với diện tích
+        min_size (int): Cạnh nhỏ nhất của phòng
+        max_size (int): Cạnh lớn nhất của phòng
+        seed (int | None): Hạt giống ngẫu nhiên
+
+    Returns:
+        np.ndarray: Mảng vật cản (width, height)
+    """
+    rng = _rng(seed)
+    if room_count is None:
+        room_count = max(1, width * height // (max_size * max_size * 8))
+    max_size = max(1, min(max_size, width, height))
+    min_size = max(1, min(min_size, max_size))
+
+    room_w = rng.integers(min_size, max_size + 1, room_count)
+    room_h = rng.integers(min_size, max_size + 1, room_count)
+    room_x = (rng.random(room_count) * (width - room_w + 1)).astype(np.int64)
+    room_y = (rng.random(room_count) * (height - room_h + 1)).astype(np.int64)
+    center_x = room_x + room_w // 2
+    center_y = room_y + room_h // 2
+
+    # Hành lang: đi ngang theo hàng của phòng trước rồi đi dọc theo cột của phòng này.
+    # Mỗi hành lang cũng là một hình chữ nhật rộng 1 ô
+    prev_x, prev_y = center_x[:-1], center_y[:-1]
+    next_x, next_y = center_x[1:], center_y[1:]
+    hall_x0 = np.minimum(prev_x, next_x)
+    hall_x1 = np.maximum(prev_x, next_x) + 1
+    hall_y0 = np.minimum(prev_y, next_y)
+    hall_y1 = np.maximum(prev_y, next_y) + 1
+
+    x0 = np.concatenate((room_x, hall_x0, next_x))
+    x1 = np.concatenate((room_x + room_w, hall_x1, next_x + 1))
+    y0 = np.concatenate((room_y, prev_y, hall_y0))
+    y1 = np.concatenate((room_y + room_h, prev_y + 1, hall_y1))
+    return ~_cover_rects(width, height, x0, y0, x1, y1)
+
+
+def _cover_rects(
+    width: int,
+    height: int,
+    x0: np.ndarray,
+    y0: np.ndarray,
+    x1: np.ndarray,
+    y1: np.ndarray,
+) -> np.ndarray:
+    """
+    Đánh dấu hợp của nhiều hình chữ nhật [x0, x1) x [y0, y1) cùng lúc
+    bằng mảng hiệu 2 chiều và tổng tiền tố.
+    """
+    stride = height + 1
+    size = (width + 1) * stride
+    added = np.concatenate((x0 * stride + y0, x1 * stride + y1))
+    removed = np.concatenate((x1 * stride + y0, x0 * stride + y1))
+    covered = np.bincount(added, minlength=size).astype(np.int32)
+    covered -= np.bincount(removed, minlength=size).astype(np.int32)
+    covered = covered.reshape(width + 1, stride)
+    np.cumsum(covered, axis=0, out=covered)
+    np.cumsum(covered, axis=1, out=covered)
+    return covered[:width, :height] > 0
+
+
+def free_cells(walls: np.ndarray) -> np.ndarray:
+    """Chỉ số phẳng của các ô trống, dùng làm chỉ mục để lấy mẫu."""
+    return np.flatnonzero(~walls)
+
+
+def random_empty_cells(
+    walls: np.ndarray, count: int = 1, seed: int | None = None
+) -> list[tuple[int, int]]:
+    """
+    Lấy ngẫu nhiên `count` ô trống khác nhau từ chỉ mục các ô trống
+    (không lặp lại việc random cho đến khi trúng ô trống).
+
+    Args:
+        walls (np.ndarray): Mảng vật cản
+        count (int): Số ô cần lấy
+        seed (int | None): Hạt giống ngẫu nhiên
+
+    Returns:
+        list[tuple[int, int]]: Danh sách tọa độ ô trống
+
+    Raises:
+        ValueError: Nếu bản đồ không đủ ô trống.
+    """
+    free = free_cells(walls)
+    if len(free) < count:
+        raise ValueError("Not enough empty cells on the map.")
+    picked = _rng(seed).choice(free, size=count, replace=False)
+    xs, ys = np.unravel_index(picked, walls.shape)
+    return [(int(x), int(y)) for x, y in zip(xs, ys)]
+
+
+GENERATORS = {
+    "maze": maze,
+    "cave": cave,
+    "rooms": rooms,
+    "random": random_fill,
+}
@@ -1,17 +1,18 @@
 from __future__ import annotations  # For forward reference of CellGrid
 
-import math
-
+import numpy as np
 import pygame as pg
 
 from src.config import (
     CELL_GAP,
-    CELL_SIZE,
     MARGIN,
+    cell_size,
 )
-from src.types import ArrowDirection, CellMark, CellType
-from src.ui import Arrow
-from src.utils import add_point
+from src.bitmap import WallBitmap
+from src.map_edit import ChangeSet, cells_mask, polygon_mask, rect_mask
+from src.types import CellMark, CellType
+
+EMPTY, NO_MARK = CellType.Empty, CellMark.No  # Dùng trong các vòng lặp nóng
 
 
 class Cell:
@@ -20,33 +21,22 @@ class Cell:
 
     Attributes:
         type (CellType): Loại ô (ví dụ: trống hoặc vật cản).
-        count (float): Trọng số (đặt ban đầu là vô cùng).
-        priority (float): Độ ưu tiên trong thuật toán A* (đặt ban đầu là vô cùng).
-        hidden (float): Trọng số (ẩn) của ô.
         mark (CellMark): Bắt đầu, kết thúc, hoặc không có.
-        path_from (Cell | None): Ô trước đó.
-        arrow (Arrow): Hướng mũi tên chỉ về ô trước đó trong đường đi.
         pos (tuple[int, int]): Vị trí của ô trong lưới.
+
+    Thông tin tìm kiếm (số bước, ô trước đó, ...) không lưu trên ô mà trong
+    `SearchState` của từng lần tìm kiếm. CellGrid không giữ các ô: loại ô nằm
+    trong `WallBitmap` của lưới, và `CellGrid.at` trả về một ô mới được dựng từ
+    bitmap, nên sửa ô nhận được không làm thay đổi lưới; dùng `CellGrid.toggle`
+    hoặc `CellGrid.apply_mask` để sửa bản đồ.
     """
 
-    def __init__(self, type=CellType.Empty, pos=None):
+    __slots__ = ("type", "mark", "pos")
+
+    def __init__(self, type=CellType.Empty, pos=None, mark=CellMark.No):
         self.type = type
-        self.cost = math.inf
-        self.heuristic = math.inf
-        self.mark = CellMark.No
-        self.path_from: None | Cell = None
-        self.arrow: Arrow = None
+        self.mark = mark
         self.pos: None | tuple[int, int] = pos
-        self.hidden = math.inf
-        self.is_current = False
-        self.is_next = False
-
-    def __lt__(self, other):
-        """
-        So sánh hai ô dựa trên số bước kể từ ô bắt đầu (count)
-        để hỗ trợ cho hàng đợi ưu tiên.
-        """
-        return self.hidden > other.hidden
 
     def is_start(self):
         return self.mark == CellMark.Start
@@ -54,36 +44,6 @@ class Cell:
     def is_end(self):
         return self.mark == CellMark.End
 
-    def toggle_type(self):
-        """
-        Chuyển đổi loại ô giữa Trống và Tường.
-        Dùng khi người dùng kéo chuột qua lưới.
-        """
-        self.type = CellType.Wall if self.type == CellType.Empty else CellType.Empty
-
-    def update_cell(self, count: int, path_from: Cell, heuristic: float):
-        """
-        Cập nhật ô với số bước kể từ ô bắt đầu,
-        độ ưu tiên và ô trước đó trong đường đi.
-        Parameters:
-            cost (int): Giá trị đếm cho ô.
-            path_from (Cell): Ô trước đó trong đường đi đến ô hiện tại.
-            heuristic (float): Giá trị của hàm lượng giá tại ô
-        """
-        self.cost = count
-        self.path_from = path_from
-        self.heuristic = heuristic
-
-        if path_from is not None:
-            if path_from.pos[0] < self.pos[0]:
-                self.arrow = Arrow(ArrowDirection.Left)
-            elif path_from.pos[0] > self.pos[0]:
-                self.arrow = Arrow(ArrowDirection.Right)
-            elif path_from.pos[1] < self.pos[1]:
-                self.arrow = Arrow(ArrowDirection.Up)
-            elif path_from.pos[1] > self.pos[1]:
-                self.arrow = Arrow(ArrowDirection.Down)
-
 
 class GridMetrics:
     """
@@ -105,6 +65,8 @@ class GridMetrics:
         self.height = area[3] - area[1] - 2 * MARGIN
 
         self.pos_x, self.pos_y = grid.get_size()
+        self.cell_size = cell_size(max(self.pos_x, self.pos_y))
+        # Kích thước ô tính theo kích thước lưới thực tế
 
     def cell_rect(self, pos: tuple[int, int]) -> pg.Rect:
         """
@@ -117,10 +79,10 @@ class GridMetrics:
             pg.Rect: Hình chữ nhật đại diện cho ô tại `pos`.
         """
         return pg.Rect(
-            self.left + pos[0] * (CELL_SIZE + CELL_GAP),
-            self.top + pos[1] * (CELL_SIZE + CELL_GAP),
-            CELL_SIZE,
-            CELL_SIZE,
+            self.left + pos[0] * (self.cell_size + CELL_GAP),
+            self.top + pos[1] * (self.cell_size + CELL_GAP),
+            self.cell_size,
+            self.cell_size,
         )
 
     def cell_center(self, pos: tuple[int, int]) -> tuple[int, int]:
@@ -142,19 +104,38 @@ class CellGrid:
     Lớp đại diện cho toàn bộ lưới ô và quản lý các chức năng như
     thiết lập ô bắt đầu, ô kết thúc, lấy các ô lân cận, và các thao tác với lưới.
 
+    Loại ô được lưu duy nhất trong `bitmap` (1 bit mỗi ô); ô bắt đầu / kết thúc
+    là `start` / `end`. Mọi thao tác đọc (`at`, `get_neighbors`, `grid_walls`) và
+    sửa (`toggle`, `apply_mask`) đều làm việc trực tiếp trên bitmap.
+
     Attributes:
-        grid (list[list[Cell]]): Ma trận các ô trong lưới.
+        bitmap (WallBitmap): Bản đồ vật cản của lưới.
         metrics (GridMetrics): Các thông số về kích thước và vị trí cho lưới.
     """
 
     def __init__(
         self,
         area: tuple[int, int, int, int],
-        grid: list[list[Cell]],
+        grid: list[list[Cell]] | np.ndarray,
         start=None,
         end=None,
     ):
-        self.grid = grid
+        """
+        Parameters:
+            area (tuple[int, int, int, int]): Vùng vẽ lưới.
+            grid (list[list[Cell]] | np.ndarray): Các ô (ví dụ từ `gen_grid`) hoặc
+                mảng bool (width, height), True là ô vật cản.
+            start, end (tuple[int, int]): Ô bắt đầu và ô kết thúc.
+        """
+        if not isinstance(grid, np.ndarray):
+            grid = np.array(
+                [[cell.type == CellType.Wall for cell in column] for column in grid],
+                dtype=bool,
+            )
+        self.bitmap = WallBitmap.from_walls(grid)
+        self.marker_listeners = []
+        # Các hàm được gọi với (start, end) mỗi khi ô bắt đầu hoặc kết thúc bị di chuyển
+        self.start = self.end = None
         self.set_start(start)
         self.set_end(end)
         self.metrics = GridMetrics(area, self)
@@ -169,6 +150,13 @@ class CellGrid:
         self.dragging_end = False
         # Dùng để xác định ô được kéo có phải ô bắt đâu hay kết thúc không
 
+        self.listeners = []
+        # Các hàm được gọi với vị trí ô mỗi khi loại ô thay đổi,
+        # dùng để cập nhật các dữ liệu tiền xử lý phụ thuộc vào bản đồ
+        self.change_listeners = []
+        # Các hàm được gọi một lần với `ChangeSet` gộp của mỗi lần sửa bản đồ
+        self.version = 0  # Tăng một lần sau mỗi lần sửa bản đồ
+
     def get_size(self) -> tuple[int, int]:
         """
         Trả về kích thước của lưới
@@ -176,7 +164,10 @@ class CellGrid:
         Returns:
             tuple[int, int]: Kích thước của lưới (zero-index).
         """
-        return (len(self.grid), len(self.grid[0]))  # Using a tuple
+        return (self.bitmap.width, self.bitmap.height)  # Using a tuple
+
+    def is_wall(self, pos: tuple[int, int]) -> bool:
+        return self.bitmap.is_wall(pos)
 
     def at(self, pos: tuple[int, int]) -> Cell:
         """
@@ -186,42 +177,117 @@ class CellGrid:
             pos (tuple[int, int]): Vị trí của ô.
 
         Returns:
-            Cell: Ô tại vị trí `pos`.
+            Cell: Ô mới dựng từ bitmap (loại ô) và `start` / `end` (dấu của ô).
         """
-        return self.grid[pos[0]][pos[1]]
+        pos = (pos[0], pos[1])
+        cell_type = CellType.Wall if self.bitmap.is_wall(pos) else EMPTY
+        return Cell(cell_type, pos, self._mark_of(pos))
 
-    def clear_count(self) -> None:
+    def _mark_of(self, pos: tuple[int, int]) -> CellMark:
+        if pos == self.start:
+            return CellMark.Start
+        return CellMark.End if pos == self.end else NO_MARK
+
+    def toggle(self, pos: tuple[int, int]) -> None:
+        """
+        Chuyển đổi loại ô tại `pos` giữa Trống và Tường, rồi báo cho các `listeners`.
         """
-        Reset các giá trị của ô về ban đầu
+        self.bitmap.toggle(pos)
+        self.version += 1
+        self._notify(
+            ChangeSet(
+                np.array([pos], dtype=np.int64),
+                np.array([self.bitmap.is_wall(pos)]),
+                self.version,
+            )
+        )
+
+    def apply_mask(self, mask: np.ndarray, is_wall: bool) -> ChangeSet:
+        """
+        Đặt loại cho mọi ô trong mặt nạ `mask` trong một lần sửa: phiên bản chỉ
+        tăng một lần và các `change_listeners` nhận một `ChangeSet` gộp. Ô bắt
+        đầu và ô kết thúc không bị biến thành vật cản.
+
+        Các ô cần đổi được tìm bằng phép toán mảng trên bản giải nén của bitmap
+        và được ghi vào bitmap theo lô (`WallBitmap.set_walls`), không có vòng
+        lặp Python theo từng ô.
+
+        Parameters:
+            mask (np.ndarray): Mảng bool (width, height), True là ô cần sửa.
+            is_wall (bool): Loại mới của các ô.
+
+        Returns:
+            ChangeSet: Các ô thực sự đổi loại (rỗng thì không có gì được báo).
         """
-        for row in self.grid:
-            for cell in row:
-                cell.cost = math.inf if cell.mark != CellMark.Start else 0
-                cell.hidden = math.inf if cell.mark != CellMark.Start else 0
-                cell.path_from = None
-                cell.arrow = None
-                cell.is_current = False
-                cell.is_next = False
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.get_size():
+            raise ValueError(
+                f"Mask shape {mask.shape} does not match grid size {self.get_size()}."
+            )
+        if is_wall:
+            mask = mask.copy()
+            mask[self.start] = mask[self.end] = False
+
+        changed = mask & (self.bitmap.to_walls() != is_wall)
+        positions = np.argwhere(changed).astype(np.int64)
+        walls = np.full(len(positions), is_wall, dtype=bool)
+        if not len(positions):
+            return ChangeSet(positions, walls, self.version)
+
+        self.bitmap.set_walls(positions, walls)
+        self.version += 1
+        changes = ChangeSet(positions, walls, self.version)
+        self._notify(changes)
+        return changes
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, is_wall: bool) -> ChangeSet:
+        """Đặt loại cho mọi ô trong hình chữ nhật [x0, x1] x [y0, y1] (bao gồm biên)."""
+        return self.apply_mask(rect_mask(self.get_size(), x0, y0, x1, y1), is_wall)
+
+    def fill_polygon(
+        self, vertices: list[tuple[float, float]], is_wall: bool
+    ) -> ChangeSet:
+        """Đặt loại cho mọi ô nằm trong đa giác `vertices`."""
+        return self.apply_mask(polygon_mask(self.get_size(), vertices), is_wall)
+
+    def set_cells(self, cells: list[tuple[int, int]], is_wall: bool) -> ChangeSet:
+        """Đặt loại cho các ô trong danh sách `cells`."""
+        return self.apply_mask(cells_mask(self.get_size(), cells), is_wall)
+
+    def _notify(self, changes: ChangeSet) -> None:
+        for listener in self.change_listeners:
+            listener(changes)
+        if self.listeners:
+            # Các listener theo từng ô được gọi sau khi mọi ô đã được sửa
+            for pos in changes:
+                for listener in self.listeners:
+                    listener(pos)
 
     def set_start(self, pos: tuple[int, int]) -> None:
-        """Đặt các gái trị của ô bắt đầu."""
-        self.start = pos
-        self.at(pos).mark = CellMark.Start
-        self.at(pos).cost = 0
-        self.at(pos).hidden = 0
+        """Đặt các gái trị của ô bắt đầu, rồi báo cho các `marker_listeners`."""
+        pos = (pos[0], pos[1])
+        if pos != self.start:
+            self.start = pos
+            self._notify_markers()
 
     def set_end(self, pos: tuple[int, int]) -> None:
-        """Đặt các giá trị của ô kết thúc"""
-        self.end = pos
-        self.at(pos).mark = CellMark.End
+        """Đặt các giá trị của ô kết thúc, rồi báo cho các `marker_listeners`."""
+        pos = (pos[0], pos[1])
+        if pos != self.end:
+            self.end = pos
+            self._notify_markers()
+
+    def _notify_markers(self) -> None:
+        for listener in self.marker_listeners:
+            listener(self.start, self.end)
 
     def get_start(self) -> Cell:
         """Lấy ô bắt đầu"""
-        return self.grid[self.start[0]][self.start[1]]
+        return self.at(self.start)
 
     def get_end(self) -> Cell:
         """Lấy ô kết thúc"""
-        return self.grid[self.end[0]][self.end[1]]
+        return self.at(self.end)
 
     def get_neighbors(self, pos: tuple[int, int]) -> list[Cell]:
         """
@@ -231,7 +297,7 @@ class CellGrid:
             pos (tuple[int, int]): Vị trí của ô.
 
         Returns:
-            list[Cell]: Danh sách các ô lân cận.
+            list[Cell]: Danh sách các ô lân cận (trống).
         """
         neighbors = []
         offsets = (
@@ -240,12 +306,36 @@ class CellGrid:
             else [(1, 0), (0, 1), (-1, 0), (0, -1)]
         )
 
-        for offset in offsets:
-            ncell_pos = add_point(pos, offset)
-            if 0 <= ncell_pos[0] < len(self.grid) and 0 <= ncell_pos[1] < len(
-                self.grid[0]
+        bitmap = self.bitmap
+        rows = bitmap.rows
+        marked = (self.start, self.end)
+        for dx, dy in offsets:
+            x, y = pos[0] + dx, pos[1] + dy
+            if (
+                0 <= x < bitmap.width
+                and 0 <= y < bitmap.height
+                and not rows.item(y, x >> 6) >> (x & 63) & 1
             ):
-                ncell = self.at(ncell_pos)
-                if ncell.type == CellType.Empty:
-                    neighbors.append(ncell)
+                ncell_pos = (x, y)
+                mark = self._mark_of(ncell_pos) if ncell_pos in marked else NO_MARK
+                neighbors.append(Cell(EMPTY, ncell_pos, mark))
         return neighbors
+
+
+def grid_walls(grid) -> np.ndarray:
+    """
+    Mảng bool (width, height) các ô vật cản của một lưới: CellGrid, GridSnapshot
+    (có sẵn `walls()`) hoặc lưới bất kỳ có `get_size` và `at`.
+    """
+    if isinstance(grid, CellGrid):
+        return grid.bitmap.to_walls()
+    if hasattr(grid, "walls"):
+        return grid.walls()  # GridSnapshot
+    width, height = grid.get_size()
+    return np.array(
+        [
+            [grid.at((x, y)).type == CellType.Wall for y in range(height)]
+            for x in range(width)
+        ],
+        dtype=bool,
+    )
@@ -0,0 +1,92 @@
+import math
+
+from src.a_star import heuristic
+from src.grid import CellGrid
+from src.types import HeuristicType
+
+
+def ida_star(
+    grid: CellGrid,
+    heuristic_type: HeuristicType = HeuristicType.MANHATTAN,
+    node_budget: int = 20_000,
+) -> list[tuple[int, int]]:
+    """
+    Hàm thực hiện thuật toán IDA* (A* lặp sâu dần) với bảng chuyển vị có giới hạn.
+    Bộ nhớ chỉ gồm đường đi hiện tại và bảng chuyển vị tối đa `node_budget` ô,
+    thay vì hàng đợi ưu tiên và tập `visited` chứa toàn bộ vùng đã duyệt như `a_star`.
+
+    Mỗi vòng lặp là một lượt tìm kiếm theo chiều sâu, cắt bỏ các ô có
+    f = g + h vượt ngưỡng; ngưỡng vòng sau là f nhỏ nhất đã bị cắt.
+    Bảng chuyển vị được giữ qua các vòng và lưu cho mỗi ô g nhỏ nhất đã gặp
+    cùng vòng gần nhất ô được mở rộng với g đó. Một ô bị bỏ qua nếu đã tới
+    được với g nhỏ hơn (ở bất kỳ vòng nào), hoặc với g bằng nhau trong chính
+    vòng hiện tại; ô có g bằng nhau từ vòng trước vẫn được mở rộng lại vì
+    ngưỡng đã tăng. Khi bảng đầy, ô mới không được ghi thêm (tìm kiếm vẫn
+    đúng, chỉ có thể duyệt lại nhiều hơn).
+
+    Mỗi mục của bảng tốn khoảng 240 byte, nên `node_budget` mặc định giới hạn
+    bảng ở khoảng 5 MiB dù bản đồ lớn đến đâu, còn bộ nhớ của `a_star` tăng
+    theo vùng đã duyệt. Với truy vấn mà `a_star` chỉ duyệt ít ô, hai bên dùng
+    bộ nhớ tương đương (xem `measure_bounded_memory`).
+
+    Parameters:
+        grid (CellGrid): Lưới chứa các ô và thông tin vị trí bắt đầu và kết thúc.
+        heuristic_type (HeuristicType): Hàm lượng giá, cần chấp nhận được để đường đi ngắn nhất.
+        node_budget (int): Số ô tối đa trong bảng chuyển vị.
+
+    Returns:
+        list[tuple[int, int]]: Danh sách các tọa độ từ ô bắt đầu đến ô kết thúc,
+        rỗng nếu không có đường đi (trường hợp này rất chậm vì phải tăng ngưỡng
+        cho tới khi vượt f của mọi ô tới được).
+    """
+    start, goal = grid.start, grid.end
+    if start == goal:
+        return [start]
+
+    bound = heuristic(goal, start, heuristic_type)
+    table = {}  # Bảng chuyển vị: vị trí -> (g nhỏ nhất, vòng mở rộng gần nhất)
+    iteration = 0
+    while True:
+        iteration += 1
+        table[start] = (0, iteration)
+        next_bound = math.inf
+        path = [start]  # Đường đi hiện tại, g của ô cuối = len(path) - 1
+        on_path = {start}
+        stack = [iter(grid.get_neighbors(start))]
+
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                # Đã duyệt hết lân cận: quay lui
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+
+            pos = neighbor.pos
+            new_cost = len(path)
+            if pos in on_path:
+                continue
+            seen = table.get(pos)
+            if seen is not None and (
+                seen[0] < new_cost or seen == (new_cost, iteration)
+            ):
+                continue  # Đã tới ô này với số bước nhỏ hơn, hoặc bằng trong vòng này
+
+            priority = new_cost + heuristic(goal, pos, heuristic_type)
+            if priority > bound:
+                next_bound = min(next_bound, priority)
+                continue
+
+            if pos == goal:
+                path.append(pos)
+                return path
+
+            if seen is not None or len(table) < node_budget:
+                table[pos] = (new_cost, iteration)
+            path.append(pos)
+            on_path.add(pos)
+            stack.append(iter(grid.get_neighbors(pos)))
+
+        if next_bound == math.inf:
+            return []  # Không còn ô nào bị cắt: không có đường đi
+        bound = next_bound
@@ -0,0 +1,97 @@
+"""
+Sửa bản đồ theo khối: hình chữ nhật, mặt nạ, đa giác hoặc danh sách ô.
+
+Vùng cần sửa được dựng thành mặt nạ bool (width, height) bằng NumPy và
+`CellGrid.apply_mask` ghi nó vào bitmap của lưới bằng phép toán mảng, không có
+vòng lặp theo từng ô. Mỗi lần sửa chỉ tăng phiên bản bản đồ một lần, và các cấu
+trúc phụ thuộc (đồ thị đã biên dịch, bảng tiền xử lý, snapshot, ...) nhận một
+`ChangeSet` gộp qua `CellGrid.change_listeners` thay vì một lần gọi cho mỗi ô.
+"""
+
+import numpy as np
+
+
+class ChangeSet:
+    """
+    Các ô đã đổi loại trong một lần sửa bản đồ.
+
+    Attributes:
+        positions (np.ndarray): Mảng int64 (N, 2), tọa độ (x, y) của các ô đã đổi.
+        walls (np.ndarray): Mảng bool (N,), loại mới của mỗi ô (True là vật cản).
+        version (int): Phiên bản bản đồ sau lần sửa.
+    """
+
+    __slots__ = ("positions", "walls", "version")
+
+    def __init__(self, positions: np.ndarray, walls: np.ndarray, version: int):
+        self.positions = positions
+        self.walls = walls
+        self.version = version
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self):
+        """Duyệt các tọa độ dưới dạng tuple[int, int]."""
+        return iter(map(tuple, self.positions.tolist()))
+
+    def bounds(self) -> tuple[int, int, int, int] | None:
+        """Hình chữ nhật (x0, y0, x1, y1) (bao gồm biên) chứa mọi ô đã đổi."""
+        if not len(self.positions):
+            return None
+        x0, y0 = self.positions.min(axis=0).tolist()
+        x1, y1 = self.positions.max(axis=0).tolist()
+        return x0, y0, x1, y1
+
+
+def rect_mask(shape: tuple[int, int], x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+    """Mặt nạ của hình chữ nhật [x0, x1] x [y0, y1] (bao gồm biên), cắt theo bản đồ."""
+    mask = np.zeros(shape, dtype=bool)
+    mask[max(x0, 0) : max(x1 + 1, 0), max(y0, 0) : max(y1 + 1, 0)] = True
+    return mask
+
+
+def cells_mask(shape: tuple[int, int], cells) -> np.ndarray:
+    """Mặt nạ của danh sách ô (x, y); báo lỗi nếu có ô nằm ngoài bản đồ."""
+    positions = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    outside = (positions < 0).any(axis=1) | (positions >= shape).any(axis=1)
+    if outside.any():
+        raise ValueError(
+            f"Position {tuple(positions[outside][0].tolist())} is outside the grid."
+        )
+    mask = np.zeros(shape, dtype=bool)
+    mask[positions[:, 0], positions[:, 1]] = True
+    return mask
+
+
+def polygon_mask(
+    shape: tuple[int, int], vertices: list[tuple[float, float]]
+) -> np.ndarray:
+    """
+    Mặt nạ các ô có tọa độ (x, y) nằm trong đa giác `vertices` (quy tắc chẵn lẻ).
+
+    Chỉ các ô trong hình chữ nhật bao của đa giác được kiểm tra, mỗi cạnh được
+    xét cho tất cả các ô cùng lúc.
+    """
+    points = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 3:
+        raise ValueError("A polygon needs at least 3 vertices.")
+    mask = np.zeros(shape, dtype=bool)
+    x0, y0 = np.maximum(np.ceil(points.min(axis=0)), 0).astype(int)
+    x1 = min(int(np.floor(points[:, 0].max())), shape[0] - 1)
+    y1 = min(int(np.floor(points[:, 1].max())), shape[1] - 1)
+    if x0 > x1 or y0 > y1:
+        return mask
+
+    xs = np.arange(x0, x1 + 1, dtype=np.float64)[:, None]
+    ys = np.arange(y0, y1 + 1, dtype=np.float64)[None, :]
+    inside = np.zeros((x1 - x0 + 1, y1 - y0 + 1), dtype=bool)
+    for (ax, ay), (bx, by) in zip(points, np.roll(points, -1, axis=0)):
+        if ay == by:
+            continue  # Cạnh nằm ngang không cắt tia ngang
+        # Tia từ ô đi theo chiều x dương cắt cạnh (a, b)
+        crosses = (ay > ys) != (by > ys)
+        crossing_x = ax + (ys - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (xs < crossing_x)
+    mask[x0 : x1 + 1, y0 : y1 + 1] = inside
+    return mask
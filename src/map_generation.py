@@ -1,5 +1,7 @@
 import random
-from src.config import AUTO_MODE
+
+import numpy as np
+
 from src.grid import Cell
 from src.types import CellType
 
@@ -12,7 +14,8 @@ def gen_grid(
     Args:
         width (int): Số lượng ô chiều ngang
         height (int): Số lượng ô chiều dọc
-        walls ([List[Tuple[int, int]]]): Danh sách các ô vật cản
+        walls ([List[Tuple[int, int]]]): Danh sách các ô vật cản,
+            None để sinh vật cản ngẫu nhiên chia bản đồ làm 4 góc phần tư
 
     Returns:
         List[List[Cell]]: Mảng 2 chiều chứa các ô kiểu Cell
@@ -23,7 +26,7 @@ def gen_grid(
         for x in range(width)
     ]
 
-    if AUTO_MODE:
+    if walls is None:
         # Tạo vật cản tách bản đồ ra làm 4 góc phần tư
         for x in range(width):
             grid[x][height // 2].type = CellType.Wall
@@ -47,21 +50,37 @@ def gen_grid(
     return grid
 
 
+def gen_grid_from_walls(walls: np.ndarray) -> list[list[Cell]]:
+    """Chuyển mảng vật cản (xem `src.generators`) thành mảng 2 chiều các Cell
+
+    Args:
+        walls (np.ndarray): Mảng bool (width, height), True là ô vật cản
+
+    Returns:
+        List[List[Cell]]: Mảng 2 chiều chứa các ô kiểu Cell
+    """
+    types = (CellType.Empty, CellType.Wall)
+    return [
+        [Cell(type=types[is_wall], pos=(x, y)) for y, is_wall in enumerate(column)]
+        for x, column in enumerate(walls.tolist())
+    ]
+
+
 def get_random_empty_cell(grid: list[list[Cell]]) -> tuple[int, int]:
-    """Random đến khi nào ô đó không phải là ô vật cản
+    """Chọn ngẫu nhiên 1 ô từ danh sách các ô trống (bao gồm cả hàng và cột cuối)
 
     Args:
         grid (list[list[Cell]]): Mảng grid 2 chiều chứa các Cell
 
     Returns:
         tuple[int, int]: 1 ô không phải là vật cản ngẫu nhiên
-    """
-    cell = None
 
-    while not cell or grid[cell[0]][cell[1]].type == CellType.Wall:
-        cell = (
-            random.randrange(0, len(grid) - 1),
-            random.randrange(0, len(grid) - 1),
-        )
-
-    return cell
+    Raises:
+        ValueError: Nếu bản đồ không còn ô trống nào.
+    """
+    free = [
+        cell.pos for column in grid for cell in column if cell.type == CellType.Empty
+    ]
+    if not free:
+        raise ValueError("The map has no empty cell.")
+    return random.choice(free)
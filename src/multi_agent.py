@@ -0,0 +1,349 @@
+"""
+Tìm đường cho nhiều tác tử trên cùng một lưới (Windowed Hierarchical Cooperative A*).
+
+Mỗi tác tử được lập kế hoạch lần lượt bằng A* trong không gian - thời gian,
+tránh các ô (và các cạnh) đã được tác tử trước đặt chỗ trong bảng đặt chỗ.
+Chỉ `window` bước đầu tiên được đặt chỗ; sau mỗi `window // 2` bước mọi tác tử
+lập lại kế hoạch. Bản đồ khoảng cách tới đích được tái sử dụng, và bảng đặt chỗ
+được giữ giữa các lần lập kế hoạch: mỗi tác tử chỉ xóa chỗ cũ của chính nó ngay
+trước khi lập lại kế hoạch, nên tác tử lập trước vẫn tránh phần kế hoạch cũ còn
+hiệu lực của các tác tử lập sau.
+
+Tác tử không tìm được kế hoạch (kể cả sau khi được đưa lên đầu thứ tự ưu tiên)
+đứng yên trong cửa sổ đó; chỗ đứng yên được đặt trước và các tác tử khác lập lại
+kế hoạch tránh nó, nên các đường đi trả về không bao giờ va chạm nhau.
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+from src.grid import CellGrid, grid_walls
+from src.types import CellType
+
+WAIT = (0, 0)
+MOVES = ((1, 0), (0, 1), (-1, 0), (0, -1), WAIT)  # 4 hướng và đứng yên
+
+
+class ReservationTable:
+    """
+    Bảng đặt chỗ không gian - thời gian.
+
+    Mỗi ô (x, y) tại thời điểm t được mã hóa thành một số nguyên
+    `t * cells + x * height + y`; cạnh (a -> b) tại thời điểm t được mã hóa
+    từ khóa của ô đích và chỉ số ô xuất phát. Nhờ vậy bảng chỉ chứa số nguyên.
+
+    Attributes:
+        height (int): Số ô chiều dọc của lưới.
+        cells (int): Tổng số ô của lưới.
+        vertices (dict[int, int]): Khóa ô -> tác tử đặt chỗ.
+        edges (dict[int, int]): Khóa cạnh -> tác tử đặt chỗ.
+        owned (dict[int, tuple[list[int], list[int]]]): Tác tử -> khóa ô và khóa
+            cạnh nó đã đặt, để xóa riêng chỗ của một tác tử.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.height = height
+        self.cells = width * height
+        self.vertices: dict[int, int] = {}
+        self.edges: dict[int, int] = {}
+        self.owned: dict[int, tuple[list[int], list[int]]] = {}
+
+    def index(self, pos: tuple[int, int]) -> int:
+        return pos[0] * self.height + pos[1]
+
+    def vertex_key(self, pos: tuple[int, int], t: int) -> int:
+        return t * self.cells + self.index(pos)
+
+    def edge_key(self, a: tuple[int, int], b: tuple[int, int], t: int) -> int:
+        """Khóa của việc đi từ `a` (thời điểm t - 1) sang `b` (thời điểm t)."""
+        return self.vertex_key(b, t) * self.cells + self.index(a)
+
+    def is_free(
+        self, a: tuple[int, int], b: tuple[int, int], t: int, agent: int
+    ) -> bool:
+        """Kiểm tra tác tử `agent` có thể đi từ `a` sang `b` tại thời điểm t không."""
+        owner = self.vertices.get(self.vertex_key(b, t), agent)
+        if owner != agent:
+            return False
+        # Hai tác tử đổi chỗ cho nhau trong cùng một bước
+        owner = self.edges.get(self.edge_key(b, a, t), agent)
+        return owner == agent
+
+    def reserve(self, agent: int, path: list[tuple[int, int]], start_time: int):
+        """Đặt chỗ các ô và cạnh trên `path`, bắt đầu tại thời điểm `start_time`."""
+        vertices, edges = self.owned.setdefault(agent, ([], []))
+        for i, pos in enumerate(path):
+            key = self.vertex_key(pos, start_time + i)
+            self.vertices[key] = agent
+            vertices.append(key)
+            if i > 0 and path[i - 1] != pos:
+                key = self.edge_key(path[i - 1], pos, start_time + i)
+                self.edges[key] = agent
+                edges.append(key)
+
+    def release(self, agent: int):
+        """Xóa các chỗ do `agent` đặt, giữ nguyên chỗ của các tác tử khác."""
+        vertices, edges = self.owned.pop(agent, ((), ()))
+        for key in vertices:
+            if self.vertices.get(key) == agent:
+                del self.vertices[key]
+        for key in edges:
+            if self.edges.get(key) == agent:
+                del self.edges[key]
+
+    def clear(self):
+        """Xóa mọi chỗ đã đặt, giữ lại đối tượng để dùng cho lần lập kế hoạch sau."""
+        self.vertices.clear()
+        self.edges.clear()
+        self.owned.clear()
+
+
+def _is_free_cell(grid: CellGrid, pos: tuple[int, int]) -> bool:
+    width, height = grid.get_size()
+    return (
+        0 <= pos[0] < width
+        and 0 <= pos[1] < height
+        and grid.at(pos).type == CellType.Empty
+    )
+
+
+def free_positions(grid: CellGrid) -> set[tuple[int, int]]:
+    """Tập tọa độ các ô trống của lưới."""
+    return set(map(tuple, np.argwhere(~grid_walls(grid)).tolist()))
+
+
+def distance_map(
+    free: set[tuple[int, int]], goal: tuple[int, int]
+) -> dict[tuple[int, int], int]:
+    """
+    Khoảng cách thật (BFS ngược từ đích) từ mọi ô trống trong `free` tới `goal`,
+    dùng làm hàm lượng giá chính xác cho A* không gian - thời gian.
+    """
+    distances = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        pos = queue.popleft()
+        distance = distances[pos] + 1
+        for offset in MOVES[:4]:
+            next_pos = (pos[0] + offset[0], pos[1] + offset[1])
+            if next_pos in free and next_pos not in distances:
+                distances[next_pos] = distance
+                queue.append(next_pos)
+    return distances
+
+
+def space_time_a_star(
+    table: ReservationTable,
+    agent: int,
+    start: tuple[int, int],
+    goal: tuple[int, int],
+    start_time: int,
+    window: int,
+    distances: dict[tuple[int, int], int],
+) -> list[tuple[int, int]] | None:
+    """
+    A* trong không gian - thời gian, chỉ xét bảng đặt chỗ trong `window` bước.
+
+    Nút đạt tới giới hạn cửa sổ được coi là nút đích với chi phí
+    g + khoảng cách thật còn lại, nên kế hoạch luôn hướng về đích.
+
+    Returns:
+        list[tuple[int, int]] | None: `window + 1` vị trí (kể cả vị trí hiện tại),
+        hoặc None nếu không tìm được kế hoạch.
+    """
+    if start not in distances:
+        return None
+
+    counter = 0  # Phá hòa khi độ ưu tiên bằng nhau mà không cần so sánh vị trí
+    frontier = [(distances[start], counter, 0, start, None)]
+    parents = {}
+    best = None
+
+    while frontier:
+        priority, _, depth, pos, parent = heapq.heappop(frontier)
+        state = (pos, depth)
+        if state in parents:
+            continue
+        parents[state] = parent
+
+        if depth == window:
+            best = state
+            break
+
+        t = start_time + depth + 1
+        for offset in MOVES:
+            next_pos = (pos[0] + offset[0], pos[1] + offset[1])
+            if (next_pos, depth + 1) in parents or next_pos not in distances:
+                continue
+            if not table.is_free(pos, next_pos, t, agent):
+                continue
+            # Đứng yên tại đích không tốn chi phí
+            step_cost = 0 if pos == goal and next_pos == goal else 1
+            g = priority - distances[pos] + step_cost
+            counter += 1
+            heapq.heappush(
+                frontier,
+                (g + distances[next_pos], counter, depth + 1, next_pos, state),
+            )
+
+    if best is None:
+        return None
+
+    path = []
+    state = best
+    while state is not None:
+        path.append(state[0])
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+def plan_paths(
+    grid: CellGrid,
+    agents: list[tuple[tuple[int, int], tuple[int, int]]],
+    window: int = 16,
+    max_time: int | None = None,
+) -> list[list[tuple[int, int]]]:
+    """
+    Lập kế hoạch đường đi không va chạm cho nhiều tác tử (WHCA*).
+
+    Parameters:
+        grid (CellGrid): Lưới dùng chung.
+        agents (list[tuple[start, goal]]): Vị trí bắt đầu và đích của mỗi tác tử,
+            thứ tự trong danh sách cũng là thứ tự ưu tiên.
+        window (int): Số bước được đặt chỗ trong mỗi lần lập kế hoạch.
+        max_time (int | None): Số bước tối đa, mặc định 4 lần tổng kích thước lưới.
+
+    Returns:
+        list[list[tuple[int, int]]]: Vị trí của mỗi tác tử tại từng thời điểm
+        (cùng độ dài cho mọi tác tử). Tác tử không tới được đích sẽ có vị trí
+        cuối khác đích của nó.
+
+    Raises:
+        ValueError: Nếu có vị trí bắt đầu / đích không hợp lệ hoặc trùng nhau.
+    """
+    window = max(2, window)
+    if max_time is None:
+        max_time = 4 * sum(grid.get_size())
+    starts = [start for start, _ in agents]
+    goals = [goal for _, goal in agents]
+    for pos in starts + goals:
+        if not _is_free_cell(grid, pos):
+            raise ValueError(f"Agent position {pos} is not an empty cell.")
+    if len(set(starts)) != len(starts) or len(set(goals)) != len(goals):
+        raise ValueError("Agents must have distinct starts and goals.")
+
+    width, height = grid.get_size()
+    table = ReservationTable(width, height)
+    distance_cache: dict[tuple[int, int], dict[tuple[int, int], int]] = {}
+    free = free_positions(grid)
+    paths = [[start] for start in starts]
+    order = list(range(len(agents)))  # Thứ tự ưu tiên hiện tại
+    time = 0
+    execute = window // 2  # Số bước thực hiện trước khi lập lại kế hoạch
+
+    while time < max_time and any(path[-1] != goal for path, goal in zip(paths, goals)):
+        plans = _plan_window(
+            free, table, paths, goals, order, time, window, distance_cache
+        )
+        for path, plan in zip(paths, plans):
+            path.extend(plan[1 : execute + 1])
+        time += execute
+
+    return paths
+
+
+def _plan_window(
+    free: set[tuple[int, int]],
+    table: ReservationTable,
+    paths: list[list[tuple[int, int]]],
+    goals: list[tuple[int, int]],
+    order: list[int],
+    time: int,
+    window: int,
+    distance_cache: dict[tuple[int, int], dict[tuple[int, int], int]],
+) -> list[list[tuple[int, int]]]:
+    """
+    Lập kế hoạch một cửa sổ cho mọi tác tử theo thứ tự `order`.
+
+    Tác tử bị chặn hoàn toàn được đưa lên đầu thứ tự ưu tiên (tối đa một lần cho
+    mỗi tác tử, `order` được cập nhật tại chỗ) và cả vòng được lập lại. Nếu vẫn
+    bị chặn, tác tử đứng yên: chỗ đứng yên được đặt trước mọi tác tử khác trong
+    các vòng sau, nên kết quả cuối cùng không có va chạm. Mỗi lần lập lại thêm
+    một tác tử vào tập được ưu tiên hoặc tập đứng yên, nên số vòng không quá
+    2 lần số tác tử.
+    """
+    plans: list[list[tuple[int, int]] | None] = [None] * len(goals)
+    promoted: set[int] = set()
+    waiting: list[int] = []  # Các tác tử đứng yên trong cửa sổ này
+    while True:
+        for agent in waiting:
+            plan = [paths[agent][-1]] * (window + 1)
+            table.release(agent)
+            table.reserve(agent, plan, time)
+            plans[agent] = plan
+
+        blocked = None
+        for agent in order:
+            if agent in waiting:
+                continue
+            goal = goals[agent]
+            if goal not in distance_cache:
+                distance_cache[goal] = distance_map(free, goal)
+            table.release(agent)  # Kế hoạch cũ của chính tác tử không chặn nó
+            plan = space_time_a_star(
+                table,
+                agent,
+                paths[agent][-1],
+                goal,
+                time,
+                window,
+                distance_cache[goal],
+            )
+            if plan is None:
+                blocked = agent
+                break
+            table.reserve(agent, plan, time)
+            plans[agent] = plan
+        if blocked is None:
+            return plans
+
+        if blocked in promoted or blocked == order[0]:
+            waiting.append(blocked)
+        else:
+            promoted.add(blocked)
+            order.remove(blocked)
+            order.insert(0, blocked)
+
+
+def find_conflicts(
+    paths: list[list[tuple[int, int]]],
+) -> list[tuple[int, int, int]]:
+    """
+    Tìm các va chạm (cùng ô cùng thời điểm, hoặc đổi chỗ cho nhau) giữa các đường đi.
+
+    Returns:
+        list[tuple[int, int, int]]: Danh sách (thời điểm, tác tử a, tác tử b).
+    """
+    conflicts = []
+    length = max((len(path) for path in paths), default=0)
+    for t in range(length):
+        occupied = {}
+        for agent, path in enumerate(paths):
+            pos = path[min(t, len(path) - 1)]
+            if pos in occupied:
+                conflicts.append((t, occupied[pos], agent))
+            occupied[pos] = agent
+        if t == 0:
+            continue
+        moves = {}
+        for agent, path in enumerate(paths):
+            a = path[min(t - 1, len(path) - 1)]
+            b = path[min(t, len(path) - 1)]
+            if a != b:
+                if (b, a) in moves:
+                    conflicts.append((t, moves[(b, a)], agent))
+                moves[(a, b)] = agent
+    return conflicts
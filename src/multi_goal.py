@@ -0,0 +1,107 @@
+import heapq
+
+import numpy as np
+
+from src.grid import CellGrid
+from src.types import HeuristicType
+
+
+class GoalSetHeuristic:
+    """
+    Hàm lượng giá tới một tập đích: khoảng cách nhỏ nhất tới bất kỳ đích nào.
+    Là giá trị nhỏ nhất của các hàm nhất quán nên vẫn nhất quán và chấp nhận được.
+
+    Attributes:
+        xs (np.ndarray): Hoành độ các đích.
+        ys (np.ndarray): Tung độ các đích.
+        heuristic_type (HeuristicType): MANHATTAN hoặc EUCLIDEAN.
+    """
+
+    def __init__(
+        self, targets: list[tuple[int, int]], heuristic_type: HeuristicType
+    ) -> None:
+        if heuristic_type not in (HeuristicType.MANHATTAN, HeuristicType.EUCLIDEAN):
+            raise ValueError("Goal-set search needs an admissible heuristic.")
+        self.xs = np.array([pos[0] for pos in targets], dtype=np.int64)
+        self.ys = np.array([pos[1] for pos in targets], dtype=np.int64)
+        self.heuristic_type = heuristic_type
+
+    def __call__(self, pos: tuple[int, int]) -> float:
+        dx = np.abs(self.xs - pos[0])
+        dy = np.abs(self.ys - pos[1])
+        if self.heuristic_type == HeuristicType.MANHATTAN:
+            return int((dx + dy).min())
+        return float(np.sqrt((dx * dx + dy * dy).min()))
+
+
+def nearest_targets(
+    grid: CellGrid,
+    targets: list[tuple[int, int]],
+    k: int = 1,
+    source: tuple[int, int] | None = None,
+    heuristic_type: HeuristicType = HeuristicType.MANHATTAN,
+) -> list[tuple[tuple[int, int], int, list[tuple[int, int]]]]:
+    """
+    Tìm k đích gần nhất (theo số bước) trong `targets` bằng một lần tìm kiếm A* duy nhất.
+
+    Vì hàm lượng giá nhất quán, các ô được lấy ra khỏi hàng đợi theo f không giảm,
+    và tại một đích f = g, nên các đích được xác định lần lượt theo đúng thứ tự
+    khoảng cách. Tìm kiếm dừng ngay khi đích thứ k được lấy ra.
+
+    Parameters:
+        grid (CellGrid): Lưới chứa các ô.
+        targets (list[tuple[int, int]]): Các ô đích (ví dụ các kho hàng).
+        k (int): Số đích gần nhất cần tìm.
+        source (tuple[int, int] | None): Ô xuất phát, mặc định là ô bắt đầu của lưới.
+        heuristic_type (HeuristicType): MANHATTAN hoặc EUCLIDEAN.
+
+    Returns:
+        list[tuple[tuple[int, int], int, list[tuple[int, int]]]]: Tối đa k bộ
+        (đích, số bước, đường đi), theo thứ tự từ gần đến xa. Ít hơn k nếu
+        không đủ đích tới được.
+    """
+    source = grid.start if source is None else source
+    remaining = set(targets)
+    if not remaining or k <= 0:
+        return []
+    heuristic = GoalSetHeuristic(list(remaining), heuristic_type)
+
+    cost = {source: 0}
+    parent = {source: None}
+    closed = set()
+    frontier = [(heuristic(source), 0, source)]
+    found = []
+
+    while frontier:
+        _, g, pos = heapq.heappop(frontier)
+        if pos in closed:
+            continue
+        closed.add(pos)
+
+        if pos in remaining:
+            remaining.discard(pos)
+            found.append((pos, g, _backtrack(parent, pos)))
+            if len(found) == k or not remaining:
+                break
+
+        for cell in grid.get_neighbors(pos):
+            next = cell.pos
+            new_cost = g + 1
+            if next not in closed and new_cost < cost.get(next, new_cost + 1):
+                cost[next] = new_cost
+                parent[next] = pos
+                heapq.heappush(frontier, (new_cost + heuristic(next), new_cost, next))
+
+    return found
+
+
+def _backtrack(
+    parent: dict[tuple[int, int], tuple[int, int] | None], end: tuple[int, int]
+) -> list[tuple[int, int]]:
+    path = []
+    current = end
+    while current is not None:
+        path.append(current)
+        current = parent[current]
+    path.reverse()
+    return path
@@ -0,0 +1,276 @@
+"""
+A* song song phân phối theo hàm băm (HDA*) trên nhiều tiến trình.
+
+Mỗi ô thuộc về đúng một tiến trình (theo hàm băm của khối chứa ô đó).
+Tiến trình chỉ mở rộng các ô của mình; ô lân cận thuộc tiến trình khác được
+gom thành từng lô và gửi sang hàng đợi của tiến trình sở hữu. Bản đồ vật cản,
+trọng số `g` và ô trước đó (`parent`) nằm trong bộ nhớ dùng chung; mỗi ô chỉ
+được ghi bởi tiến trình sở hữu nên không cần khóa.
+
+Kết thúc: tiến trình chính coi tìm kiếm đã xong khi mọi tiến trình đều rảnh
+(không còn nút có f < chi phí tốt nhất hiện có) và tổng số lô đã gửi bằng tổng
+số lô đã nhận, kiểm tra hai lần liên tiếp với cùng giá trị bộ đếm.
+"""
+
+import heapq
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.a_star import heuristic
+from src.grid import CellGrid, grid_walls
+from src.types import HeuristicType
+
+UNSEEN = np.iinfo(np.int32).max  # Trọng số của ô chưa được tìm thấy
+OFFSETS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def owner_of(pos: tuple[int, int], workers: int, block: int) -> int:
+    """Tiến trình sở hữu ô `pos` (băm theo khối `block` x `block`)."""
+    bx, by = pos[0] // block, pos[1] // block
+    return ((bx * 73856093) ^ (by * 19349663)) % workers
+
+
+class _SharedArrays:
+    """Các mảng NumPy đặt trong bộ nhớ dùng chung, mở lại được từ tiến trình con."""
+
+    def __init__(self, shape: tuple[int, int], names: dict[str, str] | None = None):
+        specs = {"walls": np.bool_, "cost": np.int32, "parent": np.int64}
+        self.owner = names is None
+        self.blocks = {}
+        self.arrays = {}
+        for key, dtype in specs.items():
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            if self.owner:
+                block = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self.blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    def names(self) -> dict[str, str]:
+        return {key: block.name for key, block in self.blocks.items()}
+
+    def close(self):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+
+
+def _worker(
+    me: int,
+    workers: int,
+    block: int,
+    shape: tuple[int, int],
+    names: dict[str, str],
+    goal: tuple[int, int],
+    heuristic_type: HeuristicType,
+    batch_size: int,
+    inboxes: list,
+    idle,
+    sent,
+    received,
+    incumbent,
+    stop,
+):
+    shared = _SharedArrays(shape, names)
+    walls, cost, parent = (shared.arrays[k] for k in ("walls", "cost", "parent"))
+    width, height = shape
+    inbox = inboxes[me]
+    outboxes: list[list] = [[] for _ in range(workers)]
+    frontier = []
+
+    def flush():
+        for other, batch in enumerate(outboxes):
+            if batch:
+                sent[me] += 1
+                inboxes[other].put(batch)
+                outboxes[other] = []
+
+    def receive(batch):
+        for pos, g, from_index in batch:
+            if g < cost[pos]:
+                cost[pos] = g
+                parent[pos] = from_index
+                h = heuristic(goal, pos, heuristic_type)
+                heapq.heappush(frontier, (g + h, g, pos))
+
+    while not stop.value:
+        # Nhận các lô đang chờ mà không chặn
+        while True:
+            try:
+                batch = inbox.get_nowait()
+            except queue.Empty:
+                break
+            idle[me] = 0
+            receive(batch)
+            received[me] += 1
+
+        if not frontier or frontier[0][0] >= incumbent.value:
+            flush()
+            idle[me] = 1
+            try:
+                batch = inbox.get(timeout=0.001)
+            except queue.Empty:
+                continue
+            idle[me] = 0
+            receive(batch)
+            received[me] += 1
+            continue
+
+        idle[me] = 0
+        for _ in range(batch_size):
+            if not frontier or frontier[0][0] >= incumbent.value:
+                break
+            _, g, pos = heapq.heappop(frontier)
+            if g > cost[pos]:
+                continue  # Nút cũ, đã có đường tốt hơn
+            if pos == goal:
+                with incumbent.get_lock():
+                    incumbent.value = min(incumbent.value, g)
+                continue
+
+            index = pos[0] * height + pos[1]
+            for offset in OFFSETS:
+                next_pos = (pos[0] + offset[0], pos[1] + offset[1])
+                if not (0 <= next_pos[0] < width and 0 <= next_pos[1] < height):
+                    continue
+                if walls[next_pos]:
+                    continue
+                other = owner_of(next_pos, workers, block)
+                if other == me:
+                    receive(((next_pos, g + 1, index),))
+                else:
+                    outboxes[other].append((next_pos, g + 1, index))
+                    if len(outboxes[other]) >= batch_size:
+                        sent[me] += 1
+                        inboxes[other].put(outboxes[other])
+                        outboxes[other] = []
+        flush()
+
+    shared.close()
+
+
+def hda_star(
+    walls: np.ndarray,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    workers: int | None = None,
+    heuristic_type: HeuristicType = HeuristicType.MANHATTAN,
+    batch_size: int = 64,
+    block: int = 4,
+) -> list[tuple[int, int]]:
+    """
+    Tìm đường đi ngắn nhất từ `start` tới `end` bằng HDA* trên `workers` tiến trình.
+
+    Parameters:
+        walls (np.ndarray): Mảng bool (width, height), True là ô vật cản.
+        start (tuple[int, int]): Ô bắt đầu.
+        end (tuple[int, int]): Ô kết thúc.
+        workers (int | None): Số tiến trình, mặc định bằng số nhân CPU.
+        heuristic_type (HeuristicType): Hàm lượng giá, cần chấp nhận được
+            (MANHATTAN hoặc EUCLIDEAN) để chi phí bằng với A* tuần tự.
+        batch_size (int): Số nút tối đa trong một lô gửi đi.
+        block (int): Cạnh của khối ô được băm chung cho một tiến trình.
+
+    Returns:
+        list[tuple[int, int]]: Các tọa độ từ ô bắt đầu đến ô kết thúc,
+        rỗng nếu không có đường đi hoặc ô bắt đầu / kết thúc là vật cản.
+    """
+    if walls[start] or walls[end]:
+        return []  # Không khởi động tiến trình nào
+    workers = workers or os.cpu_count() or 1
+    shape = walls.shape
+    shared = _SharedArrays(shape)
+    try:
+        shared.arrays["walls"][:] = walls
+        shared.arrays["cost"][:] = UNSEEN
+        shared.arrays["parent"][:] = -1
+
+        inboxes = [mp.Queue() for _ in range(workers)]
+        idle = mp.Array("b", workers, lock=False)
+        sent = mp.Array("q", workers + 1, lock=False)  # Ô cuối: tiến trình chính
+        received = mp.Array("q", workers, lock=False)
+        incumbent = mp.Value("d", float("inf"))
+        stop = mp.Value("b", 0, lock=False)
+
+        processes = [
+            mp.Process(
+                target=_worker,
+                args=(
+                    me,
+                    workers,
+                    block,
+                    shape,
+                    shared.names(),
+                    end,
+                    heuristic_type,
+                    batch_size,
+                    inboxes,
+                    idle,
+                    sent,
+                    received,
+                    incumbent,
+                    stop,
+                ),
+                daemon=True,
+            )
+            for me in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        sent[workers] += 1
+        inboxes[owner_of(start, workers, block)].put([(start, 0, -1)])
+
+        previous = None
+        while True:
+            time.sleep(0.001)
+            counters = (sum(sent), sum(received))
+            done = all(idle) and counters[0] == counters[1]
+            if done and previous == counters:
+                break
+            previous = counters if done else None
+
+        stop.value = 1
+        for process in processes:
+            process.join()
+
+        if shared.arrays["cost"][end] == UNSEEN:
+            return []
+        return _backtrack(shared.arrays["parent"], end, shape[1])
+    finally:
+        shared.close()
+
+
+def _backtrack(
+    parent: np.ndarray, end: tuple[int, int], height: int
+) -> list[tuple[int, int]]:
+    path = [end]
+    index = parent[end]
+    while index != -1:
+        pos = (int(index // height), int(index % height))
+        path.append(pos)
+        index = parent[pos]
+    path.reverse()
+    return path
+
+
+def parallel_a_star(
+    grid: CellGrid,
+    workers: int | None = None,
+    heuristic_type: HeuristicType = HeuristicType.MANHATTAN,
+) -> list[tuple[int, int]]:
+    """
+    HDA* trên CellGrid, từ ô bắt đầu tới ô kết thúc của lưới.
+
+    Returns:
+        list[tuple[int, int]]: Các tọa độ từ ô bắt đầu đến ô kết thúc.
+    """
+    return hda_star(grid_walls(grid), grid.start, grid.end, workers, heuristic_type)
@@ -0,0 +1,242 @@
+"""
+Cơ sở dữ liệu đường đi nén (Compressed Path Database) cho bản đồ tĩnh.
+
+Với mỗi ô nguồn, BFS tính "bước đi đầu tiên" trên một đường ngắn nhất tới
+mọi ô đích. Bảng bước đi đầu tiên của mỗi nguồn (theo thứ tự chỉ số ô đích
+`x * height + y`) được nén theo dải (run-length): chỉ lưu chỉ số bắt đầu của
+mỗi dải và bước đi của dải đó. Ô đích không tới được là "tùy ý" và được gộp
+vào dải trước nó; việc tới được hay không được kiểm tra bằng nhãn thành phần
+liên thông. Truy vấn đường đi chỉ là tra bảng lặp lại, không cần tìm kiếm.
+"""
+
+import bisect
+import multiprocessing as mp
+import os
+from collections import deque
+
+import numpy as np
+
+from src.artifacts import ArtifactStore
+
+MOVES = ((1, 0), (0, 1), (-1, 0), (0, -1))
+NO_MOVE = 255  # Ô đích không tới được (hoặc chính là ô nguồn)
+
+_adjacency: list[list[tuple[int, int]]] = []  # Dùng chung cho các tiến trình xây dựng
+
+
+def _build_adjacency(walls: np.ndarray) -> list[list[tuple[int, int]]]:
+    """Danh sách kề theo chỉ số ô: mỗi phần tử là (chỉ số ô lân cận, mã bước đi)."""
+    width, height = walls.shape
+    adjacency = [[] for _ in range(width * height)]
+    for x in range(width):
+        for y in range(height):
+            if walls[x, y]:
+                continue
+            for move, (dx, dy) in enumerate(MOVES):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and not walls[nx, ny]:
+                    adjacency[x * height + y].append((nx * height + ny, move))
+    return adjacency
+
+
+def _first_move_runs(source: int) -> tuple[list[int], list[int]]:
+    """BFS từ `source`, trả về các dải (chỉ số bắt đầu, bước đi) của bảng bước đi đầu tiên."""
+    first = [NO_MOVE] * len(_adjacency)
+    seen = bytearray(len(_adjacency))
+    seen[source] = 1
+    queue = deque()
+    for neighbor, move in _adjacency[source]:
+        seen[neighbor] = 1
+        first[neighbor] = move
+        queue.append(neighbor)
+    while queue:
+        index = queue.popleft()
+        move = first[index]
+        for neighbor, _ in _adjacency[index]:
+            if not seen[neighbor]:
+                seen[neighbor] = 1
+                first[neighbor] = move
+                queue.append(neighbor)
+
+    starts, moves = [0], [first[0]]
+    previous = first[0]
+    for target, move in enumerate(first):
+        if move != previous and move != NO_MOVE:
+            if previous == NO_MOVE:
+                # Dải đầu tiên chỉ gồm ô "tùy ý": dùng luôn bước đi này
+                moves[-1] = previous = move
+                continue
+            starts.append(target)
+            moves.append(move)
+            previous = move
+    return starts, moves
+
+
+def _label_components(adjacency: list[list[tuple[int, int]]]) -> np.ndarray:
+    """Nhãn thành phần liên thông của mỗi ô, -1 với ô không có lân cận (ví dụ vật cản)."""
+    labels = np.full(len(adjacency), -1, dtype=np.int32)
+    label = 0
+    for root, neighbors in enumerate(adjacency):
+        if labels[root] != -1 or not neighbors:
+            continue
+        labels[root] = label
+        queue = deque([root])
+        while queue:
+            for neighbor, _ in adjacency[queue.popleft()]:
+                if labels[neighbor] == -1:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+        label += 1
+    return labels
+
+
+def _init_worker(adjacency):
+    global _adjacency
+    _adjacency = adjacency
+
+
+def _build_chunk(sources: range) -> list[tuple[list[int], list[int]]]:
+    return [_first_move_runs(source) for source in sources]
+
+
+class PathDatabase:
+    """
+    Bảng bước đi đầu tiên nén theo dải cho mọi cặp (nguồn, đích).
+
+    Attributes:
+        shape (tuple[int, int]): Kích thước lưới (width, height).
+        offsets (np.ndarray): Dải của nguồn i nằm trong [offsets[i], offsets[i + 1]).
+        run_starts (np.ndarray): Chỉ số ô đích bắt đầu của mỗi dải.
+        run_moves (np.ndarray): Mã bước đi (chỉ số trong MOVES) của mỗi dải.
+        components (np.ndarray): Nhãn thành phần liên thông của mỗi ô.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        offsets: np.ndarray,
+        run_starts: np.ndarray,
+        run_moves: np.ndarray,
+        components: np.ndarray,
+    ):
+        self.shape = shape
+        self.offsets = offsets
+        self.run_starts = run_starts
+        self.run_moves = run_moves
+        self.components = components
+
+    @classmethod
+    def build(cls, walls: np.ndarray, workers: int | None = None) -> "PathDatabase":
+        """
+        Xây dựng cơ sở dữ liệu cho bản đồ `walls`, chia các ô nguồn cho nhiều tiến trình.
+
+        Parameters:
+            walls (np.ndarray): Mảng bool (width, height), True là ô vật cản.
+            workers (int | None): Số tiến trình, mặc định bằng số nhân CPU.
+        """
+        workers = workers or os.cpu_count() or 1
+        width, height = walls.shape
+        cells = width * height
+        adjacency = _build_adjacency(walls)
+
+        chunk = max(1, cells // (workers * 8))
+        chunks = [range(i, min(i + chunk, cells)) for i in range(0, cells, chunk)]
+        if workers == 1:
+            _init_worker(adjacency)
+            results = [_build_chunk(sources) for sources in chunks]
+        else:
+            with mp.Pool(workers, _init_worker, (adjacency,)) as pool:
+                results = pool.map(_build_chunk, chunks)
+
+        offsets = np.zeros(cells + 1, dtype=np.int64)
+        all_starts, all_moves = [], []
+        source = 0
+        for runs in results:
+            for starts, moves in runs:
+                offsets[source + 1] = offsets[source] + len(starts)
+                all_starts.extend(starts)
+                all_moves.extend(moves)
+                source += 1
+        return cls(
+            (width, height),
+            offsets,
+            np.array(all_starts, dtype=np.int32),
+            np.array(all_moves, dtype=np.uint8),
+            _label_components(adjacency),
+        )
+
+    def first_move(
+        self, source: tuple[int, int], target: tuple[int, int]
+    ) -> tuple[int, int] | None:
+        """Bước đi đầu tiên từ `source` tới `target`, None nếu không tới được."""
+        height = self.shape[1]
+        index = source[0] * height + source[1]
+        target_index = target[0] * height + target[1]
+        component = self.components[index]
+        if (
+            index == target_index
+            or component == -1
+            or component != self.components[target_index]
+        ):
+            return None
+        begin, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        run = bisect.bisect_right(self.run_starts, target_index, begin, end) - 1
+        move = self.run_moves[run]
+        return None if move == NO_MOVE else MOVES[move]
+
+    def path(
+        self, source: tuple[int, int], target: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        """
+        Đường đi ngắn nhất từ `source` tới `target` chỉ bằng tra bảng.
+
+        Returns:
+            list[tuple[int, int]]: Các tọa độ từ ô nguồn tới ô đích, rỗng nếu không tới được.
+        """
+        path = [source]
+        current = source
+        while current != target:
+            move = self.first_move(current, target)
+            if move is None:
+                return []
+            current = (current[0] + move[0], current[1] + move[1])
+            path.append(current)
+        return path
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Các mảng cấu thành cơ sở dữ liệu, dùng để lưu trữ."""
+        return {
+            "shape": np.array(self.shape),
+            "offsets": self.offsets,
+            "run_starts": self.run_starts,
+            "run_moves": self.run_moves,
+            "components": self.components,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "PathDatabase":
+        """Tạo lại cơ sở dữ liệu từ các mảng của `to_arrays`."""
+        return cls(
+            tuple(int(n) for n in arrays["shape"]),
+            arrays["offsets"],
+            arrays["run_starts"],
+            arrays["run_moves"],
+            arrays["components"],
+        )
+
+    @classmethod
+    def from_store(cls, store: ArtifactStore) -> "PathDatabase":
+        """Nạp cơ sở dữ liệu từ kho dữ liệu của bản đồ, xây dựng nếu chưa có."""
+        return cls.from_arrays(
+            store.get("cpd", lambda walls: cls.build(walls).to_arrays())
+        )
+
+    def save(self, file_path: str) -> None:
+        """Lưu cơ sở dữ liệu ra file `.npz`."""
+        np.savez(file_path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, file_path: str) -> "PathDatabase":
+        """Đọc cơ sở dữ liệu từ file `.npz` đã lưu bằng `save`."""
+        with np.load(file_path) as data:
+            return cls.from_arrays(data)
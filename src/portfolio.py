@@ -0,0 +1,230 @@
+"""
+Chạy song song nhiều cấu hình (thuật toán, hàm lượng giá) trên cùng một truy vấn.
+
+Mỗi cấu hình chạy trong một tiến trình riêng; kết quả đầu tiên từ một cấu hình
+thỏa mức tối ưu yêu cầu được dùng, các tiến trình còn lại bị dừng. Cấu hình
+thắng được ghi vào `PortfolioLog` theo mã băm bản đồ, để sau này chọn thẳng
+cấu hình mặc định cho từng bản đồ.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import Counter
+
+import numpy as np
+
+from src.a_star import a_star, backtrack_to_start
+from src.artifacts import map_hash
+from src.csr_graph import CSRGraph, find_path
+from src.grid import CellGrid, grid_walls
+from src.ida_star import ida_star
+from src.search_state import SearchState
+from src.snapshot import VersionedGrid
+from src.types import HeuristicType, Optimality
+
+PORTFOLIO_LOG = os.path.join(".cache", "portfolio.jsonl")  # File ghi cấu hình thắng
+
+# Các cấu hình mặc định: (thuật toán, hàm lượng giá)
+DEFAULT_PORTFOLIO = (
+    ("csr", HeuristicType.MANHATTAN),
+    ("csr", HeuristicType.COMBINED),
+    ("a_star", HeuristicType.MANHATTAN),
+    ("a_star", HeuristicType.COMBINED),
+    ("ida_star", HeuristicType.MANHATTAN),
+)
+
+
+def is_optimal(heuristic_type: HeuristicType) -> bool:
+    """Mọi thuật toán trong portfolio cho đường đi ngắn nhất khi hàm lượng giá chấp nhận được."""
+    return heuristic_type in (HeuristicType.MANHATTAN, HeuristicType.EUCLIDEAN)
+
+
+def solve_with(
+    grid: CellGrid, engine: str, heuristic_type: HeuristicType
+) -> list[tuple[int, int]]:
+    """
+    Tìm đường đi từ ô bắt đầu đến ô kết thúc bằng một cấu hình.
+
+    Returns:
+        list[tuple[int, int]]: Các tọa độ trên đường đi, rỗng nếu không có đường đi
+        (kể cả khi ô bắt đầu hoặc ô kết thúc là vật cản, với mọi thuật toán).
+    """
+    if engine not in ("csr", "ida_star", "a_star"):
+        raise ValueError(f"Unknown portfolio engine {engine!r}.")
+    if _blocked_endpoint(grid):
+        return []
+    if engine == "csr":
+        return find_path(CSRGraph.from_grid(grid), grid.start, grid.end, heuristic_type)
+    if engine == "ida_star":
+        return ida_star(grid, heuristic_type)
+    state = SearchState()
+    a_star(grid, 10**9, None, heuristic_type, state)
+    path = backtrack_to_start(state, grid.end)
+    return path if path[0] == grid.start else []
+
+
+def _blocked_endpoint(grid) -> bool:
+    return grid.is_wall(grid.start) or grid.is_wall(grid.end)
+
+
+def _run(index: int, grid, engine: str, heuristic_type: HeuristicType, results):
+    begin = time.perf_counter()
+    try:
+        path = solve_with(grid, engine, heuristic_type)
+    except Exception as error:  # Báo lỗi về tiến trình chính thay vì im lặng
+        results.put((index, None, repr(error), time.perf_counter() - begin))
+        return
+    results.put((index, path, None, time.perf_counter() - begin))
+
+
+class PortfolioResult:
+    """
+    Kết quả của một lần chạy portfolio.
+
+    Attributes:
+        path (list[tuple[int, int]]): Đường đi của cấu hình thắng.
+        engine (str), heuristic_type (HeuristicType): Cấu hình thắng.
+        seconds (float): Thời gian tới khi có kết quả.
+    """
+
+    def __init__(
+        self,
+        path: list[tuple[int, int]],
+        engine: str,
+        heuristic_type: HeuristicType,
+        seconds: float,
+    ):
+        self.path = path
+        self.engine = engine
+        self.heuristic_type = heuristic_type
+        self.seconds = seconds
+
+
+class PortfolioLog:
+    """
+    Nhật ký cấu hình thắng theo bản đồ (mỗi dòng một JSON), dùng để chọn cấu
+    hình mặc định cho bản đồ.
+
+    Attributes:
+        path (str | None): File nhật ký; None thì chỉ giữ trong bộ nhớ.
+        wins (dict[str, Counter]): Số lần thắng của mỗi cấu hình theo mã băm bản đồ.
+    """
+
+    def __init__(self, path: str | None = PORTFOLIO_LOG):
+        self.path = path
+        self.wins: dict[str, Counter] = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    entry = json.loads(line)
+                    self._count(entry["map"], entry["engine"], entry["heuristic"])
+
+    def _count(self, key: str, engine: str, heuristic: str) -> None:
+        self.wins.setdefault(key, Counter())[(engine, heuristic)] += 1
+
+    def record(self, walls: np.ndarray, result: PortfolioResult) -> None:
+        """Ghi cấu hình thắng cho bản đồ `walls`."""
+        key = map_hash(walls)
+        heuristic = result.heuristic_type.name
+        self._count(key, result.engine, heuristic)
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as file:
+            entry = {
+                "map": key,
+                "engine": result.engine,
+                "heuristic": heuristic,
+                "seconds": result.seconds,
+            }
+            file.write(json.dumps(entry) + "\n")
+
+    def preferred(self, walls: np.ndarray) -> tuple[str, HeuristicType] | None:
+        """Cấu hình thắng nhiều nhất trên bản đồ `walls`, None nếu chưa có."""
+        wins = self.wins.get(map_hash(walls))
+        if not wins:
+            return None
+        engine, heuristic = wins.most_common(1)[0][0]
+        return engine, HeuristicType[heuristic]
+
+
+def portfolio_solve(
+    grid: CellGrid,
+    optimality: Optimality = Optimality.OPTIMAL,
+    entries: tuple[tuple[str, HeuristicType], ...] = DEFAULT_PORTFOLIO,
+    log: PortfolioLog | None = None,
+    timeout: float | None = None,
+) -> PortfolioResult:
+    """
+    Chạy đồng thời các cấu hình thỏa `optimality`, mỗi cấu hình một tiến trình,
+    và trả về kết quả đầu tiên; các tiến trình còn lại bị dừng ngay.
+
+    Parameters:
+        grid (CellGrid): Lưới chứa các ô và thông tin vị trí bắt đầu và kết thúc.
+        optimality (Optimality): OPTIMAL chỉ chạy các cấu hình có hàm lượng giá
+            chấp nhận được; ANY chạy tất cả.
+        entries (tuple[tuple[str, HeuristicType], ...]): Các cấu hình (thuật toán, hàm lượng giá).
+        log (PortfolioLog | None): Nơi ghi cấu hình thắng.
+        timeout (float | None): Thời gian chờ tối đa (giây).
+
+    Returns:
+        PortfolioResult: Đường đi và cấu hình thắng. Nếu ô bắt đầu hoặc ô kết
+        thúc là vật cản, đường đi rỗng được trả về ngay với cấu hình đầu tiên,
+        không có tiến trình nào được chạy và không ghi vào `log`.
+    """
+    entries = [
+        entry
+        for entry in entries
+        if optimality == Optimality.ANY or is_optimal(entry[1])
+    ]
+    if not entries:
+        raise ValueError("No portfolio entry satisfies the requested optimality.")
+    if _blocked_endpoint(grid):
+        return PortfolioResult([], *entries[0], 0.0)
+
+    # Gửi cho các tiến trình một snapshot chỉ chứa mảng vật cản thay vì CellGrid
+    walls = grid_walls(grid)
+    snapshot = VersionedGrid(walls, grid.start, grid.end).snapshot()
+    results = mp.Queue()
+    processes = [
+        mp.Process(
+            target=_run,
+            args=(index, snapshot, engine, heuristic_type, results),
+            daemon=True,
+        )
+        for index, (engine, heuristic_type) in enumerate(entries)
+    ]
+    begin = time.perf_counter()
+    for process in processes:
+        process.start()
+    try:
+        errors = []
+        while len(errors) < len(entries):
+            remaining = None
+            if timeout is not None:
+                remaining = max(0.0, timeout - (time.perf_counter() - begin))
+            try:
+                index, path, error, _ = results.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError("No portfolio entry finished in time.") from None
+            if error is not None:
+                errors.append(f"{entries[index][0]}: {error}")
+                continue
+            engine, heuristic_type = entries[index]
+            result = PortfolioResult(
+                path, engine, heuristic_type, time.perf_counter() - begin
+            )
+            if log is not None:
+                log.record(walls, result)
+            return result
+        raise RuntimeError("Every portfolio entry failed: " + "; ".join(errors))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        results.close()
@@ -0,0 +1,123 @@
+"""
+Đo thời gian từng khung hình của `Game.loop`, chia theo giai đoạn (xử lý sự
+kiện, tìm kiếm, vẽ bảng, vẽ logger, cập nhật màn hình).
+
+Giữ các khung hình gần nhất trong một cửa sổ trượt để tính phân vị, FPS và
+biểu đồ tần suất, cùng với các khung hình chậm nhất để ghi ra file.
+"""
+
+import heapq
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Các giai đoạn của một khung hình
+PHASES = ("events", "search", "board", "logger", "display")
+FRAME_WINDOW = 300  # Số khung hình gần nhất dùng để tính thống kê
+WORST_FRAMES = 20  # Số khung hình chậm nhất được giữ lại
+HISTOGRAM_EDGES_MS = (0, 4, 8, 16, 33, 50, 100, 250, float("inf"))  # Biên các cột (ms)
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """
+    Bộ đo thời gian khung hình.
+
+    Attributes:
+        frames (deque): Các khung hình gần nhất, mỗi khung là (thời điểm bắt đầu,
+            tổng thời gian, dict giai đoạn -> thời gian), đơn vị giây.
+        worst (list): Heap nhỏ nhất chứa `WORST_FRAMES` khung hình chậm nhất
+            (tổng thời gian, số thứ tự khung, dict giai đoạn -> thời gian).
+        count (int): Tổng số khung hình đã đo.
+    """
+
+    def __init__(self, window: int = FRAME_WINDOW, worst: int = WORST_FRAMES):
+        self.frames: deque[tuple[float, float, dict[str, float]]] = deque(maxlen=window)
+        self.worst: list[tuple[float, int, dict[str, float]]] = []
+        self.worst_size = worst
+        self.count = 0
+        self._begin: float | None = None
+        self._phases: dict[str, float] = {}
+
+    def begin_frame(self) -> None:
+        self._begin = time.perf_counter()
+        self._phases = dict.fromkeys(PHASES, 0.0)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Cộng thời gian chạy của khối `with` vào giai đoạn `name` của khung hiện tại."""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._begin is not None:
+                self._phases[name] = self._phases.get(name, 0.0) + (
+                    time.perf_counter() - begin
+                )
+
+    def end_frame(self) -> None:
+        if self._begin is None:
+            return
+        total = time.perf_counter() - self._begin
+        self.frames.append((self._begin, total, self._phases))
+        entry = (total, self.count, self._phases)
+        if len(self.worst) < self.worst_size:
+            heapq.heappush(self.worst, entry)
+        elif total > self.worst[0][0]:
+            heapq.heapreplace(self.worst, entry)
+        self.count += 1
+        self._begin = None
+
+    def percentiles(self) -> dict[str, float]:
+        """Phân vị thời gian khung hình (ms) trong cửa sổ."""
+        if not self.frames:
+            return {f"p{p}": 0.0 for p in PERCENTILES}
+        totals = np.fromiter((total for _, total, _ in self.frames), float)
+        values = np.percentile(totals, PERCENTILES)
+        return {f"p{p}": float(v) * 1000 for p, v in zip(PERCENTILES, values)}
+
+    def fps(self) -> float:
+        """Số khung hình mỗi giây, tính theo thời điểm bắt đầu các khung trong cửa sổ."""
+        if len(self.frames) < 2:
+            return 0.0
+        elapsed = self.frames[-1][0] - self.frames[0][0]
+        return (len(self.frames) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def phase_means(self) -> dict[str, float]:
+        """Thời gian trung bình (ms) của mỗi giai đoạn trong cửa sổ."""
+        if not self.frames:
+            return dict.fromkeys(PHASES, 0.0)
+        return {
+            name: sum(phases.get(name, 0.0) for *_, phases in self.frames)
+            / len(self.frames)
+            * 1000
+            for name in PHASES
+        }
+
+    def histogram(self) -> list[int]:
+        """Số khung hình trong mỗi cột `HISTOGRAM_EDGES_MS` của cửa sổ."""
+        totals = np.fromiter((total * 1000 for _, total, _ in self.frames), float)
+        counts, _ = np.histogram(totals, bins=HISTOGRAM_EDGES_MS)
+        return counts.tolist()
+
+    def dump_worst(self, file_path: str) -> None:
+        """Ghi các khung hình chậm nhất (kèm thời gian từng giai đoạn, ms) ra file JSON."""
+        frames = [
+            {
+                "frame": index,
+                "total_ms": total * 1000,
+                "phases_ms": {name: value * 1000 for name, value in phases.items()},
+            }
+            for total, index, phases in sorted(self.worst, reverse=True)
+        ]
+        summary = {
+            "frames": self.count,
+            "fps": self.fps(),
+            "percentiles_ms": self.percentiles(),
+            "worst": frames,
+        }
+        with open(file_path, "w") as file:
+            json.dump(summary, file, indent=2)
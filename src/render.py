@@ -0,0 +1,282 @@
+"""
+Xuất hoạt ảnh của một lần tìm kiếm A* ra chuỗi ảnh, không cần cửa sổ.
+
+`record_search` chạy `a_star` một lần và ghi lại các thay đổi của
+`SearchState` theo từng bước, nên trạng thái ở bước k (giống hệt khi gọi
+`a_star(grid, k, ...)` như trong `Game.loop`) được dựng lại mà không phải tìm
+lại từ đầu. `render_frames` chia các khung hình thành các đoạn liên tiếp cho
+nhiều tiến trình; mỗi đoạn vẽ toàn bộ bảng một lần bằng `draw_board`, sau đó
+chỉ vẽ lại các ô thay đổi giữa hai khung (`draw_cell`).
+
+Chạy: `python -m src.render --out frames --every 10 [--auto --size 60 ...]`
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import signal
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Không mở cửa sổ
+
+import numpy as np
+import pygame as pg
+
+from src.a_star import a_star, backtrack_to_start
+from src.config import BOARD_SIZE, load_config
+from src.draw import cell_font, draw_board, draw_cell, draw_path
+from src.grid import CellGrid, grid_walls
+from src.map_generation import gen_grid, get_random_empty_cell
+from src.search_state import SearchState
+from src.types import HeuristicType, Mode
+from src.utils import read_input
+
+FORMATS = ("png", "raw")  # raw: các byte RGB (BOARD_SIZE x BOARD_SIZE) của mỗi khung
+
+
+class _TracingState(SearchState):
+    """SearchState ghi lại mọi lần `update_cell` cùng với lượt mở rộng tạo ra nó."""
+
+    __slots__ = ("expansion", "updates")
+
+    def __init__(self):
+        super().__init__()
+        self.expansion = 0
+        self.updates = []
+
+    def update_cell(self, pos, count, path_from, heuristic):
+        super().update_cell(pos, count, path_from, heuristic)
+        self.updates.append((self.expansion, pos, count, path_from, heuristic))
+
+
+class _TracingGrid:
+    """Chuyển tiếp tới lưới gốc, ghi lại ô được mở rộng ở mỗi lần `get_neighbors`."""
+
+    def __init__(self, grid: CellGrid, state: _TracingState):
+        self._grid = grid
+        self._state = state
+        self.expanded: list[tuple[int, int]] = []
+
+    def __getattr__(self, name):
+        return getattr(self._grid, name)
+
+    def get_neighbors(self, pos):
+        self.expanded.append(pos)
+        self._state.expansion = len(self.expanded)
+        return self._grid.get_neighbors(pos)
+
+
+class SearchTrace:
+    """
+    Nhật ký của một lần tìm kiếm, đủ để dựng lại `SearchState` ở mọi bước.
+
+    Attributes:
+        max_steps (int): Số bước tối đa (giá trị trả về của `a_star`).
+        popped (list[tuple[int, int]]): Các ô lần lượt được lấy ra khỏi hàng đợi.
+        updates (list): Các bộ (lượt mở rộng, ô, số bước, ô trước đó, hàm lượng giá);
+            lượt 0 là ô bắt đầu, cập nhật ở lượt j xuất hiện từ bước j.
+        path (list[tuple[int, int]]): Đường đi cuối cùng, rỗng nếu không có.
+    """
+
+    def __init__(self, max_steps, popped, updates, path):
+        self.max_steps = max_steps
+        self.popped = popped
+        self.updates = updates
+        self.path = path
+        # Vị trí trong `updates` của cập nhật đầu tiên thuộc lượt j
+        self._starts = np.searchsorted(
+            np.array([update[0] for update in updates], dtype=np.int64),
+            np.arange(max_steps + 2),
+        ).tolist()
+
+    def markers(self, step: int) -> tuple[tuple[int, int] | None, ...]:
+        """(ô đang xét, ô xét tiếp theo) ở bước `step`, như `a_star` đặt khi step == 1."""
+        if step == 0:
+            return None, None
+        following = self.popped[step] if step < len(self.popped) else None
+        return self.popped[step - 1], following
+
+    def apply(self, state: SearchState, begin: int, end: int) -> set[tuple[int, int]]:
+        """
+        Áp dụng các cập nhật của các lượt trong [begin, end] vào `state` và đặt ô
+        đang xét / tiếp theo của bước `end`.
+
+        Returns:
+            set[tuple[int, int]]: Các ô cần vẽ lại.
+        """
+        changed = {state.current, state.next}
+        for _, pos, count, path_from, heuristic in self.updates[
+            self._starts[begin] : self._starts[end + 1]
+        ]:
+            state.update_cell(pos, count, path_from, heuristic)
+            changed.add(pos)
+        state.current, state.next = self.markers(end)
+        changed.update((state.current, state.next))
+        changed.discard(None)
+        return changed
+
+
+def record_search(
+    grid: CellGrid, heuristic_type: HeuristicType = HeuristicType.MANHATTAN
+) -> SearchTrace:
+    """Chạy `a_star` một lần trên `grid` và ghi lại nhật ký từng bước."""
+    state = _TracingState()
+    tracing = _TracingGrid(grid, state)
+    max_steps = a_star(tracing, 10**9, None, heuristic_type, state)
+    popped = list(tracing.expanded)
+    if grid.end in state.cost:
+        popped.append(grid.end)  # Ô kết thúc được lấy ra nhưng không được mở rộng
+    path = backtrack_to_start(state, grid.end)
+    return SearchTrace(
+        max_steps, popped, state.updates, path if path[0] == grid.start else []
+    )
+
+
+# Dùng chung cho các tiến trình vẽ (được gán trong `_init_worker`)
+_job: dict = {}
+
+
+def _init_worker(job: dict, child: bool = True):
+    global _job
+    _job = job
+    if child:
+        # Tiến trình con kế thừa bộ xử lý SIGTERM của SDL (biến tín hiệu thành sự
+        # kiện QUIT), khiến `Pool.terminate` chờ mãi: trả lại hành vi mặc định
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    pg.font.init()
+
+
+def _save(surface: pg.Surface, index: int) -> str:
+    out_dir, image_format = _job["out_dir"], _job["format"]
+    file_path = os.path.join(out_dir, f"frame_{index:06d}.{image_format}")
+    if image_format == "png":
+        pg.image.save(surface, file_path)
+    else:
+        with open(file_path, "wb") as file:
+            file.write(pg.image.tobytes(surface, "RGB"))
+    return file_path
+
+
+def _render_segment(segment: list[tuple[int, int]]) -> list[str]:
+    """Vẽ các khung (chỉ số khung, bước) liên tiếp của một đoạn."""
+    grid, trace, mode = _job["grid"], _job["trace"], _job["mode"]
+    surface = pg.Surface((BOARD_SIZE, BOARD_SIZE))
+    font = cell_font(grid)
+    state = SearchState()
+
+    files = []
+    previous = None
+    for index, step in segment:
+        if previous is None:
+            trace.apply(state, 0, step)
+            draw_board(surface, grid, surface.get_rect(), mode, state)
+        else:
+            for pos in trace.apply(state, previous + 1, step):
+                draw_cell(surface, grid, pos, mode, state, font)
+        previous = step
+        if step == trace.max_steps and trace.path:
+            # Như `Game.loop`: đường đi chỉ được vẽ ở bước cuối cùng
+            final = surface.copy()
+            draw_path(final, grid, trace.path)
+            files.append(_save(final, index))
+        else:
+            files.append(_save(surface, index))
+    return files
+
+
+def render_frames(
+    grid: CellGrid,
+    out_dir: str,
+    every: int = 1,
+    heuristic_type: HeuristicType = HeuristicType.MANHATTAN,
+    mode: Mode = Mode.Cost,
+    image_format: str = "png",
+    workers: int | None = None,
+) -> list[str]:
+    """
+    Chạy tìm kiếm một lần và vẽ các bước 0, every, 2 * every, ... và bước cuối ra file.
+
+    Parameters:
+        grid (CellGrid): Lưới chứa các ô và thông tin vị trí bắt đầu và kết thúc.
+        out_dir (str): Thư mục chứa các khung hình `frame_000000.<format>`.
+        every (int): Khoảng cách giữa hai bước được vẽ.
+        heuristic_type (HeuristicType): Hàm lượng giá.
+        mode (Mode): Chế độ hiển thị (Cost hoặc Arrow).
+        image_format (str): "png" hoặc "raw".
+        workers (int | None): Số tiến trình vẽ, mặc định bằng số nhân CPU.
+
+    Returns:
+        list[str]: Đường dẫn các khung hình theo thứ tự.
+    """
+    if every < 1:
+        raise ValueError("Frame interval must be at least 1.")
+    if image_format not in FORMATS:
+        raise ValueError(f"Unknown frame format {image_format!r}.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Vẽ trên một bản sao chỉ gồm ô và vị trí, không kéo theo listeners của Game
+    copy = CellGrid(
+        (0, 0, BOARD_SIZE, BOARD_SIZE), grid_walls(grid), grid.start, grid.end
+    )
+    trace = record_search(copy, heuristic_type)
+    steps = list(range(0, trace.max_steps + 1, every))
+    if steps[-1] != trace.max_steps:
+        steps.append(trace.max_steps)
+    frames = list(enumerate(steps))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(frames)))
+    size = -(-len(frames) // workers)
+    segments = [frames[i : i + size] for i in range(0, len(frames), size)]
+    job = {
+        "grid": copy,
+        "trace": trace,
+        "mode": mode,
+        "out_dir": out_dir,
+        "format": image_format,
+    }
+    if workers == 1:
+        _init_worker(job, child=False)
+        results = [_render_segment(segment) for segment in segments]
+    else:
+        with mp.Pool(workers, _init_worker, (job,)) as pool:
+            results = pool.map(_render_segment, segments)
+            pool.close()
+            pool.join()
+    return [file_path for files in results for file_path in files]
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Render a search to image frames")
+    parser.add_argument("--out", default="frames", help="output directory")
+    parser.add_argument("--every", type=int, default=1, help="render every Nth step")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument(
+        "--mode", choices=[m.name.lower() for m in Mode], default="cost"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    arguments, rest = parser.parse_known_args(argv)
+    # Các tùy chọn bản đồ còn lại giống main.py (--auto, --size, ...)
+    config = load_config(rest)
+
+    pg.display.init()
+    pg.font.init()
+    if config.auto_mode:
+        cells = gen_grid(config.grid_size, config.grid_size, None)
+        start, end = get_random_empty_cell(cells), get_random_empty_cell(cells)
+    else:
+        size, walls, start, end = read_input(config.map_path)
+        cells = gen_grid(size, size, walls)
+    grid = CellGrid((0, 0, BOARD_SIZE, BOARD_SIZE), cells, start, end)
+    files = render_frames(
+        grid,
+        arguments.out,
+        arguments.every,
+        config.heuristic,
+        Mode[arguments.mode.capitalize()],
+        arguments.format,
+        arguments.workers,
+    )
+    print(f"{len(files)} frames written to {arguments.out}")
+
+
+if __name__ == "__main__":
+    main()
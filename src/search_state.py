@@ -0,0 +1,82 @@
+import math
+
+from src.types import ArrowDirection
+from src.ui import Arrow
+
+
+class SearchState:
+    """
+    Trạng thái của một lần tìm kiếm, tách khỏi các ô của bản đồ để nhiều lần tìm
+    kiếm (trên cùng một bản đồ hoặc một snapshot) không ghi đè lên nhau.
+
+    Attributes:
+        cost (dict): Số bước từ ô bắt đầu của các ô được hiển thị.
+        heuristic (dict): Giá trị hàm lượng giá của các ô được hiển thị.
+        hidden (dict): Trọng số ẩn, tương tự `cost` nhưng luôn được cập nhật.
+        path_from (dict): Ô trước đó của mỗi ô (None với ô bắt đầu).
+        current (tuple[int, int] | None): Ô đang được xét.
+        next (tuple[int, int] | None): Ô được xét tiếp theo.
+    """
+
+    __slots__ = ("cost", "heuristic", "hidden", "path_from", "current", "next")
+
+    def __init__(self):
+        self.cost: dict[tuple[int, int], float] = {}
+        self.heuristic: dict[tuple[int, int], float] = {}
+        self.hidden: dict[tuple[int, int], float] = {}
+        self.path_from: dict[tuple[int, int], tuple[int, int] | None] = {}
+        self.current: tuple[int, int] | None = None
+        self.next: tuple[int, int] | None = None
+
+    def clear(self) -> None:
+        """Xóa thông tin của lần tìm kiếm trước."""
+        self.cost.clear()
+        self.heuristic.clear()
+        self.hidden.clear()
+        self.path_from.clear()
+        self.current = self.next = None
+
+    def update_cell(
+        self,
+        pos: tuple[int, int],
+        count: int,
+        path_from: tuple[int, int] | None,
+        heuristic: float,
+    ) -> None:
+        """
+        Cập nhật ô với số bước kể từ ô bắt đầu, hàm lượng giá và ô trước đó.
+        Parameters:
+            pos (tuple[int, int]): Vị trí của ô.
+            count (int): Giá trị đếm cho ô.
+            path_from (tuple[int, int] | None): Ô trước đó trong đường đi đến ô hiện tại.
+            heuristic (float): Giá trị của hàm lượng giá tại ô
+        """
+        self.cost[pos] = count
+        self.path_from[pos] = path_from
+        self.heuristic[pos] = heuristic
+
+    def cost_of(self, pos: tuple[int, int]) -> float:
+        return self.cost.get(pos, math.inf)
+
+    def heuristic_of(self, pos: tuple[int, int]) -> float:
+        return self.heuristic.get(pos, math.inf)
+
+    def direction(self, pos: tuple[int, int]) -> ArrowDirection | None:
+        """Hướng chỉ về ô trước đó của `pos` (None nếu không có)."""
+        path_from = self.path_from.get(pos)
+        if path_from is None:
+            return None
+        if path_from[0] < pos[0]:
+            return ArrowDirection.Left
+        elif path_from[0] > pos[0]:
+            return ArrowDirection.Right
+        elif path_from[1] < pos[1]:
+            return ArrowDirection.Up
+        elif path_from[1] > pos[1]:
+            return ArrowDirection.Down
+        return None
+
+    def arrow(self, pos: tuple[int, int]) -> Arrow | None:
+        """Mũi tên dùng chung tương ứng với `direction`."""
+        direction = self.direction(pos)
+        return Arrow.of(direction) if direction is not None else None
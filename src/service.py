@@ -0,0 +1,514 @@
+"""
+Dịch vụ tìm đường cục bộ qua asyncio trên Unix socket.
+
+Giao thức: mỗi thông điệp là 4 byte độ dài (big-endian) theo sau là một đối
+tượng JSON. Mỗi yêu cầu nhận đúng một phản hồi, theo thứ tự gửi trên cùng
+kết nối. Các yêu cầu ("op"):
+
+- `load_map`: nạp bản đồ vào kho, từ `walls` (mảng 0/1 theo [x][y]) hoặc từ
+  `generator` (xem `src.generators.GENERATORS`) với `size` và `seed`.
+- `path`: tìm đường từ `start` tới `goal`, hoặc tới `k` ô gần nhất trong `goals`.
+- `edit`: đổi loại các ô trong `toggle`, hoặc đặt `walls` cho các ô trong `set`.
+- `stats`: số yêu cầu, số lô và các phân vị độ trễ (mili giây).
+- `unload_map`: bỏ bản đồ khỏi kho.
+
+Thông điệp không phải JSON hợp lệ nhận phản hồi lỗi và kết nối vẫn được giữ;
+thông điệp có độ dài vượt quá `MAX_MESSAGE_SIZE` nhận phản hồi lỗi rồi kết nối
+bị đóng, vì phần thân của nó không được đọc.
+
+Các truy vấn tìm đường trên cùng một bản đồ đến gần nhau được gom thành một lô
+và chạy trong một tiến trình của pool. Tiến trình giữ lại lưới đã dựng theo số
+hiệu nội dung bản đồ (`MapEntry.revision`), nên bản đồ chỉ được gửi kèm lô đầu
+tiên của mỗi nội dung, hoặc khi tiến trình nhận lô chưa có lưới đó.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import struct
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import numpy as np
+
+from src import generators
+from src.config import BOARD_SIZE
+from src.grid import CellGrid
+from src.multi_goal import nearest_targets
+
+HEADER = struct.Struct(">I")  # Độ dài thông điệp
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+LATENCY_WINDOW = 10_000  # Số độ trễ gần nhất dùng để tính phân vị
+PERCENTILES = (50, 90, 99)
+
+_revisions = itertools.count(1)
+# Số hiệu nội dung bản đồ, tăng dần trong cả tiến trình (không bắt đầu lại khi một
+# bản đồ bị bỏ rồi nạp lại cùng tên), dùng làm khóa cho lưới đã dựng trong pool
+
+
+class ServiceError(Exception):
+    """Lỗi của yêu cầu, được trả về cho client dưới dạng {"ok": false, "error": ...}."""
+
+
+class ProtocolError(ServiceError):
+    """Lỗi khung thông điệp sau đó không thể đọc tiếp kết nối."""
+
+
+class MapEntry:
+    """
+    Một bản đồ trong kho.
+
+    Attributes:
+        walls (np.ndarray): Mảng bool (width, height), True là ô vật cản.
+        version (int): Tăng sau mỗi lần sửa bản đồ.
+        revision (int): Số hiệu của nội dung hiện tại, duy nhất trong tiến trình.
+        shipped (bool): Nội dung hiện tại đã được gửi cho pool ít nhất một lần.
+    """
+
+    def __init__(self, walls: np.ndarray):
+        self.walls = walls
+        self.version = 0
+        self.revision = 0
+        self.shipped = False
+
+    def set_walls(self, walls: np.ndarray) -> None:
+        """Đổi nội dung bản đồ, tăng phiên bản và số hiệu nội dung."""
+        self.walls = walls
+        self.version += 1
+        self.revision = next(_revisions)
+        self.shipped = False
+
+
+class MapRegistry:
+    """Kho các bản đồ đang được nạp, theo tên."""
+
+    def __init__(self):
+        self.maps: dict[str, MapEntry] = {}
+
+    def get(self, name: str) -> MapEntry:
+        entry = self.maps.get(name)
+        if entry is None:
+            raise ServiceError(f"Unknown map {name!r}.")
+        return entry
+
+    def load(self, name: str, walls: np.ndarray) -> MapEntry:
+        if walls.ndim != 2 or min(walls.shape) == 0:
+            raise ServiceError("Walls must be a non-empty 2D array.")
+        entry = self.maps.get(name)
+        if entry is None:
+            entry = self.maps[name] = MapEntry(walls)
+        entry.set_walls(walls)
+        return entry
+
+    def unload(self, name: str) -> None:
+        self.get(name)
+        del self.maps[name]
+
+    def edit(
+        self,
+        name: str,
+        toggle: list[tuple[int, int]] = (),
+        assign: list[tuple[int, int, bool]] = (),
+    ) -> MapEntry:
+        """
+        Sửa bản đồ theo kiểu sao chép khi ghi: các lô đang chạy vẫn dùng mảng cũ.
+        """
+        entry = self.get(name)
+        walls = entry.walls.copy()
+        for x, y in toggle:
+            _check_bounds(walls, (x, y))
+            walls[x, y] = not walls[x, y]
+        for x, y, is_wall in assign:
+            _check_bounds(walls, (x, y))
+            walls[x, y] = bool(is_wall)
+        entry.set_walls(walls)
+        return entry
+
+
+def _check_bounds(walls: np.ndarray, pos) -> tuple[int, int]:
+    x, y = int(pos[0]), int(pos[1])
+    if not (0 <= x < walls.shape[0] and 0 <= y < walls.shape[1]):
+        raise ServiceError(f"Position {(x, y)} is outside the map.")
+    return x, y
+
+
+class LatencyRecorder:
+    """Lưu độ trễ của các yêu cầu gần nhất và tính phân vị."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self) -> dict[str, float]:
+        if not self.samples:
+            return {f"p{p}": 0.0 for p in PERCENTILES}
+        values = np.percentile(np.fromiter(self.samples, float), PERCENTILES)
+        return {f"p{p}": float(v) * 1000 for p, v in zip(PERCENTILES, values)}
+
+
+_worker_grids: dict[str, tuple[int, CellGrid]] = {}  # Lưới đã dựng trong tiến trình con
+
+
+def _solve_batch(
+    name: str,
+    revision: int,
+    shape: tuple[int, int],
+    packed: bytes | None,
+    queries: list[tuple[tuple[int, int], list[tuple[int, int]], int]],
+) -> list[list[tuple[tuple[int, int], int, list[tuple[int, int]]]]] | None:
+    """
+    Chạy một lô truy vấn trong tiến trình con, dùng lại lưới nếu cùng số hiệu.
+
+    Parameters:
+        name (str), revision (int): Bản đồ và số hiệu nội dung của lô.
+        shape (tuple[int, int]), packed (bytes | None): Mảng vật cản nén bằng
+            `np.packbits`, None nếu lô được gửi với giả định tiến trình đã có lưới.
+        queries (list): Các bộ (ô xuất phát, các ô đích, k).
+
+    Returns:
+        list | None: Kết quả `nearest_targets` của từng truy vấn, None nếu
+        tiến trình chưa có lưới và `packed` là None.
+    """
+    cached = _worker_grids.get(name)
+    if cached is None or cached[0] != revision:
+        if packed is None:
+            return None
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8))
+        walls = bits[: shape[0] * shape[1]].reshape(shape).astype(bool)
+        grid = CellGrid((0, 0, BOARD_SIZE, BOARD_SIZE), walls, (0, 0), (0, 0))
+        _worker_grids[name] = cached = (revision, grid)
+    grid = cached[1]
+    return [
+        nearest_targets(grid, goals, k, source=start) for start, goals, k in queries
+    ]
+
+
+class PathService:
+    """
+    Máy chủ tìm đường.
+
+    Attributes:
+        registry (MapRegistry): Kho bản đồ.
+        executor (Executor): Pool chạy các lô tìm kiếm.
+        batch_window (float): Thời gian (giây) chờ gom các truy vấn cùng bản đồ.
+        max_batch (int): Số truy vấn tối đa của một lô.
+        latency (LatencyRecorder): Độ trễ của các truy vấn tìm đường.
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        workers: int | None = None,
+        batch_window: float = 0.002,
+        max_batch: int = 64,
+    ):
+        self.registry = MapRegistry()
+        self.executor = executor or ProcessPoolExecutor(workers or os.cpu_count())
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.latency = LatencyRecorder()
+        self.batches = 0
+        self._pending: dict[str, list[tuple[tuple, asyncio.Future]]] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, socket_path: str) -> None:
+        """Bắt đầu lắng nghe trên Unix socket `socket_path`."""
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self._server = await asyncio.start_unix_server(self._serve, socket_path)
+
+    async def close(self) -> None:
+        """Dừng nhận kết nối, đóng các kết nối đang mở rồi tắt pool."""
+        if self._server is not None:
+            self._server.close()
+        for writer in self._connections.values():
+            writer.close()  # Kết nối nhận EOF và kết thúc sau khi trả các phản hồi còn lại
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self.executor.shutdown(cancel_futures=True)
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Các yêu cầu trên một kết nối được xử lý đồng thời (để gom lô),
+        # còn phản hồi được ghi theo đúng thứ tự yêu cầu
+        connection = asyncio.current_task()
+        self._connections[connection] = writer
+        responses: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except ConnectionError:
+                    break
+                except ServiceError as error:
+                    await responses.put(_error_reply(error))
+                    if isinstance(error, ProtocolError):
+                        break
+                    continue
+                if message is None:
+                    break
+                await responses.put(asyncio.ensure_future(self.handle(message)))
+        except asyncio.CancelledError:
+            sender.cancel()
+            raise
+        finally:
+            del self._connections[connection]
+            await responses.put(None)
+            await asyncio.gather(sender, return_exceptions=True)
+
+    async def _send_responses(
+        self, responses: asyncio.Queue, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while (task := await responses.get()) is not None:
+                try:
+                    body = encode_message(await task)
+                except Exception as error:
+                    # Lỗi ngoài dự kiến của một yêu cầu không làm dừng kết nối
+                    body = encode_message(
+                        {"ok": False, "error": f"Internal error: {error!r}"}
+                    )
+                writer.write(body)
+                await writer.drain()
+        except OSError:  # Gồm cả ConnectionError
+            pass
+        finally:
+            while not responses.empty():
+                task = responses.get_nowait()
+                if task is not None:
+                    task.cancel()
+            writer.close()
+
+    async def handle(self, request: dict) -> dict:
+        """Xử lý một yêu cầu, trả về phản hồi (không ném lỗi)."""
+        try:
+            if not isinstance(request, dict):
+                raise ServiceError("A request must be a JSON object.")
+            op = request.get("op")
+            if op == "path":
+                return {"ok": True, **await self.find_path(request)}
+            if op == "load_map":
+                entry = self.registry.load(request["map"], _walls_of(request))
+                return {"ok": True, "version": entry.version}
+            if op == "edit":
+                entry = self.registry.edit(
+                    request["map"],
+                    [tuple(pos) for pos in request.get("toggle", ())],
+                    [tuple(item) for item in request.get("set", ())],
+                )
+                return {"ok": True, "version": entry.version}
+            if op == "unload_map":
+                self.registry.unload(request["map"])
+                return {"ok": True}
+            if op == "stats":
+                return {"ok": True, **self.stats()}
+            raise ServiceError(f"Unknown op {op!r}.")
+        except (ServiceError, KeyError, TypeError, ValueError) as error:
+            return {"ok": False, "error": str(error) or type(error).__name__}
+
+    async def find_path(self, request: dict) -> dict:
+        begin = time.perf_counter()
+        name = request["map"]
+        walls = self.registry.get(name).walls
+        start = _check_bounds(walls, request["start"])
+        if "goals" in request:
+            goals = [_check_bounds(walls, goal) for goal in request["goals"]]
+            k = int(request.get("k", 1))
+        else:
+            goals, k = [_check_bounds(walls, request["goal"])], 1
+
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(name, [])
+        batch.append(((start, goals, k), future))
+        if len(batch) == 1:
+            asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush, name, batch
+            )
+        if len(batch) >= self.max_batch:
+            self._flush(name, batch)
+
+        found = await future
+        self.latency.record(time.perf_counter() - begin)
+        return {
+            "results": [
+                {"goal": list(goal), "cost": cost, "path": [list(pos) for pos in path]}
+                for goal, cost, path in found
+            ]
+        }
+
+    def _flush(self, name: str, batch: list) -> None:
+        """Gửi lô đang chờ của bản đồ `name` cho pool (bỏ qua nếu đã gửi)."""
+        if self._pending.get(name) is not batch:
+            return
+        del self._pending[name]
+        try:
+            entry = self.registry.get(name)
+        except ServiceError as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        self.batches += 1
+        self._submit(name, entry.revision, entry.walls, batch, ship=not entry.shipped)
+        entry.shipped = True
+
+    def _submit(
+        self, name: str, revision: int, walls: np.ndarray, batch: list, ship: bool
+    ) -> None:
+        """
+        Gửi lô cho pool. Bản đồ chỉ được nén và gửi kèm khi `ship`; nếu tiến trình
+        nhận lô chưa có lưới của `revision`, lô được gửi lại kèm bản đồ.
+        """
+        try:
+            job = asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                _solve_batch,
+                name,
+                revision,
+                walls.shape,
+                np.packbits(walls).tobytes() if ship else None,
+                [query for query, _ in batch],
+            )
+        except RuntimeError:  # Pool đã bị tắt
+            job = asyncio.get_running_loop().create_future()
+            job.cancel()
+            _resolve(batch, job)
+            return
+
+        def done(job: asyncio.Future) -> None:
+            if (
+                not (ship or job.cancelled() or job.exception())
+                and job.result() is None
+            ):
+                self._submit(name, revision, walls, batch, ship=True)
+            else:
+                _resolve(batch, job)
+
+        job.add_done_callback(done)
+
+    def stats(self) -> dict:
+        return {
+            "maps": {
+                name: {"shape": list(entry.walls.shape), "version": entry.version}
+                for name, entry in self.registry.maps.items()
+            },
+            "requests": self.latency.count,
+            "batches": self.batches,
+            "latency_ms": self.latency.percentiles(),
+        }
+
+
+def _error_reply(error: ServiceError) -> asyncio.Future:
+    """Phản hồi lỗi đã hoàn thành, để đặt vào hàng đợi phản hồi của kết nối."""
+    reply = asyncio.get_running_loop().create_future()
+    reply.set_result({"ok": False, "error": str(error)})
+    return reply
+
+
+def _resolve(batch: list, job: asyncio.Future) -> None:
+    error = (
+        ServiceError("Search was cancelled.") if job.cancelled() else job.exception()
+    )
+    for index, (_, future) in enumerate(batch):
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(job.result()[index])
+
+
+def _walls_of(request: dict) -> np.ndarray:
+    if "walls" in request:
+        return np.array(request["walls"], dtype=bool)
+    generator = generators.GENERATORS.get(request.get("generator"))
+    if generator is None:
+        raise ServiceError("load_map needs 'walls' or a known 'generator'.")
+    size = int(request.get("size", 64))
+    return generator(size, size, seed=request.get("seed"))
+
+
+def encode_message(message: dict) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    return HEADER.pack(len(body)) + body
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict | None:
+    """
+    Đọc một thông điệp, None nếu kết nối đã đóng (kể cả khi đóng giữa thông điệp).
+
+    Raises:
+        ProtocolError: Độ dài thông điệp vượt quá `MAX_MESSAGE_SIZE`.
+        ServiceError: Phần thân không phải JSON hợp lệ (thông điệp đã được đọc hết).
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+        (length,) = HEADER.unpack(header)
+        if length > MAX_MESSAGE_SIZE:
+            raise ProtocolError(f"Message of {length} bytes is too large.")
+        body = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError as error:  # Gồm cả JSONDecodeError và UnicodeDecodeError
+        raise ServiceError(f"Malformed message: {error}.") from None
+
+
+class PathClient:
+    """Client bất đồng bộ cho `PathService`; các yêu cầu có thể gửi đồng thời."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._waiting: deque[asyncio.Future] = deque()
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, socket_path: str) -> "PathClient":
+        return cls(*await asyncio.open_unix_connection(socket_path))
+
+    async def _receive(self) -> None:
+        while (message := await read_message(self.reader)) is not None:
+            self._waiting.popleft().set_result(message)
+        while self._waiting:
+            self._waiting.popleft().set_exception(ConnectionError("Connection closed."))
+
+    async def request(self, message: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append(future)
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self._receiver
+
+
+async def serve(socket_path: str, workers: int | None = None) -> None:
+    service = PathService(workers=workers)
+    await service.start(socket_path)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local pathfinding service")
+    parser.add_argument("--socket", default="/tmp/astar.sock")
+    parser.add_argument("--workers", type=int)
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.socket, arguments.workers))
@@ -0,0 +1,229 @@
+"""
+Ghi lại các phiên tương tác và phát lại không cần cửa sổ để đo hiệu năng.
+
+Khi chạy với `--record FILE`, `Game.handle_events` ghi mọi sự kiện đầu vào của
+từng khung hình (kể cả khung hình không có sự kiện) cùng thời điểm của khung.
+File là một luồng gzip: dòng tiêu đề JSON (cấu hình, hạt giống ngẫu nhiên, mã
+băm bản đồ ban đầu) rồi các bản ghi nhị phân `FRAME` + `EVENT`.
+
+Khi phát lại, trò chơi được dựng lại với cùng cấu hình và hạt giống (nên bản đồ
+và các lần reset bằng R giống hệt), đồng hồ của `Game` được thay bằng thời điểm
+đã ghi (nên việc hoãn tìm kiếm khi kéo chuột diễn ra như lúc ghi), và mỗi khung
+hình được chạy lại qua `Game.run_frame` với thời gian từng giai đoạn được đo
+bằng `FrameProfiler`. Lần tìm kiếm bị hủy khi có sự kiện mới đang chờ phụ thuộc
+vào thời gian thực nên không xảy ra khi phát lại.
+
+Chạy: `python -m src.session FILE [--report report.json]`
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import struct
+import time
+
+import pygame as pg
+
+from src.artifacts import map_hash
+from src.config import Config
+from src.grid import grid_walls
+from src.profiler import PHASES, WORST_FRAMES, FrameProfiler
+from src.types import HeuristicType
+
+SESSION_MAGIC = b"ASTAR-SESSION-1\n"
+FRAME = struct.Struct("<dH")  # Thời điểm (giây, tính từ đầu phiên), số sự kiện
+EVENT = struct.Struct("<BIhh")  # Loại, phím / nút chuột, tọa độ chuột x, y
+
+# Các loại sự kiện được ghi, theo chỉ số lưu trong file
+EVENT_TYPES = (
+    pg.QUIT,
+    pg.KEYDOWN,
+    pg.MOUSEBUTTONDOWN,
+    pg.MOUSEBUTTONUP,
+    pg.MOUSEMOTION,
+)
+EVENT_KINDS = {event_type: kind for kind, event_type in enumerate(EVENT_TYPES)}
+
+# Các tùy chọn cấu hình ảnh hưởng đến phiên, được ghi vào tiêu đề
+SESSION_OPTIONS = ("auto_mode", "map_path", "grid_size", "engine", "profile")
+
+
+class SessionRecorder:
+    """
+    Ghi các sự kiện của từng khung hình vào file phiên.
+
+    Attributes:
+        path (str): File phiên.
+        started_at (float | None): Thời điểm của khung hình đầu tiên.
+        frames (int): Số khung hình đã ghi.
+    """
+
+    def __init__(self, path: str, config: Config, seed: int, walls):
+        self.path = path
+        self.started_at: float | None = None
+        self.frames = 0
+        header = {name: getattr(config, name) for name in SESSION_OPTIONS}
+        header.update(
+            heuristic=config.heuristic.name, seed=seed, map_hash=map_hash(walls)
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = gzip.open(path, "wb")
+        self._file.write(SESSION_MAGIC)
+        self._file.write(json.dumps(header).encode() + b"\n")
+
+    def record_frame(self, timestamp: float, events: list[pg.event.Event]) -> None:
+        """Ghi các sự kiện của một khung hình; bỏ qua các loại không được xử lý."""
+        if self.started_at is None:
+            self.started_at = timestamp
+        records = []
+        for event in events:
+            kind = EVENT_KINDS.get(event.type)
+            if kind is None:
+                continue
+            code = getattr(event, "key", getattr(event, "button", 0))
+            x, y = getattr(event, "pos", (0, 0))
+            records.append(EVENT.pack(kind, code, x, y))
+        self._file.write(FRAME.pack(timestamp - self.started_at, len(records)))
+        self._file.write(b"".join(records))
+        self.frames += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_session(path: str) -> tuple[dict, list[tuple[float, list[pg.event.Event]]]]:
+    """
+    Đọc file phiên.
+
+    Returns:
+        tuple[dict, list[tuple[float, list[pg.event.Event]]]]: Tiêu đề và các khung
+        hình (thời điểm, sự kiện). Một khung hình ghi dở ở cuối file bị bỏ qua.
+    """
+    with gzip.open(path, "rb") as file:
+        if file.read(len(SESSION_MAGIC)) != SESSION_MAGIC:
+            raise ValueError(f"{path} is not a recorded session.")
+        header = json.loads(file.readline())
+        frames = []
+        try:
+            while True:
+                data = file.read(FRAME.size)
+                if len(data) < FRAME.size:
+                    break
+                timestamp, count = FRAME.unpack(data)
+                data = file.read(EVENT.size * count)
+                if len(data) < EVENT.size * count:
+                    break
+                events = [
+                    _to_event(*EVENT.unpack_from(data, i * EVENT.size))
+                    for i in range(count)
+                ]
+                frames.append((timestamp, events))
+        except EOFError:
+            pass  # Phiên bị ngắt khi đang ghi
+    return header, frames
+
+
+def _to_event(kind: int, code: int, x: int, y: int) -> pg.event.Event:
+    event_type = EVENT_TYPES[kind]
+    if event_type == pg.KEYDOWN:
+        return pg.event.Event(event_type, key=code)
+    if event_type in (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+        return pg.event.Event(event_type, pos=(x, y), button=code)
+    if event_type == pg.MOUSEMOTION:
+        return pg.event.Event(event_type, pos=(x, y), rel=(0, 0), buttons=(1, 0, 0))
+    return pg.event.Event(event_type)
+
+
+def _ends_session(event: pg.event.Event) -> bool:
+    return event.type == pg.QUIT or (
+        event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE
+    )
+
+
+def replay_session(path: str, report_path: str | None = None) -> dict:
+    """
+    Phát lại một phiên đã ghi qua vòng lặp của `Game`, không mở cửa sổ.
+
+    Parameters:
+        path (str): File phiên.
+        report_path (str | None): File JSON ghi thời gian của từng khung hình.
+
+    Returns:
+        dict: Tóm tắt: số khung hình, tổng thời gian, phân vị, thời gian trung
+        bình mỗi giai đoạn và các khung hình chậm nhất (ms).
+    """
+    from src.game import Game  # Game tạo cửa sổ, chỉ import khi phát lại
+
+    header, frames = read_session(path)
+    config = Config(
+        heuristic=HeuristicType[header["heuristic"]],
+        **{name: header[name] for name in SESSION_OPTIONS},
+    )
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.display.init()
+    pg.font.init()
+
+    random.seed(header["seed"])
+    game = Game(config)
+    if map_hash(grid_walls(game.grid)) != header["map_hash"]:
+        raise ValueError("The map differs from the one the session was recorded on.")
+    profiler = FrameProfiler(window=max(len(frames), 1), worst=WORST_FRAMES)
+    game.profiler = profiler
+    if game.logger.profiler is not None:
+        game.logger.profiler = profiler  # Phiên được ghi khi đang bật profiler
+    now = 0.0
+    game.clock = lambda: now
+
+    begin = time.perf_counter()
+    for now, events in frames:
+        pg.event.clear()
+        for event in events:
+            if not _ends_session(event):
+                pg.event.post(event)
+        game.run_frame()
+    elapsed = time.perf_counter() - begin
+
+    summary = {
+        "frames": len(frames),
+        "session_s": frames[-1][0] if frames else 0.0,
+        "replay_s": elapsed,
+        "percentiles_ms": profiler.percentiles(),
+        "phase_means_ms": profiler.phase_means(),
+        "worst_ms": [
+            total * 1000 for total, *_ in sorted(profiler.worst, reverse=True)
+        ],
+    }
+    if report_path is not None:
+        per_frame = [
+            [total * 1000] + [phases.get(name, 0.0) * 1000 for name in PHASES]
+            for _, total, phases in profiler.frames
+        ]
+        report = dict(summary, columns=["total", *PHASES], per_frame_ms=per_frame)
+        with open(report_path, "w") as file:
+            json.dump(report, file)
+    return summary
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session")
+    parser.add_argument("session", help="file written with --record")
+    parser.add_argument("--report", help="JSON file for per-frame timings")
+    arguments = parser.parse_args(argv)
+    summary = replay_session(arguments.session, arguments.report)
+    percentiles = ", ".join(
+        f"{name} {ms:.1f} ms" for name, ms in summary["percentiles_ms"].items()
+    )
+    phases = ", ".join(
+        f"{name} {ms:.2f} ms" for name, ms in summary["phase_means_ms"].items()
+    )
+    print(
+        f"{summary['frames']} frames in {summary['replay_s']:.2f} s "
+        f"(recorded {summary['session_s']:.2f} s): {percentiles}"
+    )
+    print(f"Mean per phase: {phases}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Bản đồ có phiên bản với các snapshot bất biến, sao chép khi ghi theo từng khối.
+
+Bản đồ được chia thành các khối `chunk_size` x `chunk_size` (mảng NumPy chỉ
+đọc). Mỗi lần sửa tạo một `GridSnapshot` mới: chỉ các khối bị sửa được sao
+chép, các khối còn lại dùng chung với phiên bản trước. Các lần tìm kiếm đang
+chạy trên snapshot cũ không bị ảnh hưởng, và vì trạng thái tìm kiếm nằm trong
+`SearchState` nên nhiều lần tìm kiếm có thể dùng chung một snapshot.
+"""
+
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from src.grid import CellGrid, grid_walls
+from src.map_edit import ChangeSet
+from src.types import CellMark, CellType
+from src.utils import add_point
+
+CHUNK_SIZE = 32  # Kích thước mặc định của mỗi khối
+
+
+class CellView(NamedTuple):
+    """Thông tin chỉ đọc của một ô trong snapshot."""
+
+    pos: tuple[int, int]
+    type: CellType
+    mark: CellMark = CellMark.No
+
+
+class GridSnapshot:
+    """
+    Một phiên bản bất biến của bản đồ, có cùng giao diện đọc với CellGrid
+    (`get_size`, `at`, `get_neighbors`, `start`, `end`) nên dùng được cho
+    `a_star`, `ida_star`, `theta_star`, `nearest_targets`, ...
+
+    Attributes:
+        version (int): Số phiên bản.
+        shape (tuple[int, int]): Kích thước bản đồ (width, height).
+        chunk_size (int): Kích thước khối.
+        chunks (tuple[tuple[np.ndarray, ...], ...]): Các khối vật cản, chỉ số [cx][cy].
+        start (tuple[int, int]): Vị trí bắt đầu.
+        end (tuple[int, int]): Vị trí kết thúc.
+    """
+
+    __slots__ = ("version", "shape", "chunk_size", "chunks", "start", "end")
+
+    def __init__(self, version, shape, chunk_size, chunks, start, end):
+        self.version = version
+        self.shape = shape
+        self.chunk_size = chunk_size
+        self.chunks = chunks
+        self.start = start
+        self.end = end
+
+    def get_size(self) -> tuple[int, int]:
+        return self.shape
+
+    def is_wall(self, pos: tuple[int, int]) -> bool:
+        size = self.chunk_size
+        chunk = self.chunks[pos[0] // size][pos[1] // size]
+        return bool(chunk[pos[0] % size, pos[1] % size])
+
+    def at(self, pos: tuple[int, int]) -> CellView:
+        pos = (pos[0], pos[1])
+        mark = (
+            CellMark.Start
+            if pos == self.start
+            else CellMark.End if pos == self.end else CellMark.No
+        )
+        cell_type = CellType.Wall if self.is_wall(pos) else CellType.Empty
+        return CellView(pos, cell_type, mark)
+
+    def get_neighbors(self, pos: tuple[int, int]) -> list[CellView]:
+        """Các ô trống lân cận, cùng thứ tự duyệt với `CellGrid.get_neighbors`."""
+        width, height = self.shape
+        offsets = (
+            [(0, -1), (-1, 0), (0, 1), (1, 0)]
+            if (pos[0] + pos[1]) % 2
+            else [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        )
+        neighbors = []
+        for offset in offsets:
+            npos = add_point(pos, offset)
+            if 0 <= npos[0] < width and 0 <= npos[1] < height:
+                if not self.is_wall(npos):
+                    neighbors.append(CellView(npos, CellType.Empty))
+        return neighbors
+
+    def walls(self) -> np.ndarray:
+        """Ghép các khối thành mảng bool (width, height), True là ô vật cản."""
+        return np.block([list(column) for column in self.chunks])
+
+
+class VersionedGrid:
+    """
+    Bản đồ có phiên bản: người đọc lấy `snapshot()`, người ghi gọi `apply`.
+
+    Attributes:
+        chunk_size (int): Kích thước khối.
+        current (GridSnapshot): Phiên bản mới nhất.
+    """
+
+    def __init__(
+        self,
+        walls: np.ndarray,
+        start: tuple[int, int] = (0, 0),
+        end: tuple[int, int] = (0, 0),
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.chunk_size = chunk_size
+        width, height = walls.shape
+        chunks = tuple(
+            tuple(
+                _frozen(walls[x : x + chunk_size, y : y + chunk_size])
+                for y in range(0, height, chunk_size)
+            )
+            for x in range(0, width, chunk_size)
+        )
+        self.current = GridSnapshot(
+            0, (width, height), chunk_size, chunks, tuple(start), tuple(end)
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_grid(cls, grid: CellGrid, chunk_size: int = CHUNK_SIZE) -> "VersionedGrid":
+        """
+        Tạo bản đồ có phiên bản từ một CellGrid và theo dõi các lần sửa bản đồ,
+        mỗi lần sửa (kể cả theo khối) tạo đúng một phiên bản. Việc di chuyển ô
+        bắt đầu / kết thúc (`set_start`, `set_end`) cũng tạo một phiên bản mới.
+        """
+        versioned = cls(grid_walls(grid), grid.start, grid.end, chunk_size)
+        grid.change_listeners.append(versioned.apply_changes)
+        grid.marker_listeners.append(versioned.move_markers)
+        return versioned
+
+    def snapshot(self) -> GridSnapshot:
+        """Phiên bản mới nhất; không bao giờ thay đổi sau khi được trả về."""
+        return self.current
+
+    def apply(
+        self,
+        toggle: list[tuple[int, int]] = (),
+        assign: list[tuple[tuple[int, int], bool]] = (),
+        start: tuple[int, int] | None = None,
+        end: tuple[int, int] | None = None,
+    ) -> GridSnapshot:
+        """
+        Áp dụng các thay đổi, tạo phiên bản mới. Mỗi khối bị sửa chỉ được sao
+        chép một lần, các khối khác dùng chung với phiên bản trước.
+
+        Parameters:
+            toggle (list[tuple[int, int]]): Các ô đổi giữa Trống và Tường.
+            assign (list[tuple[tuple[int, int], bool]]): Các cặp (ô, là vật cản).
+            start (tuple[int, int] | None): Vị trí bắt đầu mới.
+            end (tuple[int, int] | None): Vị trí kết thúc mới.
+
+        Returns:
+            GridSnapshot: Phiên bản mới.
+        """
+        size = self.chunk_size
+        with self._lock:
+            old = self.current
+            copied: dict[tuple[int, int], np.ndarray] = {}
+
+            def writable(pos):
+                if not (0 <= pos[0] < old.shape[0] and 0 <= pos[1] < old.shape[1]):
+                    raise ValueError(f"Position {tuple(pos)} is outside the grid.")
+                key = (pos[0] // size, pos[1] // size)
+                chunk = copied.get(key)
+                if chunk is None:
+                    chunk = copied[key] = old.chunks[key[0]][key[1]].copy()
+                return chunk, pos[0] % size, pos[1] % size
+
+            for pos in toggle:
+                chunk, x, y = writable(pos)
+                chunk[x, y] = not chunk[x, y]
+            for pos, is_wall in assign:
+                chunk, x, y = writable(pos)
+                chunk[x, y] = is_wall
+
+            chunks = old.chunks
+            if copied:
+                columns = [list(column) for column in chunks]
+                for (cx, cy), chunk in copied.items():
+                    columns[cx][cy] = _frozen(chunk)
+                chunks = tuple(tuple(column) for column in columns)
+            self.current = GridSnapshot(
+                old.version + 1,
+                old.shape,
+                size,
+                chunks,
+                old.start if start is None else tuple(start),
+                old.end if end is None else tuple(end),
+            )
+            return self.current
+
+    def move_markers(
+        self, start: tuple[int, int], end: tuple[int, int]
+    ) -> GridSnapshot:
+        """Tạo phiên bản mới với ô bắt đầu / kết thúc mới, dùng chung mọi khối."""
+        return self.apply(start=start, end=end)
+
+    def apply_changes(self, changes: ChangeSet) -> GridSnapshot:
+        """
+        Áp dụng một lần sửa theo khối của CellGrid thành đúng một phiên bản mới.
+        Các ô được gom theo khối và gán cùng lúc bằng chỉ số mảng.
+        """
+        size = self.chunk_size
+        with self._lock:
+            old = self.current
+            positions = changes.positions
+            chunks = old.chunks
+            if len(positions):
+                if (positions < 0).any() or (positions >= old.shape).any():
+                    raise ValueError("Change set has positions outside the grid.")
+                keys = positions // size
+                columns = [list(column) for column in chunks]
+                unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+                inverse = inverse.reshape(-1)
+                for index, (cx, cy) in enumerate(unique.tolist()):
+                    selected = inverse == index
+                    local = positions[selected] % size
+                    chunk = chunks[cx][cy].copy()
+                    chunk[local[:, 0], local[:, 1]] = changes.walls[selected]
+                    columns[cx][cy] = _frozen(chunk)
+                chunks = tuple(tuple(column) for column in columns)
+            self.current = GridSnapshot(
+                old.version + 1, old.shape, size, chunks, old.start, old.end
+            )
+            return self.current
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array = np.array(array, dtype=bool)
+    array.flags.writeable = False
+    return array
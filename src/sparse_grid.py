@@ -0,0 +1,261 @@
+"""
+Lưới thưa chia khối cho các bản đồ rất lớn nhưng phần lớn là ô trống.
+
+Bản đồ được chia thành các khối `chunk_size` x `chunk_size`, chỉ tạo khi cần:
+
+- Khối đồng nhất (toàn ô trống hoặc toàn vật cản) chỉ lưu một giá trị bool.
+- Khối không đồng nhất lưu một mảng bool NumPy, được gộp lại thành một giá trị
+  khi trở nên đồng nhất.
+- Khi số khối mảng trong bộ nhớ vượt quá `max_resident`, khối ít dùng nhất
+  được ghi ra đĩa (dạng `np.packbits`) và nạp lại khi được truy cập.
+
+`SparseGrid` có cùng giao diện đọc với CellGrid (`get_size`, `at`,
+`get_neighbors`, `start`, `end`) và dùng được với GridMetrics và các thuật toán
+tìm kiếm ghi trạng thái vào `SearchState`.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from src.snapshot import CellView
+from src.types import CellMark, CellType
+from src.utils import add_point
+
+CHUNK_SIZE = 64  # Kích thước mặc định của mỗi khối
+
+
+class _PagedOut:
+    """Đánh dấu khối mảng đang nằm trên đĩa."""
+
+    __slots__ = ()
+
+
+PAGED_OUT = _PagedOut()
+
+
+class SparseGrid:
+    """
+    Lưới thưa chia khối.
+
+    Attributes:
+        width (int), height (int): Kích thước lưới.
+        chunk_size (int): Kích thước khối.
+        default_wall (bool): Giá trị của các khối chưa được tạo.
+        chunks (dict): Khối theo chỉ số (cx, cy): bool, mảng bool, hoặc PAGED_OUT.
+        start (tuple[int, int]), end (tuple[int, int]): Vị trí bắt đầu và kết thúc.
+        listeners (list): Các hàm được gọi với vị trí ô mỗi khi ô bị đổi loại.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        start: tuple[int, int] = (0, 0),
+        end: tuple[int, int] = (0, 0),
+        chunk_size: int = CHUNK_SIZE,
+        default_wall: bool = False,
+        max_resident: int | None = None,
+        page_dir: str | None = None,
+    ):
+        if max_resident is not None and max_resident < 1:
+            raise ValueError("max_resident must be at least 1.")
+        self.width = width
+        self.height = height
+        self.start = tuple(start)
+        self.end = tuple(end)
+        self.chunk_size = chunk_size
+        self.default_wall = default_wall
+        self.chunks: dict[tuple[int, int], bool | np.ndarray | _PagedOut] = {}
+        self.listeners = []
+        self.max_resident = max_resident
+        self._resident: OrderedDict[tuple[int, int], None] = OrderedDict()
+        # Thứ tự dùng gần đây của các khối mảng trong bộ nhớ (cũ nhất đứng đầu)
+        self._owns_page_dir = max_resident is not None and page_dir is None
+        self.page_dir = (
+            tempfile.mkdtemp(prefix="chunks-") if self._owns_page_dir else page_dir
+        )
+        self.page_outs = 0
+        self.page_ins = 0
+
+    def get_size(self) -> tuple[int, int]:
+        return (self.width, self.height)
+
+    def in_bounds(self, pos: tuple[int, int]) -> bool:
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def _chunk(self, key: tuple[int, int]) -> bool | np.ndarray:
+        chunk = self.chunks.get(key, self.default_wall)
+        if chunk is PAGED_OUT:
+            chunk = self._page_in(key)
+        elif type(chunk) is np.ndarray and self.max_resident is not None:
+            self._resident.move_to_end(key)
+        return chunk
+
+    def is_wall(self, pos: tuple[int, int]) -> bool:
+        size = self.chunk_size
+        chunk = self._chunk((pos[0] // size, pos[1] // size))
+        if type(chunk) is bool:
+            return chunk
+        return bool(chunk[pos[0] % size, pos[1] % size])
+
+    def at(self, pos: tuple[int, int]) -> CellView:
+        pos = (pos[0], pos[1])
+        mark = (
+            CellMark.Start
+            if pos == self.start
+            else CellMark.End if pos == self.end else CellMark.No
+        )
+        cell_type = CellType.Wall if self.is_wall(pos) else CellType.Empty
+        return CellView(pos, cell_type, mark)
+
+    def get_neighbors(self, pos: tuple[int, int]) -> list[CellView]:
+        """Các ô trống lân cận, cùng thứ tự duyệt với `CellGrid.get_neighbors`."""
+        offsets = (
+            [(0, -1), (-1, 0), (0, 1), (1, 0)]
+            if (pos[0] + pos[1]) % 2
+            else [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        )
+        neighbors = []
+        for offset in offsets:
+            npos = add_point(pos, offset)
+            if self.in_bounds(npos) and not self.is_wall(npos):
+                neighbors.append(CellView(npos, CellType.Empty))
+        return neighbors
+
+    def set_wall(self, pos: tuple[int, int], is_wall: bool) -> None:
+        """Đặt loại của ô `pos`, tạo mảng cho khối nếu khối đang đồng nhất."""
+        if not self.in_bounds(pos):
+            raise ValueError(f"Position {tuple(pos)} is outside the grid.")
+        size = self.chunk_size
+        key = (pos[0] // size, pos[1] // size)
+        chunk = self._chunk(key)
+        if type(chunk) is bool:
+            if chunk == is_wall:
+                return
+            chunk = np.full(self._chunk_shape(key), chunk, dtype=bool)
+            self._store(key, chunk)
+        chunk[pos[0] % size, pos[1] % size] = is_wall
+        self._collapse(key, chunk)
+        for listener in self.listeners:
+            listener(pos)
+
+    def toggle(self, pos: tuple[int, int]) -> None:
+        """Chuyển đổi loại ô tại `pos` giữa Trống và Tường."""
+        self.set_wall(pos, not self.is_wall(pos))
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, is_wall: bool) -> None:
+        """
+        Đặt loại cho mọi ô trong hình chữ nhật [x0, x1] x [y0, y1] (bao gồm biên).
+        Các khối nằm trọn trong hình chữ nhật được thay bằng một giá trị bool.
+
+        Khi có `listeners`, các ô thực sự đổi loại được tìm theo từng khối và
+        các listener được gọi với từng ô sau khi mọi khối đã được sửa.
+        """
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width - 1), min(y1, self.height - 1)
+        size = self.chunk_size
+        changed = []
+        for cx in range(x0 // size, x1 // size + 1):
+            for cy in range(y0 // size, y1 // size + 1):
+                key = (cx, cy)
+                width, height = self._chunk_shape(key)
+                left, top = cx * size, cy * size
+                lx0, ly0 = max(x0 - left, 0), max(y0 - top, 0)
+                lx1, ly1 = min(x1 - left, width - 1), min(y1 - top, height - 1)
+                covers = (lx0, ly0, lx1, ly1) == (0, 0, width - 1, height - 1)
+                if covers and not self.listeners:
+                    self._store(key, is_wall)
+                    continue
+                chunk = self._chunk(key)
+                if type(chunk) is bool and chunk == is_wall:
+                    continue
+                if self.listeners:
+                    if type(chunk) is bool:
+                        local = np.argwhere(np.ones((lx1 - lx0 + 1, ly1 - ly0 + 1)))
+                    else:
+                        region = chunk[lx0 : lx1 + 1, ly0 : ly1 + 1]
+                        local = np.argwhere(region != is_wall)
+                    changed.append(local + (left + lx0, top + ly0))
+                if covers:
+                    self._store(key, is_wall)
+                    continue
+                if type(chunk) is bool:
+                    chunk = np.full((width, height), chunk, dtype=bool)
+                    self._store(key, chunk)
+                chunk[lx0 : lx1 + 1, ly0 : ly1 + 1] = is_wall
+                self._collapse(key, chunk)
+
+        for positions in changed:
+            for pos in map(tuple, positions.tolist()):
+                for listener in self.listeners:
+                    listener(pos)
+
+    def _chunk_shape(self, key: tuple[int, int]) -> tuple[int, int]:
+        size = self.chunk_size
+        return (
+            min(size, self.width - key[0] * size),
+            min(size, self.height - key[1] * size),
+        )
+
+    def _collapse(self, key: tuple[int, int], chunk: np.ndarray) -> None:
+        """Gộp khối mảng thành một giá trị bool nếu khối đã đồng nhất."""
+        first = bool(chunk.flat[0])
+        if chunk.all() if first else not chunk.any():
+            self._store(key, first)
+
+    def _store(self, key: tuple[int, int], chunk: bool | np.ndarray) -> None:
+        if type(chunk) is bool:
+            self._resident.pop(key, None)
+            self._remove_page(key)
+            if chunk == self.default_wall:
+                self.chunks.pop(key, None)
+            else:
+                self.chunks[key] = chunk
+            return
+        self.chunks[key] = chunk
+        if self.max_resident is not None:
+            self._resident[key] = None
+            self._resident.move_to_end(key)
+            self._evict()
+
+    def _page_path(self, key: tuple[int, int]) -> str:
+        return os.path.join(self.page_dir, f"{key[0]}_{key[1]}.npy")
+
+    def _remove_page(self, key: tuple[int, int]) -> None:
+        if self.page_dir is not None and self.chunks.get(key) is PAGED_OUT:
+            os.unlink(self._page_path(key))
+
+    def _evict(self) -> None:
+        """Ghi các khối ít dùng nhất ra đĩa cho đến khi không vượt quá `max_resident`."""
+        while len(self._resident) > self.max_resident:
+            key, _ = self._resident.popitem(last=False)
+            np.save(self._page_path(key), np.packbits(self.chunks[key]))
+            self.chunks[key] = PAGED_OUT
+            self.page_outs += 1
+
+    def _page_in(self, key: tuple[int, int]) -> np.ndarray:
+        path = self._page_path(key)
+        width, height = self._chunk_shape(key)
+        bits = np.unpackbits(np.load(path))[: width * height]
+        chunk = bits.reshape(width, height).astype(bool)
+        os.unlink(path)
+        self.page_ins += 1
+        self.chunks[key] = chunk
+        self._resident[key] = None
+        self._evict()
+        return chunk
+
+    def resident_bytes(self) -> int:
+        """Số byte của các khối mảng đang nằm trong bộ nhớ."""
+        return sum(
+            chunk.nbytes for chunk in self.chunks.values() if type(chunk) is np.ndarray
+        )
+
+    def close(self) -> None:
+        """Xóa thư mục chứa các khối đã ghi ra đĩa (nếu lưới tự tạo thư mục đó)."""
+        if self._owns_page_dir:
+            shutil.rmtree(self.page_dir, ignore_errors=True)
@@ -28,3 +28,8 @@ class HeuristicType(Enum):
     MANHATTAN = 0
     EUCLIDEAN = 1
     COMBINED = 2
+
+
+class Optimality(Enum):
+    OPTIMAL = 0  # Chỉ nhận đường đi ngắn nhất (hàm lượng giá chấp nhận được)
+    ANY = 1  # Nhận đường đi bất kỳ, kể cả từ hàm lượng giá không chấp nhận được
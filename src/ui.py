@@ -7,7 +7,6 @@ from src.config import (
     CELL_COLOR_EMPTY,
     CELL_CURRENT_COLOR,
     CELL_NEXT_COLOR,
-    CELL_SIZE,
     FONT_COLOR,
     LOGGER_FONT_SIZE,
     MARGIN,
@@ -130,16 +129,30 @@ class Arrow:
 
     Attributes:
         direction (ArrowDirection): Hướng của mũi tên (Right, Left, Up, Down).
+
+    Mũi tên không có trạng thái riêng ngoài hướng, nên mỗi hướng chỉ có một
+    thể hiện dùng chung, lấy qua `Arrow.of`.
     """
 
+    __slots__ = ("direction",)
+    _shared: dict[ArrowDirection, "Arrow"] = {}
+
     def __init__(self, direction: ArrowDirection) -> None:
         self.direction = direction
 
-    def draw_arrow(self, surface, cell_center):
+    @classmethod
+    def of(cls, direction: ArrowDirection) -> "Arrow":
+        """Trả về mũi tên dùng chung cho hướng `direction`."""
+        arrow = cls._shared.get(direction)
+        if arrow is None:
+            arrow = cls._shared[direction] = cls(direction)
+        return arrow
+
+    def draw_arrow(self, surface, cell_center, cell_size):
         """
-        Vẽ mũi tên bên trong ô theo hướng `direction`.
+        Vẽ mũi tên bên trong ô (kích thước `cell_size`) theo hướng `direction`.
         """
-        half_size = CELL_SIZE / 4
+        half_size = cell_size / 4
         if self.direction == ArrowDirection.Right:
             arrow_start = (cell_center[0] - half_size, cell_center[1])
             arrow_end = (cell_center[0] + half_size, cell_center[1])
@@ -178,9 +191,12 @@ class Logger:
     Lớp đại diện cho cửa sổ thông tin.
 
     Attributes:
-        queue_items (PriorityQueue): Priority queue hiện tại.
-        curent_cell = Cell: Ô hiện tại đang được khám phá
+        queue_items (list[(Priority, Cell)]): Các phần tử đầu của Priority queue, theo thứ tự ưu tiên.
+        queue_size (int): Tổng số phần tử trong Priority queue.
+        state = SearchState: Thông tin tìm kiếm, gồm ô hiện tại đang được khám phá
         evaluations_count = int: Số ô đã được khám phá
+        profiler (FrameProfiler | None): Bộ đo khung hình; nếu có, thống kê được
+            vẽ bên dưới Priority queue (hàng đợi hiển thị ít dòng hơn)
 
     """
 
@@ -190,47 +206,59 @@ Right - Increase step
 R - create a new maze
 M - change display mode
 H - change heuristic
+P - dump frame profile
 Esc - Exit"""
 
+    QUEUE_LINES = 19  # Số dòng tối đa của Priority Queue được hiển thị
+    PROFILER_LINES = 9  # Số dòng dành cho thống kê khung hình khi bật profiler
+    PROFILER_BAR_COLOR = (120, 200, 120)
+
     def __init__(self):
         self.queue_items = None
-        self.current_cell = None
+        self.queue_size = 0
+        self.state = None
         self.heuristic = None
         self.evaluations_count = 0
+        self.profiler = None
         self.font = pg.font.SysFont(pg.font.get_default_font(), LOGGER_FONT_SIZE)
 
-    def update(self, queue_items, current, count, heuristic):
+    def queue_lines(self) -> int:
+        """Số dòng của Priority Queue được hiển thị."""
+        if self.profiler is None:
+            return Logger.QUEUE_LINES
+        return Logger.QUEUE_LINES - Logger.PROFILER_LINES
+
+    def update(self, frontier, state, count, heuristic):
         """Cập nhật giá trị của logger
 
         Args:
-            queue_items (list[(Priority, Cell)]): Priority Queue dưới dạng danh sách
-            current (Cell): Cell hiện tại đang được khám phá
+            frontier (FrontierView): Cách nhìn vào Priority Queue, chỉ lấy ra
+                `QUEUE_LINES` phần tử đầu theo thứ tự ưu tiên
+            state (SearchState): Thông tin tìm kiếm, gồm ô hiện tại đang được khám phá
             count (int): Số ô đa được khám phá
         """
-        self.current_cell = current
-        self.queue_items = queue_items
+        self.state = state
+        self.queue_items = frontier.top(self.queue_lines())
+        self.queue_size = len(frontier)
         self.evaluations_count = count
         self.heuristic = heuristic
 
     def draw_queue(self, surface: pg.Surface):
         """Vẽ Priority hiện tại lên logger"""
         surface.blit(
-            self.font.render("Priority Queue:", True, FONT_COLOR),
+            self.font.render(f"Priority Queue ({self.queue_size}):", True, FONT_COLOR),
             (
                 BOARD_SIZE + MARGIN,
                 MARGIN + 20 + LOGGER_FONT_SIZE * 3,
             ),
         )
 
-        for i, (_, cell) in enumerate(self.queue_items):
-            if i >= 20:  # Giới hạn số dòng có thể hiển thị là 20
-                break
-
+        for i, (*_, pos) in enumerate(self.queue_items):
             color = CELL_NEXT_COLOR if i == 0 else FONT_COLOR
             # Giá trị đầu tiên trong Priority Queue (ô tiếp theo được khám phá) sẽ được tô màu khác
 
             text = self.font.render(
-                f"Priority: {cell.cost} + {round(cell.heuristic, 2)}, Position: {cell.pos}",
+                f"Priority: {self.state.cost_of(pos)} + {round(self.state.heuristic_of(pos), 2)}, Position: {pos}",
                 True,
                 color,
             )
@@ -239,19 +267,53 @@ Esc - Exit"""
                 (BOARD_SIZE + MARGIN, MARGIN + 20 + (i + 4) * LOGGER_FONT_SIZE),
             )
 
+    def draw_profiler(self, surface: pg.Surface):
+        """Vẽ FPS, phân vị thời gian khung hình, thời gian từng giai đoạn và biểu đồ tần suất"""
+        profiler = self.profiler
+        left = BOARD_SIZE + MARGIN
+        top = MARGIN + 20 + (4 + self.queue_lines()) * LOGGER_FONT_SIZE
+        percentiles = "  ".join(
+            f"{name} {value:.1f}" for name, value in profiler.percentiles().items()
+        )
+        lines = [f"FPS: {profiler.fps():.1f}", f"{percentiles} ms"]
+        means = profiler.phase_means()
+        lines += [f"{name}: {value:.2f} ms" for name, value in means.items()]
+        for i, line in enumerate(lines):
+            surface.blit(
+                self.font.render(line, True, FONT_COLOR),
+                (left, top + i * LOGGER_FONT_SIZE),
+            )
+
+        # Biểu đồ tần suất thời gian khung hình, mỗi cột là một khoảng HISTOGRAM_EDGES_MS
+        counts = profiler.histogram()
+        height = (Logger.PROFILER_LINES - len(lines)) * LOGGER_FONT_SIZE - MARGIN
+        bottom = top + len(lines) * LOGGER_FONT_SIZE + height
+        width = (300 - 3 * MARGIN) // len(counts)
+        highest = max(max(counts), 1)
+        for i, count in enumerate(counts):
+            bar = int(height * count / highest)
+            pg.draw.rect(
+                surface,
+                Logger.PROFILER_BAR_COLOR,
+                (left + i * width, bottom - bar, width - 2, bar),
+            )
+
     def draw_instruction(self, surface: pg.Surface):
         """Vẽ các hướng dẫn"""
         header_lines = Logger.HEADER_TEXT.splitlines()
+        top = SCREEN_HEIGHT - MARGIN - len(header_lines) * LOGGER_FONT_SIZE
+        # Phần hướng dẫn được căn theo đáy cửa sổ
         for i, line in enumerate(header_lines):
             text_surface = self.font.render(line, True, FONT_COLOR)
 
             surface.blit(
                 text_surface,
-                (BOARD_SIZE + MARGIN, BOARD_SIZE - 70 + i * LOGGER_FONT_SIZE),
+                (BOARD_SIZE + MARGIN, top + i * LOGGER_FONT_SIZE),
             )
 
     def draw_current(self, surface: pg.Surface):
         """Vẽ ô đang được khám phá và số lượng ô đã được khám phá"""
+        current = self.state.current
         surface.blit(
             self.font.render(
                 f"Evaluation count: {self.evaluations_count}",
@@ -270,7 +332,7 @@ Esc - Exit"""
         )
         surface.blit(
             self.font.render(
-                f"Current: {self.current_cell.cost} + {round(self.current_cell.heuristic,2)}, Position: {self.current_cell.pos}",
+                f"Current: {self.state.cost_of(current)} + {round(self.state.heuristic_of(current),2)}, Position: {current}",
                 True,
                 CELL_CURRENT_COLOR,
             ),
@@ -287,6 +349,8 @@ Esc - Exit"""
             (BOARD_SIZE, MARGIN, 300 - MARGIN, SCREEN_HEIGHT - MARGIN * 2),
         )  # Vẽ background
         self.draw_instruction(surface)
+        if self.profiler is not None:
+            self.draw_profiler(surface)
 
         if self.queue_items is None:
             return
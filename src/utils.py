@@ -1,3 +1,6 @@
+import heapq
+
+
 def add_point(pos_a: tuple[int, int], pos_b: tuple[int, int]) -> tuple[int, int]:
     """Adds two points represented as [x, y] coordinates."""
     return (pos_a[0] + pos_b[0], pos_a[1] + pos_b[1])
@@ -16,6 +19,47 @@ def print_queue(q):
         q.put(item)
 
 
+class FrontierView:
+    """
+    Cách nhìn chỉ đọc vào hàng đợi ưu tiên (heap) mà không sao chép nó.
+
+    Attributes:
+        heap (list): Mảng heap bên dưới, ví dụ `PriorityQueue.queue`.
+    """
+
+    def __init__(self, heap: list):
+        self.heap = heap
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self):
+        """
+        Duyệt các phần tử theo đúng thứ tự ưu tiên, từng phần tử một.
+        Dùng một heap phụ chứa các nút biên của cây heap, nên lấy k phần tử
+        đầu chỉ tốn O(k log k) thay vì sắp xếp cả hàng đợi.
+        """
+        heap = self.heap
+        if not heap:
+            return
+        candidates = [(heap[0], 0)]
+        while candidates:
+            item, index = heapq.heappop(candidates)
+            yield item
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (heap[child], child))
+
+    def top(self, k: int) -> list:
+        """Trả về k phần tử có độ ưu tiên cao nhất (nhỏ nhất), theo thứ tự."""
+        items = []
+        for item in self:
+            if len(items) >= k:
+                break
+            items.append(item)
+        return items
+
+
 def read_input(file_path: str):
     """
     Đọc file input.
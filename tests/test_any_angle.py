@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+import pytest
+
+from src import generators
+from src.a_star import a_star, backtrack_to_start
+from src.any_angle import LineOfSight, string_pull, theta_star
+from src.grid import CellGrid
+from src.search_state import SearchState
+from src.types import HeuristicType
+
+AREA = (0, 0, 700, 700)
+
+
+def brute_visible(walls: np.ndarray, a, b) -> bool:
+    """Bresenham theo sách trên mảng vật cản, kèm quy tắc hai ô kề góc."""
+
+    def free(x, y):
+        inside = 0 <= x < walls.shape[0] and 0 <= y < walls.shape[1]
+        return inside and not walls[x, y]
+
+    (x0, y0), (x1, y1) = sorted([a, b])
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx, sy = (1 if x1 > x0 else -1), (1 if y1 > y0 else -1)
+    error, x, y = dx + dy, x0, y0
+    while True:
+        if not free(x, y):
+            return False
+        if (x, y) == (x1, y1):
+            return True
+        step_x, step_y = 2 * error > dy, 2 * error < dx
+        if step_x and step_y and not (free(x + sx, y) and free(x, y + sy)):
+            return False
+        if step_x:
+            error, x = error + dy, x + sx
+        if step_y:
+            error, y = error + dx, y + sy
+
+
+def make_grid(seed, size=12, density=0.25) -> CellGrid:
+    walls = generators.random_fill(size, size, density, seed=seed)
+    start, end = generators.random_empty_cells(walls, 2, seed=seed)
+    return CellGrid(AREA, walls, start, end)
+
+
+def walls_of(grid: CellGrid) -> np.ndarray:
+    return grid.bitmap.to_walls()
+
+
+def grid_path(grid: CellGrid) -> list[tuple[int, int]]:
+    state = SearchState()
+    a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+    path = backtrack_to_start(state, grid.end)
+    return path if path[0] == grid.start else []
+
+
+def length(path) -> float:
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("use_bitmap", [False, True])
+def test_line_of_sight_matches_brute_force(use_bitmap):
+    grid = make_grid(seed=1, size=10)
+    walls = walls_of(grid)
+    los = LineOfSight(grid, grid.bitmap if use_bitmap else None)
+    cells = [(x, y) for x in range(10) for y in range(10)]
+    for a in cells:
+        for b in cells:
+            assert los(a, b) == brute_visible(walls, a, b), (a, b)
+
+
+def test_line_of_sight_cache_follows_map_edits():
+    grid = make_grid(seed=2)
+    grid.fill_rect(0, 5, 11, 5, False)
+    los = LineOfSight(grid, grid.bitmap)
+    assert los((0, 5), (11, 5))
+    grid.toggle((6, 5))
+    assert not los((0, 5), (11, 5))
+    grid.toggle((6, 5))
+    assert los((0, 5), (11, 5))
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_theta_star_paths_are_visible_and_short(lazy):
+    for seed in range(30):
+        grid = make_grid(seed)
+        walls = walls_of(grid)
+        reference = grid_path(grid)
+        path = theta_star(grid, lazy=lazy)
+        if not reference:
+            assert path == []
+            continue
+        assert path[0] == grid.start and path[-1] == grid.end
+        assert all(brute_visible(walls, a, b) for a, b in zip(path, path[1:]))
+        assert math.dist(grid.start, grid.end) <= length(path)
+        assert length(path) <= len(reference) - 1 + 1e-9
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_theta_star_wall_endpoints(lazy):
+    grid = make_grid(seed=3)
+    grid.toggle(grid.start)
+    assert theta_star(grid, lazy=lazy) == []
+    grid.toggle(grid.start)
+    grid.toggle(grid.end)
+    assert theta_star(grid, lazy=lazy) == []
+
+
+def test_string_pull_keeps_a_visible_subsequence():
+    for seed in range(30):
+        grid = make_grid(seed)
+        walls = walls_of(grid)
+        path = grid_path(grid)
+        pulled = string_pull(path, LineOfSight(grid))
+        assert pulled[:1] == path[:1] and pulled[-1:] == path[-1:]
+        indices = [path.index(pos) for pos in pulled]
+        assert indices == sorted(indices)
+        assert all(brute_visible(walls, a, b) for a, b in zip(pulled, pulled[1:]))
+        assert length(pulled) <= length(path) + 1e-9
@@ -0,0 +1,57 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from src.artifacts import ArtifactMismatchError, ArtifactStore, map_hash
+
+
+def build(walls: np.ndarray) -> dict[str, np.ndarray]:
+    return {"count": np.array([walls.sum()])}
+
+
+def make_store(tmp_path) -> ArtifactStore:
+    walls = np.zeros((8, 6), dtype=bool)
+    walls[2, 3] = True
+    return ArtifactStore(walls, root=str(tmp_path))
+
+
+def test_get_builds_once_and_loads_from_disk(tmp_path):
+    store = make_store(tmp_path)
+    assert store.get("count", build)["count"][0] == 1
+    reopened = ArtifactStore(store.walls.copy(), root=str(tmp_path))
+    assert reopened.has("count")
+    assert reopened.get("count", pytest.fail)["count"][0] == 1
+
+
+def test_load_rejects_walls_edited_in_place(tmp_path):
+    store = make_store(tmp_path)
+    store.get("count", build)
+    store.walls[0, 0] = True
+    with pytest.raises(ArtifactMismatchError):
+        store.load("count")
+    assert store.set_map(store.walls)
+    assert store.get("count", build)["count"][0] == 2
+
+
+def test_load_rejects_artifacts_copied_from_another_map(tmp_path):
+    store = make_store(tmp_path)
+    store.get("count", build)
+    other = store.walls.copy()
+    other[1, 1] = True
+    shutil.copytree(store.directory, tmp_path / map_hash(other))
+    with pytest.raises(ArtifactMismatchError):
+        ArtifactStore(other, root=str(tmp_path)).load("count")
+
+
+def test_get_follows_walls_edited_in_place(tmp_path):
+    store = make_store(tmp_path)
+    original = store.map_hash
+    assert store.get("count", build)["count"][0] == 1
+    store.walls[1, 1] = True
+    assert store.get("count", build)["count"][0] == 2
+    assert store.map_hash == map_hash(store.walls) != original
+
+    store.walls[1, 1] = False
+    assert store.get("count", pytest.fail)["count"][0] == 1
+    assert store.map_hash == original
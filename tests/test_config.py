@@ -0,0 +1,21 @@
+import pytest
+
+from src.config import BOARD_SIZE, MAX_GRID_SIZE, cell_size, load_config
+from src.events import cell_at
+
+
+def test_grid_size_is_limited_to_drawable_cells():
+    assert cell_size(MAX_GRID_SIZE) >= 1 > cell_size(MAX_GRID_SIZE + 1)
+    config = load_config(["--size", str(MAX_GRID_SIZE)], environ={})
+    assert config.grid_size == MAX_GRID_SIZE
+    with pytest.raises(ValueError):
+        load_config(["--size", str(MAX_GRID_SIZE + 1)], environ={})
+    with pytest.raises(ValueError):
+        load_config([], environ={"ASTAR_GRID_SIZE": "1"})
+
+
+@pytest.mark.parametrize("size", [2, 20, 30, 699, 700, 1000])
+def test_every_board_pixel_maps_to_a_cell(size):
+    cells = [cell_at((pixel, pixel), (size, size))[0] for pixel in range(BOARD_SIZE)]
+    assert cells[0] == 0 and cells[-1] == size - 1 - (size - 1) // BOARD_SIZE
+    assert len(set(cells)) == min(size, BOARD_SIZE)
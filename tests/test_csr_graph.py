@@ -0,0 +1,48 @@
+import numpy as np
+
+from src.csr_graph import CSRGraph, find_path
+from src.grid import CellGrid, grid_walls
+from src.map_generation import gen_grid_from_walls
+from src.snapshot import VersionedGrid
+
+AREA = (0, 0, 700, 700)
+
+WALLS = np.array(
+    [
+        [False, False, False, False],
+        [True, True, True, False],
+        [False, False, False, False],
+        [False, True, True, True],
+    ]
+)
+
+
+def make_grid(walls=WALLS, start=(0, 0), end=(3, 0)) -> CellGrid:
+    return CellGrid(AREA, gen_grid_from_walls(walls), start, end)
+
+
+def test_find_path_around_walls():
+    grid = make_grid()
+    path = find_path(CSRGraph.from_grid(grid), grid.start, grid.end)
+    assert path[0] == (0, 0) and path[-1] == (3, 0)
+    assert len(path) == 10
+    assert not any(WALLS[pos] for pos in path)
+
+
+def test_find_path_empty_when_endpoint_is_wall():
+    graph = CSRGraph.from_grid(make_grid())
+    assert find_path(graph, (0, 0), (1, 1)) == []
+    assert find_path(graph, (1, 0), (3, 0)) == []
+
+
+def test_find_path_empty_when_unreachable():
+    walls = np.zeros((3, 3), dtype=bool)
+    walls[1, :] = True
+    graph = CSRGraph.from_walls(walls)
+    assert find_path(graph, (0, 0), (2, 2)) == []
+
+
+def test_grid_walls_matches_every_grid_kind():
+    grid = make_grid()
+    assert np.array_equal(grid_walls(grid), WALLS)
+    assert np.array_equal(grid_walls(VersionedGrid.from_grid(grid).snapshot()), WALLS)
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from src import generators
+from src.csr_graph import CSRGraph, find_path
+from src.distance_matrix import DistanceMatrix
+from src.grid import CellGrid
+
+AREA = (0, 0, 700, 700)
+
+
+def make_case():
+    walls = generators.random_fill(18, 14, 0.25, seed=5)
+    # POI cuối cùng bị vây kín nên không tới được từ các POI khác
+    walls[0:3, 0:3] = True
+    pois = generators.random_empty_cells(walls, 6, seed=5)
+    walls[1, 1] = False
+    pois.append((1, 1))
+    return CellGrid(AREA, walls, pois[0], pois[1]), pois
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_costs_match_find_path(workers):
+    grid, pois = make_case()
+    graph = CSRGraph.from_grid(grid)
+    matrix = DistanceMatrix.from_grid(grid, pois, workers=workers, with_paths=True)
+    assert matrix.costs.shape == (len(pois), len(pois))
+    for i, a in enumerate(pois):
+        for j, b in enumerate(pois):
+            reference = find_path(graph, a, b)
+            if not reference:
+                assert matrix.costs[i, j] == math.inf
+                assert matrix.path(i, j) == []
+                continue
+            assert matrix.costs[i, j] == len(reference) - 1
+            path = matrix.path(i, j)
+            assert path[0] == a and path[-1] == b
+            assert len(path) == len(reference)
+            for (x0, y0), (x1, y1) in zip(path, path[1:]):
+                assert abs(x1 - x0) + abs(y1 - y0) == 1
+    assert math.isinf(matrix.costs[0, -1]) and matrix.costs[-1, -1] == 0
+
+
+def test_path_needs_with_paths():
+    grid, pois = make_case()
+    matrix = DistanceMatrix.from_grid(grid, pois[:2], workers=1)
+    with pytest.raises(ValueError):
+        matrix.path(0, 1)
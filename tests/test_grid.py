@@ -0,0 +1,64 @@
+import numpy as np
+
+from src import generators
+from src.grid import CellGrid, grid_walls
+from src.map_generation import gen_grid_from_walls
+from src.types import CellMark, CellType
+
+AREA = (0, 0, 700, 700)
+
+
+def make_grid(size=16, seed=0) -> CellGrid:
+    walls = generators.random_fill(size, size, 0.3, seed=seed)
+    walls[0, 0] = walls[-1, -1] = False
+    return CellGrid(AREA, gen_grid_from_walls(walls), (0, 0), (size - 1, size - 1))
+
+
+def test_cells_and_wall_array_build_the_same_grid():
+    walls = generators.random_fill(70, 9, 0.3, seed=1)
+    from_cells = CellGrid(AREA, gen_grid_from_walls(walls), (0, 0), (1, 1))
+    from_array = CellGrid(AREA, walls, (0, 0), (1, 1))
+    assert from_cells.get_size() == from_array.get_size() == (70, 9)
+    assert np.array_equal(grid_walls(from_cells), walls)
+    assert np.array_equal(grid_walls(from_array), walls)
+
+
+def test_neighbors_are_read_from_bitmap():
+    grid = make_grid()
+    walls = grid_walls(grid)
+    width, height = grid.get_size()
+    for x in range(width):
+        for y in range(height):
+            offsets = (
+                [(0, -1), (-1, 0), (0, 1), (1, 0)]
+                if (x + y) % 2
+                else [(1, 0), (0, 1), (-1, 0), (0, -1)]
+            )
+            expected = [
+                (x + dx, y + dy)
+                for dx, dy in offsets
+                if 0 <= x + dx < width
+                and 0 <= y + dy < height
+                and not walls[x + dx, y + dy]
+            ]
+            assert [cell.pos for cell in grid.get_neighbors((x, y))] == expected
+
+
+def test_toggle_updates_cells_and_listeners():
+    grid = make_grid()
+    seen = []
+    grid.listeners.append(seen.append)
+    before = grid.at((3, 4)).type
+    grid.toggle((3, 4))
+    assert grid.at((3, 4)).type != before
+    assert grid.is_wall((3, 4)) == (before == CellType.Empty)
+    assert seen == [(3, 4)] and grid.version == 1
+
+
+def test_marks_follow_start_and_end():
+    grid = make_grid()
+    assert grid.get_start().mark == CellMark.Start
+    grid.set_start((5, 5))
+    assert grid.at((0, 0)).mark == CellMark.No
+    assert grid.at((5, 5)).mark == CellMark.Start
+    assert grid.get_end().mark == CellMark.End
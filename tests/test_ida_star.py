@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src import generators
+from src.a_star import a_star, backtrack_to_start
+from src.grid import CellGrid
+from src.ida_star import ida_star
+from src.search_state import SearchState
+from src.types import HeuristicType
+
+AREA = (0, 0, 700, 700)
+
+
+def a_star_length(grid: CellGrid, heuristic_type: HeuristicType) -> int:
+    state = SearchState()
+    a_star(grid, 10**9, None, heuristic_type, state)
+    path = backtrack_to_start(state, grid.end)
+    return len(path) if path[0] == grid.start else 0
+
+
+@pytest.mark.parametrize("node_budget", [4, 64, 20_000])
+@pytest.mark.parametrize(
+    "heuristic_type", [HeuristicType.MANHATTAN, HeuristicType.EUCLIDEAN]
+)
+def test_paths_are_optimal_for_any_budget(node_budget, heuristic_type):
+    for seed in range(100):
+        size = 5 + seed % 8
+        walls = generators.random_fill(size, size, 0.3, seed=seed)
+        start, end = generators.random_empty_cells(walls, 2, seed=seed)
+        grid = CellGrid(AREA, walls, start, end)
+        expected = a_star_length(grid, heuristic_type)
+        if not expected:
+            continue  # Không có đường đi: IDA* rất chậm, không cần kiểm tra ở đây
+        path = ida_star(grid, heuristic_type, node_budget)
+        assert len(path) == expected, f"seed {seed}"
+        assert path[0] == start and path[-1] == end
+        for a, b in zip(path, path[1:]):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and not walls[b]
+
+
+def test_unreachable_goal_returns_empty_path():
+    walls = np.zeros((5, 5), dtype=bool)
+    walls[2, :] = True
+    grid = CellGrid(AREA, walls, (0, 0), (4, 4))
+    assert ida_star(grid) == []
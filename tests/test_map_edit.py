@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.grid import CellGrid, grid_walls
+from src.map_edit import ChangeSet, cells_mask, polygon_mask, rect_mask
+
+AREA = (0, 0, 700, 700)
+
+
+def test_rect_mask_is_inclusive_and_clipped():
+    mask = rect_mask((6, 5), -2, 1, 2, 9)
+    expected = np.zeros((6, 5), dtype=bool)
+    expected[0:3, 1:5] = True
+    assert np.array_equal(mask, expected)
+    assert not rect_mask((6, 5), -4, -4, -1, -1).any()
+
+
+def test_cells_mask_rejects_positions_outside_the_grid():
+    mask = cells_mask((4, 3), [(0, 0), (3, 2), (0, 0)])
+    assert sorted(map(tuple, np.argwhere(mask).tolist())) == [(0, 0), (3, 2)]
+    with pytest.raises(ValueError):
+        cells_mask((4, 3), [(4, 0)])
+    with pytest.raises(ValueError):
+        cells_mask((4, 3), [(0, -1)])
+
+
+def test_polygon_mask_matches_point_in_polygon():
+    vertices = [(1.5, 0.5), (8.5, 2.5), (6.5, 8.5), (4.0, 4.0), (0.5, 6.5)]
+    mask = polygon_mask((10, 10), vertices)
+    for x in range(10):
+        for y in range(10):
+            inside = False
+            for (ax, ay), (bx, by) in zip(vertices, vertices[1:] + vertices[:1]):
+                if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+                    inside = not inside
+            assert mask[x, y] == inside
+    with pytest.raises(ValueError):
+        polygon_mask((10, 10), [(0, 0), (1, 1)])
+    assert not polygon_mask((10, 10), [(20, 20), (30, 20), (25, 30)]).any()
+
+
+def test_change_set_bounds_and_iteration():
+    positions = np.array([[4, 1], [2, 7], [3, 3]], dtype=np.int64)
+    changes = ChangeSet(positions, np.ones(3, dtype=bool), 5)
+    assert changes.bounds() == (2, 1, 4, 7)
+    assert list(changes) == [(4, 1), (2, 7), (3, 3)]
+    assert (
+        ChangeSet(np.empty((0, 2), dtype=np.int64), np.empty(0, bool), 0).bounds()
+        is None
+    )
+
+
+def test_apply_mask_reports_only_changed_cells_and_keeps_endpoints():
+    walls = np.zeros((8, 8), dtype=bool)
+    walls[2, 2] = True
+    grid = CellGrid(AREA, walls, (1, 1), (6, 6))
+    received = []
+    grid.change_listeners.append(received.append)
+
+    changes = grid.fill_rect(0, 0, 7, 2, True)
+    assert grid.version == 1 and received == [changes]
+    assert (1, 1) not in set(changes) and (2, 2) not in set(changes)
+    assert len(changes) == 8 * 3 - 2 and changes.walls.all()
+    assert not grid.is_wall((1, 1))
+
+    unchanged = grid.fill_rect(0, 0, 7, 2, True)
+    assert len(unchanged) == 0 and grid.version == 1 and len(received) == 1
+
+    with pytest.raises(ValueError):
+        grid.apply_mask(np.zeros((7, 8), dtype=bool), True)
+    expected = walls.copy()
+    expected[:, 0:3] = True
+    expected[1, 1] = False
+    assert np.array_equal(grid_walls(grid), expected)
@@ -0,0 +1,51 @@
+import pytest
+
+from src import generators
+from src.grid import CellGrid
+from src.map_generation import gen_grid_from_walls
+from src.multi_agent import ReservationTable, find_conflicts, plan_paths
+
+AREA = (0, 0, 700, 700)
+
+
+@pytest.mark.parametrize("window", [2, 4, 8])
+def test_random_maps_have_no_conflicts(window):
+    for seed in range(200):
+        walls = generators.random_fill(8, 8, 0.25, seed=seed)
+        cells = generators.random_empty_cells(walls, 10, seed=seed)
+        grid = CellGrid(AREA, gen_grid_from_walls(walls), cells[0], cells[1])
+        paths = plan_paths(grid, list(zip(cells[:5], cells[5:])), window=window)
+        assert find_conflicts(paths) == [], f"seed {seed}"
+        assert len({len(path) for path in paths}) == 1
+
+
+def test_corridor_swap_reaches_goals():
+    walls = generators.random_fill(5, 3, 0.0, seed=0)
+    walls[:, 0] = walls[:, 2] = True
+    walls[2, 2] = False  # Hốc để một tác tử tránh đường
+    grid = CellGrid(AREA, gen_grid_from_walls(walls), (0, 1), (4, 1))
+    agents = [((0, 1), (4, 1)), ((4, 1), (0, 1))]
+    paths = plan_paths(grid, agents, window=8)
+    assert find_conflicts(paths) == []
+    assert [path[-1] for path in paths] == [(4, 1), (0, 1)]
+
+
+def test_release_keeps_other_agents_reservations():
+    table = ReservationTable(4, 4)
+    table.reserve(0, [(0, 0), (1, 0), (2, 0)], 0)
+    table.reserve(1, [(3, 3), (3, 2), (3, 1)], 0)
+    table.release(0)
+    assert table.is_free((0, 0), (1, 0), 1, agent=2)
+    assert not table.is_free((3, 3), (3, 2), 1, agent=2)
+    assert table.is_free((3, 3), (3, 2), 1, agent=1)
+    assert 0 not in table.owned and 1 in table.owned
+
+
+def test_invalid_agents_are_rejected():
+    walls = generators.random_fill(4, 4, 0.0, seed=0)
+    walls[1, 1] = True
+    grid = CellGrid(AREA, gen_grid_from_walls(walls), (0, 0), (3, 3))
+    with pytest.raises(ValueError):
+        plan_paths(grid, [((1, 1), (3, 3))])
+    with pytest.raises(ValueError):
+        plan_paths(grid, [((0, 0), (3, 3)), ((0, 1), (3, 3))])
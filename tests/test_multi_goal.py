@@ -0,0 +1,70 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src import generators
+from src.grid import CellGrid
+from src.multi_goal import nearest_targets
+from src.types import HeuristicType
+
+AREA = (0, 0, 700, 700)
+
+
+def bfs_distances(walls: np.ndarray, start) -> dict[tuple[int, int], int]:
+    width, height = walls.shape
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < width and 0 <= ny < height and not walls[nx, ny]:
+                if (nx, ny) not in distances:
+                    distances[nx, ny] = distances[x, y] + 1
+                    queue.append((nx, ny))
+    return distances
+
+
+def make_case(seed):
+    walls = generators.random_fill(20, 16, 0.25, seed=seed)
+    # Một đích bị vây kín để luôn có đích không tới được
+    walls[0:3, 0:3] = True
+    start, *targets = generators.random_empty_cells(walls, 7, seed=seed)
+    walls[1, 1] = False
+    targets.append((1, 1))
+    return CellGrid(AREA, walls, start, start), walls, start, targets
+
+
+@pytest.mark.parametrize(
+    "heuristic_type", [HeuristicType.MANHATTAN, HeuristicType.EUCLIDEAN]
+)
+def test_targets_come_out_in_bfs_order(heuristic_type):
+    for seed in range(20):
+        grid, walls, start, targets = make_case(seed)
+        distances = bfs_distances(walls, start)
+        reachable = sorted(distances[t] for t in targets if t in distances)
+
+        found = nearest_targets(
+            grid, targets, k=len(targets), source=start, heuristic_type=heuristic_type
+        )
+        assert [steps for _, steps, _ in found] == reachable
+        assert (1, 1) not in [target for target, _, _ in found]
+        for target, steps, path in found:
+            assert steps == distances[target] == len(path) - 1
+            assert path[0] == start and path[-1] == target
+            assert not any(walls[pos] for pos in path)
+            for (x0, y0), (x1, y1) in zip(path, path[1:]):
+                assert abs(x1 - x0) + abs(y1 - y0) == 1
+
+        nearest = nearest_targets(
+            grid, targets, source=start, heuristic_type=heuristic_type
+        )
+        if reachable:
+            assert len(nearest) == 1 and nearest[0][1] == reachable[0]
+        else:
+            assert nearest == []
+
+
+def test_only_unreachable_targets():
+    grid, walls, start, _ = make_case(seed=1)
+    assert nearest_targets(grid, [(1, 1)], k=3, source=start) == []
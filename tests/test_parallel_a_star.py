@@ -0,0 +1,54 @@
+import pytest
+
+from src import generators
+from src.a_star import a_star, backtrack_to_start
+from src.grid import CellGrid
+from src.parallel_a_star import hda_star, parallel_a_star
+from src.search_state import SearchState
+from src.types import HeuristicType
+
+AREA = (0, 0, 700, 700)
+
+
+def a_star_cost(walls, start, end) -> int:
+    grid = CellGrid(AREA, walls, start, end)
+    state = SearchState()
+    a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+    path = backtrack_to_start(state, end)
+    return len(path) - 1 if path[0] == start else -1
+
+
+def check_path(walls, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and not walls[b]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_costs_match_a_star(workers):
+    for seed in range(4):
+        walls = generators.random_fill(20, 16, 0.3, seed=seed)
+        start, end = generators.random_empty_cells(walls, 2, seed=seed)
+        expected = a_star_cost(walls, start, end)
+        path = hda_star(walls, start, end, workers, block=2)
+        if expected < 0:
+            assert path == []
+        else:
+            check_path(walls, path, start, end)
+            assert len(path) - 1 == expected
+
+
+def test_unreachable_goal():
+    walls = generators.random_fill(12, 12, 0.0, seed=0)
+    walls[8:11, 8] = walls[8:11, 10] = walls[8, 8:11] = walls[10, 8:11] = True
+    assert a_star_cost(walls, (0, 0), (9, 9)) == -1
+    assert hda_star(walls, (0, 0), (9, 9), workers=2) == []
+
+
+def test_wall_endpoints_return_empty_path():
+    walls = generators.random_fill(10, 10, 0.0, seed=0)
+    walls[0, 0] = True
+    assert hda_star(walls, (0, 0), (9, 9), workers=2) == []
+    assert hda_star(walls, (9, 9), (0, 0), workers=2) == []
+    grid = CellGrid(AREA, walls, (0, 0), (5, 5))
+    assert parallel_a_star(grid, workers=2) == []
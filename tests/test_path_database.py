@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src import generators
+from src.a_star import a_star, backtrack_to_start
+from src.artifacts import ArtifactStore
+from src.grid import CellGrid
+from src.path_database import PathDatabase
+from src.search_state import SearchState
+from src.types import HeuristicType
+
+AREA = (0, 0, 700, 700)
+
+
+def reference_length(walls: np.ndarray, start, end) -> int | None:
+    """Số bước của đường đi A* tối ưu, None nếu không tới được."""
+    grid = CellGrid(AREA, walls, start, end)
+    state = SearchState()
+    a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+    path = backtrack_to_start(state, end)
+    return len(path) - 1 if path[0] == start else None
+
+
+def assert_valid(walls: np.ndarray, path, start, end):
+    assert path[0] == start and path[-1] == end
+    assert not any(walls[pos] for pos in path)
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+
+
+@pytest.fixture(scope="module")
+def walls() -> np.ndarray:
+    return generators.random_fill(16, 12, 0.3, seed=7)
+
+
+def test_paths_match_a_star(walls):
+    database = PathDatabase.build(walls, workers=1)
+    pairs = [generators.random_empty_cells(walls, 2, seed=seed) for seed in range(60)]
+    assert any(reference_length(walls, *pair) is None for pair in pairs)
+    for start, end in pairs:
+        expected = reference_length(walls, start, end)
+        path = database.path(start, end)
+        if expected is None:
+            assert path == []
+        else:
+            assert_valid(walls, path, start, end)
+            assert len(path) - 1 == expected
+
+
+def test_parallel_build_matches_serial(walls):
+    serial = PathDatabase.build(walls, workers=1).to_arrays()
+    parallel = PathDatabase.build(walls, workers=2).to_arrays()
+    for key, array in serial.items():
+        np.testing.assert_array_equal(parallel[key], array)
+
+
+def test_from_store_round_trip(walls, tmp_path, monkeypatch):
+    built = PathDatabase.from_store(ArtifactStore(walls, root=str(tmp_path)))
+    reopened = ArtifactStore(walls.copy(), root=str(tmp_path))
+    assert reopened.has("cpd")
+    monkeypatch.setattr(PathDatabase, "build", pytest.fail)
+    loaded = PathDatabase.from_store(reopened)
+    assert loaded.shape == built.shape == walls.shape
+    for key, array in built.to_arrays().items():
+        np.testing.assert_array_equal(loaded.to_arrays()[key], array)
+    start, end = generators.random_empty_cells(walls, 2, seed=3)
+    assert loaded.path(start, end) == built.path(start, end)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src import generators, portfolio
+from src.a_star import a_star, backtrack_to_start
+from src.grid import CellGrid
+from src.portfolio import (
+    DEFAULT_PORTFOLIO,
+    PortfolioLog,
+    PortfolioResult,
+    portfolio_solve,
+    solve_with,
+)
+from src.search_state import SearchState
+from src.types import HeuristicType, Optimality
+
+AREA = (0, 0, 700, 700)
+ENGINES = ("csr", "a_star", "ida_star")
+
+
+def make_grid(seed=0, size=24) -> CellGrid:
+    walls = generators.random_fill(size, size, 0.25, seed=seed)
+    start, end = generators.random_empty_cells(walls, 2, seed=seed)
+    return CellGrid(AREA, walls, start, end)
+
+
+def shortest(grid: CellGrid) -> int:
+    state = SearchState()
+    a_star(grid, 10**9, None, HeuristicType.MANHATTAN, state)
+    path = backtrack_to_start(state, grid.end)
+    return len(path) if path[0] == grid.start else 0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_agree_on_blocked_endpoints(engine):
+    grid = make_grid()
+    expected = shortest(grid)
+    assert expected
+    assert len(solve_with(grid, engine, HeuristicType.MANHATTAN)) == expected
+    grid.toggle(grid.start)
+    assert solve_with(grid, engine, HeuristicType.MANHATTAN) == []
+    grid.toggle(grid.start)
+    grid.toggle(grid.end)
+    assert solve_with(grid, engine, HeuristicType.MANHATTAN) == []
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        solve_with(make_grid(), "dijkstra", HeuristicType.MANHATTAN)
+
+
+def test_portfolio_returns_an_optimal_path_and_logs_the_winner():
+    log = PortfolioLog(path=None)
+    for seed in range(3):
+        grid = make_grid(seed)
+        result = portfolio_solve(grid, log=log, timeout=60)
+        assert len(result.path) == shortest(grid)
+        assert (result.engine, result.heuristic_type) in DEFAULT_PORTFOLIO
+        assert portfolio.is_optimal(result.heuristic_type)
+    assert sum(sum(wins.values()) for wins in log.wins.values()) == 3
+
+
+def test_optimality_filter():
+    grid = make_grid()
+    combined = (("a_star", HeuristicType.COMBINED),)
+    with pytest.raises(ValueError):
+        portfolio_solve(grid, Optimality.OPTIMAL, combined)
+    result = portfolio_solve(grid, Optimality.ANY, combined, timeout=60)
+    assert result.heuristic_type == HeuristicType.COMBINED
+    assert result.path[0] == grid.start and result.path[-1] == grid.end
+
+
+def test_blocked_endpoint_returns_without_starting_processes(monkeypatch):
+    grid = make_grid()
+    grid.toggle(grid.end)
+    monkeypatch.setattr(portfolio.mp, "Process", pytest.fail)
+    log = PortfolioLog(path=None)
+    result = portfolio_solve(grid, log=log)
+    assert result.path == [] and not log.wins
+
+
+def test_log_prefers_the_most_frequent_winner(tmp_path):
+    path = str(tmp_path / "portfolio.jsonl")
+    walls, other = np.zeros((4, 4), dtype=bool), np.ones((4, 4), dtype=bool)
+    log = PortfolioLog(path)
+    assert log.preferred(walls) is None
+    for engine, heuristic in (
+        ("csr", HeuristicType.MANHATTAN),
+        ("a_star", HeuristicType.COMBINED),
+        ("a_star", HeuristicType.COMBINED),
+    ):
+        log.record(walls, PortfolioResult([], engine, heuristic, 0.1))
+    log.record(other, PortfolioResult([], "ida_star", HeuristicType.MANHATTAN, 0.1))
+
+    for loaded in (log, PortfolioLog(path)):
+        assert loaded.preferred(walls) == ("a_star", HeuristicType.COMBINED)
+        assert loaded.preferred(other) == ("ida_star", HeuristicType.MANHATTAN)
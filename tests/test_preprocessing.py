@@ -0,0 +1,90 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from src import generators
+from src.grid import CellGrid, grid_walls
+from src.map_edit import polygon_mask
+from src.preprocessing import (
+    DeadEndPruning,
+    PrunedGrid,
+    RectangularSymmetryReduction,
+)
+
+AREA = (0, 0, 700, 700)
+
+
+def distance(grid, start, goal) -> int:
+    seen = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        pos = frontier.popleft()
+        if pos == goal:
+            return seen[pos]
+        for cell in grid.get_neighbors(pos):
+            if cell.pos not in seen:
+                seen[cell.pos] = seen[pos] + 1
+                frontier.append(cell.pos)
+    return -1
+
+
+def test_incremental_update_keeps_shortest_paths():
+    size = 40
+    walls = generators.GENERATORS["rooms"](size, size, seed=3)
+    grid = CellGrid(AREA, walls, (0, 0), (size - 1, size - 1))
+    pruning = DeadEndPruning(grid)
+    pruning.build()
+    rng = random.Random(0)
+    pruned = 0
+    for step in range(60):
+        if step % 3:
+            grid.toggle((rng.randrange(1, size - 1), rng.randrange(1, size - 1)))
+        else:
+            x, y = rng.randrange(size - 4), rng.randrange(size - 4)
+            grid.fill_rect(x, y, x + rng.randrange(4), y + rng.randrange(4), step % 2)
+        pruning.update()
+
+        free = [tuple(pos) for pos in np.argwhere(~grid_walls(grid)).tolist()]
+        assert sorted(pruning.tin) == free
+        for _ in range(10):
+            start, goal = rng.sample(free, 2)
+            grid.set_start(start)
+            grid.set_end(goal)
+            pruned += sum(pruning.is_pruned(pos, start, goal) for pos in free)
+            expected = distance(grid, start, goal)
+            assert distance(PrunedGrid(grid, pruning), start, goal) == expected
+    assert pruned > 0
+
+
+def test_rectangles_follow_bulk_edits():
+    size = 32
+    walls = generators.GENERATORS["cave"](size, size, seed=5)
+    grid = CellGrid(AREA, walls, (0, 0), (size - 1, size - 1))
+    reduction = RectangularSymmetryReduction(grid)
+    rng = random.Random(1)
+    for step in range(45):
+        x, y = rng.randrange(size - 6), rng.randrange(size - 6)
+        is_wall = bool(rng.randrange(2))
+        if step % 3 == 0:
+            grid.toggle((x, y))
+        elif step % 3 == 1:
+            grid.fill_rect(x, y, x + rng.randrange(6), y + rng.randrange(6), is_wall)
+        else:
+            triangle = [(x, y), (x + 6, y + 1), (x + 2, y + 6)]
+            grid.apply_mask(polygon_mask((size, size), triangle), is_wall)
+
+        free = {tuple(pos) for pos in np.argwhere(~grid_walls(grid)).tolist()}
+        assert set(reduction.rect_of) == free
+        for index in set(reduction.rect_of.values()):
+            x0, y0, x1, y1 = reduction.rects[index]
+            cells = {(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)}
+            assert cells <= free
+            assert all(reduction.rect_of[pos] == index for pos in cells)
+
+        for _ in range(10):
+            start, goal = rng.sample(sorted(free), 2)
+            cost, path = reduction.search(start, goal)
+            assert cost == distance(grid, start, goal)
+            if cost >= 0:
+                assert len(path) == cost + 1 and set(path) <= free
@@ -0,0 +1,52 @@
+import pytest
+
+from src import generators
+from src.a_star import a_star
+from src.grid import CellGrid
+from src.render import record_search
+from src.search_state import SearchState
+from src.types import HeuristicType
+
+AREA = (0, 0, 700, 700)
+
+
+class NullLogger:
+    def update(self, *args):
+        pass
+
+
+def snapshot(state: SearchState):
+    return (
+        dict(state.cost),
+        dict(state.heuristic),
+        dict(state.path_from),
+        state.current,
+        state.next,
+    )
+
+
+@pytest.mark.parametrize(
+    "heuristic_type", [HeuristicType.MANHATTAN, HeuristicType.EUCLIDEAN]
+)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_trace_matches_a_star_at_every_step(seed, heuristic_type):
+    walls = generators.random_fill(24, 24, 0.3, seed=seed)
+    start, end = generators.random_empty_cells(walls, 2, seed=seed)
+    grid = CellGrid(AREA, walls, start, end)
+    trace = record_search(grid, heuristic_type)
+    assert trace.max_steps == a_star(grid, 10**9, None, heuristic_type)
+
+    replayed = SearchState()
+    previous = -1
+    for step in range(trace.max_steps + 1):
+        expected = SearchState()
+        a_star(grid, step, NullLogger(), heuristic_type, expected)
+        # Áp dụng từng đoạn nối tiếp, như một tiến trình vẽ
+        trace.apply(replayed, previous + 1, step)
+        previous = step
+        assert snapshot(replayed) == snapshot(expected), step
+
+        # Và từ đầu cho một trạng thái mới
+        fresh = SearchState()
+        trace.apply(fresh, 0, step)
+        assert snapshot(fresh) == snapshot(expected), step
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.service import (
+    HEADER,
+    MAX_MESSAGE_SIZE,
+    PathService,
+    _solve_batch,
+    read_message,
+)
+
+
+def run_session(tmp_path, exchange, service=None):
+    """Chạy `exchange(reader, writer)` trên một kết nối thô tới dịch vụ."""
+
+    async def main():
+        nonlocal service
+        service = service or PathService(executor=ThreadPoolExecutor(1))
+        socket_path = str(tmp_path / "service.sock")
+        await service.start(socket_path)
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        try:
+            return await asyncio.wait_for(exchange(reader, writer), 10)
+        finally:
+            writer.close()
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def frame(body: bytes) -> bytes:
+    return HEADER.pack(len(body)) + body
+
+
+def test_malformed_message_gets_error_and_connection_stays_open(tmp_path):
+    async def exchange(reader, writer):
+        writer.write(frame(b"{not json") + frame(b"[1, 2]"))
+        writer.write(frame(json.dumps({"op": "stats"}).encode()))
+        return [await read_message(reader) for _ in range(3)]
+
+    bad_json, not_object, stats = run_session(tmp_path, exchange)
+    assert not bad_json["ok"] and "Malformed" in bad_json["error"]
+    assert not not_object["ok"]
+    assert stats["ok"] and stats["requests"] == 0
+
+
+def test_oversize_message_gets_error_and_connection_closes(tmp_path):
+    async def exchange(reader, writer):
+        writer.write(HEADER.pack(MAX_MESSAGE_SIZE + 1) + b"{}")
+        return await read_message(reader), await read_message(reader)
+
+    reply, after = run_session(tmp_path, exchange)
+    assert not reply["ok"] and "too large" in reply["error"]
+    assert after is None
+
+
+def test_unexpected_handler_error_does_not_stop_responses(tmp_path):
+    service = PathService(executor=ThreadPoolExecutor(1))
+    handle = service.handle
+
+    async def flaky_handle(request):
+        if request["op"] == "boom":
+            raise RuntimeError("boom")
+        return await handle(request)
+
+    service.handle = flaky_handle
+
+    async def exchange(reader, writer):
+        for op in ("boom", "stats"):
+            writer.write(frame(json.dumps({"op": op}).encode()))
+        return [await read_message(reader) for _ in range(2)]
+
+    boom, stats = run_session(tmp_path, exchange, service)
+    assert not boom["ok"] and "RuntimeError" in boom["error"]
+    assert stats["ok"]
+
+
+def test_reloaded_map_is_not_served_from_a_stale_worker_grid(tmp_path):
+    async def exchange(reader, writer):
+        replies = []
+        for request in (
+            {"op": "load_map", "map": "m", "walls": [[0] * 3] * 3},
+            {"op": "path", "map": "m", "start": [0, 0], "goal": [2, 2]},
+            {"op": "unload_map", "map": "m"},
+            {"op": "load_map", "map": "m", "walls": [[0, 0, 0], [1, 1, 1], [0, 0, 0]]},
+            {"op": "path", "map": "m", "start": [0, 0], "goal": [2, 2]},
+            {"op": "path", "map": "m", "start": [0, 0], "goal": [0, 2]},
+        ):
+            writer.write(frame(json.dumps(request).encode()))
+            replies.append(await read_message(reader))
+        return replies
+
+    replies = run_session(tmp_path, exchange)
+    assert all(reply["ok"] for reply in replies)
+    assert replies[1]["results"][0]["cost"] == 4
+    assert replies[4]["results"] == []
+    assert replies[5]["results"][0]["path"] == [[0, 0], [0, 1], [0, 2]]
+
+
+def test_worker_asks_for_walls_it_does_not_have():
+    walls = np.zeros((4, 4), dtype=bool)
+    queries = [((0, 0), [(3, 3)], 1)]
+    assert _solve_batch("unshipped", 10**9, walls.shape, None, queries) is None
+    packed = np.packbits(walls).tobytes()
+    found = _solve_batch("unshipped", 10**9, walls.shape, packed, queries)
+    assert found[0][0][1] == 6
+    assert _solve_batch("unshipped", 10**9, walls.shape, None, queries) == found
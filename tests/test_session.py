@@ -0,0 +1,103 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+import pytest
+
+import src.game
+from src.artifacts import map_hash
+from src.config import BOARD_SIZE, load_config
+from src.grid import grid_walls
+from src.session import read_session, replay_session
+
+SIZE = 30
+
+
+def final_state(game) -> tuple:
+    return (
+        map_hash(grid_walls(game.grid)),
+        game.grid.start,
+        game.grid.end,
+        game.heuristic,
+        game.step,
+        game.path,
+    )
+
+
+def post(event_type, **attributes):
+    pg.event.post(pg.event.Event(event_type, **attributes))
+
+
+def play_script(game):
+    """Một phiên ngắn: bước tiếp, vẽ vật cản, đổi hàm lượng giá, reset, kéo ô bắt đầu."""
+    cell = BOARD_SIZE // SIZE
+    game.run_frame()
+    for _ in range(5):
+        post(pg.KEYDOWN, key=pg.K_RIGHT)
+        game.run_frame()
+
+    post(pg.MOUSEBUTTONDOWN, pos=(3 * cell, 8 * cell), button=1)
+    game.run_frame()
+    for x in range(3, 25):
+        post(pg.MOUSEMOTION, pos=(x * cell, 8 * cell), rel=(1, 0), buttons=(1, 0, 0))
+        game.run_frame()
+    post(pg.MOUSEBUTTONUP, pos=(0, 0), button=1)
+    game.run_frame()
+
+    post(pg.KEYDOWN, key=pg.K_h)
+    game.run_frame()
+    post(pg.KEYDOWN, key=pg.K_r)
+    game.run_frame()
+
+    x, y = game.grid.start
+    post(pg.MOUSEBUTTONDOWN, pos=(x * cell + 1, y * cell + 1), button=1)
+    game.run_frame()
+    for dx in range(1, 6):
+        target = ((x + dx) % SIZE * cell + 1, y * cell + 1)
+        post(pg.MOUSEMOTION, pos=target, rel=(1, 0), buttons=(1, 0, 0))
+        game.run_frame()
+    post(pg.MOUSEBUTTONUP, pos=(0, 0), button=1)
+    game.run_frame()
+
+    for _ in range(20):
+        post(pg.KEYDOWN, key=pg.K_RIGHT)
+        game.run_frame()
+
+
+@pytest.fixture
+def display():
+    pg.display.init()
+    pg.font.init()
+    yield
+    pg.quit()
+
+
+def test_replay_reproduces_recorded_session(tmp_path, monkeypatch, display):
+    path = str(tmp_path / "scripted.session")
+    game = src.game.Game(load_config(["--auto", "--size", str(SIZE), "--record", path]))
+    initial = map_hash(grid_walls(game.grid))
+    play_script(game)
+    frames = game.recorder.frames
+    game.close_recording()
+    recorded = final_state(game)
+    assert recorded[0] != initial and recorded[3] != game.config.heuristic
+
+    header, stored = read_session(path)
+    assert len(stored) == frames
+    assert header["grid_size"] == SIZE
+
+    replayed = []
+    run_frame = src.game.Game.run_frame
+
+    def capture(self):
+        if not replayed:
+            replayed.append(self)
+        run_frame(self)
+
+    monkeypatch.setattr(src.game.Game, "run_frame", capture)
+    report = tmp_path / "report.json"
+    summary = replay_session(path, str(report))
+    assert summary["frames"] == frames
+    assert report.exists()
+    assert final_state(replayed[0]) == recorded
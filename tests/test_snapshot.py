@@ -0,0 +1,38 @@
+import numpy as np
+
+from src import generators
+from src.grid import CellGrid, grid_walls
+from src.snapshot import VersionedGrid
+
+AREA = (0, 0, 700, 700)
+
+
+def make_grid(size=40) -> CellGrid:
+    walls = generators.random_fill(size, size, 0.3, seed=2)
+    walls[0, 0] = walls[-1, -1] = False
+    return CellGrid(AREA, walls, (0, 0), (size - 1, size - 1))
+
+
+def test_versions_follow_map_edits():
+    grid = make_grid()
+    versioned = VersionedGrid.from_grid(grid, chunk_size=16)
+    first = versioned.snapshot()
+    grid.toggle((3, 4))
+    grid.fill_rect(10, 10, 20, 12, True)
+    assert versioned.current.version == 2
+    assert np.array_equal(versioned.current.walls(), grid_walls(grid))
+    assert first.is_wall((3, 4)) != versioned.current.is_wall((3, 4))
+
+
+def test_versions_follow_marker_moves():
+    grid = make_grid()
+    versioned = VersionedGrid.from_grid(grid, chunk_size=16)
+    first = versioned.snapshot()
+    grid.set_start((5, 6))
+    grid.set_end((7, 8))
+    grid.set_end((7, 8))  # Không di chuyển: không có phiên bản mới
+    current = versioned.snapshot()
+    assert current.version == 2
+    assert (current.start, current.end) == ((5, 6), (7, 8))
+    assert (first.start, first.end) == ((0, 0), (39, 39))
+    assert current.chunks == first.chunks
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.map_edit import rect_mask
+from src.sparse_grid import SparseGrid
+
+
+def _walls(grid: SparseGrid) -> np.ndarray:
+    return np.array(
+        [[grid.is_wall((x, y)) for y in range(grid.height)] for x in range(grid.width)]
+    )
+
+
+@pytest.mark.parametrize("max_resident", [None, 1])
+def test_fill_rect_notifies_changed_cells(tmp_path, max_resident):
+    rng = np.random.default_rng(0)
+    grid = SparseGrid(
+        37, 29, chunk_size=8, max_resident=max_resident, page_dir=str(tmp_path)
+    )
+    expected = np.zeros((37, 29), dtype=bool)
+    for _ in range(200):
+        x0, x1 = sorted(rng.integers(-3, 40, 2).tolist())
+        y0, y1 = sorted(rng.integers(-3, 32, 2).tolist())
+        is_wall = bool(rng.integers(2))
+        before = expected.copy()
+        expected[rect_mask(expected.shape, x0, y0, x1, y1)] = is_wall
+
+        notified = []
+        grid.listeners[:] = [notified.append]
+        grid.fill_rect(x0, y0, x1, y1, is_wall)
+        assert sorted(notified) == sorted(map(tuple, np.argwhere(before != expected)))
+        assert (_walls(grid) == expected).all()
+
+
+def test_fill_rect_without_listeners_stores_covered_chunks_as_flags():
+    grid = SparseGrid(32, 32, chunk_size=8)
+    grid.fill_rect(0, 0, 15, 15, True)
+    assert grid.chunks == {(0, 0): True, (1, 0): True, (0, 1): True, (1, 1): True}
+
+
+def test_max_resident_must_be_positive():
+    with pytest.raises(ValueError):
+        SparseGrid(8, 8, max_resident=0)